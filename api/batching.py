@@ -0,0 +1,77 @@
+"""
+Request coalescing for the Politics & War API
+Collects nation name lookups made within a short window into one query
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+class NationBatcher:
+    """
+    Micro-batcher for nation searches by name
+
+    The first get() opens a `window`-second batch; every name requested
+    before it closes (or until `max_batch` names are queued) is resolved by a
+    single fetch(names) call. Each caller gets back a result shaped like
+    search_nations() for its own name. Names are matched case-insensitively.
+    Meant for a single event loop.
+    """
+
+    def __init__(self, fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+                 window: float = 0.05, max_batch: int = 25):
+        self._fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get(self, name: str) -> Dict[str, Any]:
+        """Search for one nation name as part of the current batch"""
+        key = name.lower()
+        entry = self._pending.get(key)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            entry = self._pending[key] = (name, loop.create_future())
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        # Shielded so one cancelled caller doesn't fail the others waiting on the same name
+        return await asyncio.shield(entry[1])
+
+    def _flush(self):
+        """Close the current batch and resolve it in the background"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[str, Tuple[str, asyncio.Future]]):
+        """Run one fetch for the batch and hand each caller its share of the result"""
+        try:
+            result = await self._fetch([name for name, _ in batch.values()])
+        except Exception as e:
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if 'errors' in result:
+            shares = {key: result for key in batch}
+        else:
+            matches: Dict[str, List[Dict[str, Any]]] = {key: [] for key in batch}
+            nations = ((result.get('data') or {}).get('nations') or {}).get('data') or []
+            for nation in nations:
+                key = str(nation.get('nation_name', '')).lower()
+                if key in matches:
+                    matches[key].append(nation)
+            shares = {key: {'data': {'nations': {'data': found}}} for key, found in matches.items()}
+
+        for key, (_, future) in batch.items():
+            if not future.done():
+                future.set_result(shares[key])
@@ -3,10 +3,156 @@ Politics & War API wrapper
 Handles GraphQL queries to the Politics & War API
 """
 
+import asyncio
+import functools
 import requests
 import json
+import hashlib
+import logging
+import re
+import time
 import urllib.parse
-from typing import Dict, Any, Optional
+import aiohttp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional
+from api.cache import TTLCache
+from api.rate_limit import shared_bucket
+
+_log = logging.getLogger(__name__)
+
+# orjson parses responses and serializes cache keys much faster; fall back to the stdlib without it
+try:
+    import orjson
+    
+    def _dumps_sorted(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    orjson = json
+    
+    def _dumps_sorted(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+
+# httpx with the h2 extra enables the optional HTTP/2 transport of AsyncPoliticsAndWarAPI
+try:
+    import httpx
+    import h2  # noqa: F401
+    HTTPX_ERRORS = (httpx.HTTPError,)
+except ImportError:
+    httpx = None
+    HTTPX_ERRORS = ()
+
+# Only advertise brotli when requests/urllib3 can actually decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip"
+
+# Field groups shared by the single-purpose getters and the combined get_nation_intel query
+NATION_FIELDS = ("id", "nation_name", "leader_name", "alliance{name}", "score", "num_cities")
+SPY_FIELDS = ("nation_name", "spy_casualties", "spy_kills", "spy_attacks", "espionage_available", "last_active")
+ESPIONAGE_FIELDS = ("nation_name", "espionage_available", "spy_casualties", "spy_kills",
+                    "beige_turns", "vacation_mode_turns", "last_active")
+ACTIVE_WAR_FIELDS = "id date reason attacker{nation_name} defender{nation_name} turns_left attacks{type date}"
+
+def _ensure_int_id(value: Any, name: str) -> int:
+    """
+    Coerce an ID to a positive int, rejecting anything else before a request is made
+    
+    The API itself returns IDs as numeric strings, so those are accepted too.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or value <= 0:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return value
+
+def _nation_selection(nation_id: Optional[int], *field_groups) -> str:
+    """Nation selection for the union of field groups; by $id, or the key owner when no id is given"""
+    fields = " ".join(dict.fromkeys(field for group in field_groups for field in group))
+    if nation_id:
+        return f"nations(id:$id){{data{{{fields}}}}}"
+    return f"me{{nation{{{fields}}}}}"
+
+def _active_wars_selection(nation_id: Optional[int]) -> str:
+    """Active wars selection by $id, or for the key owner when no id is given"""
+    if nation_id:
+        return f"wars(nation_id:$id,active:true){{data{{{ACTIVE_WAR_FIELDS}}}}}"
+    return f"me{{nation{{wars(active:true){{{ACTIVE_WAR_FIELDS}}}}}}}"
+
+@functools.lru_cache(maxsize=64)
+def _alliance_members_query(fields: tuple) -> str:
+    """get_alliance_with_members document for a tuple of member fields, built once per tuple"""
+    return ("query($id:[Int]){alliances(id:$id){data{name acronym score "
+            f"nations{{data{{{' '.join(fields)}}}}}}}}}}}")
+
+@functools.lru_cache(maxsize=64)
+def _combined_document(queries: tuple, variable_defs: str) -> str:
+    """One GraphQL document of aliased fragments, built once per fragment combination"""
+    selections = " ".join(f"q{i}:{fragment}" for i, fragment in enumerate(queries))
+    if variable_defs:
+        return f"query({variable_defs}){{{selections}}}"
+    return "{" + selections + "}"
+
+# Precompiled GraphQL documents; values are always passed as variables, never interpolated.
+# Selection sets are kept to what callers read - heavy nested fields are opt-in.
+Q_NATION = "query($id:[Int]){" + _nation_selection(1, NATION_FIELDS) + "}"
+Q_ME_NATION = "{" + _nation_selection(None, NATION_FIELDS) + "}"
+Q_ALLIANCE = "query($id:[Int]){alliances(id:$id){data{name acronym score}}}"
+Q_ALLIANCE_BY_NAME = "query($name:[String]){alliances(name:$name){data{id name}}}"
+Q_WARS = "{wars{data{id date reason attacker{nation_name} defender{nation_name} turns_left}}}"
+Q_GAME_INFO = ("{game_info{game_date radiation{global north_america south_america europe africa "
+               "asia australia antarctica}}}")
+Q_SEARCH_NATIONS = ("query($name:[String],$alliance_id:[Int],$first:Int){"
+                    "nations(nation_name:$name,alliance_id:$alliance_id,first:$first)"
+                    "{data{id nation_name leader_name alliance{name} score}}}")
+Q_LOOKUP_WITH_ESPIONAGE = ("query($name:[String]){nations(nation_name:$name,first:1){data{"
+                           + " ".join(dict.fromkeys(("id",) + SPY_FIELDS + ESPIONAGE_FIELDS)) + "}}}")
+Q_SPY = "query($id:[Int]){" + _nation_selection(1, SPY_FIELDS) + "}"
+Q_ME_SPY = "{" + _nation_selection(None, SPY_FIELDS) + "}"
+Q_ESPIONAGE = "query($id:[Int]){" + _nation_selection(1, ESPIONAGE_FIELDS) + "}"
+Q_ME_ESPIONAGE = "{" + _nation_selection(None, ESPIONAGE_FIELDS) + "}"
+Q_ESPIONAGE_MANY = ("query($id:[Int],$first:Int){nations(id:$id,first:$first){data{"
+                    + " ".join(("id",) + ESPIONAGE_FIELDS) + "}}}")
+Q_ACTIVE_WARS = "query($id:[Int]){" + _active_wars_selection(1) + "}"
+Q_ME_ACTIVE_WARS = "{" + _active_wars_selection(None) + "}"
+Q_RECENT_ATTACKS = ("query($after:DateTime){warattacks(after:$after)"
+                    "{data{id date type att_id def_id success}}}")
+Q_RECENT_ATTACKS_ALL = ("query($after:DateTime){warattacks(after:$after,first:50)"
+                        "{data{id date type att_id def_id success}}}")
+
+# Response cache lifetimes (seconds) for the hot read-only getters
+GAME_INFO_TTL = 300
+NATION_TTL = 60
+ALLIANCE_TTL = 60
+RECENT_ATTACKS_TTL = 10
+ESPIONAGE_STATUS_TTL = 5
+
+# Largest page (`first:`) the API serves in one request
+MAX_PAGE_SIZE = 500
+
+# Client-side pacing shared by every wrapper using the same key (PnW allows ~60 req/min)
+RATE_LIMIT_PER_SECOND = 1.0
+RATE_LIMIT_BURST = 10
+# Back off once fewer than this share of the server's rate-limit window remains
+RATE_LIMIT_LOW_WATER = 0.1
+# Upper bound (seconds) on a server-requested pause
+MAX_SERVER_BACKOFF = 60
+
+# Granularity (seconds) of the check_recent_attacks "after" threshold
+RECENT_ATTACKS_BUCKET = 60
+
+# Error replies that mean the API is pushing back, as opposed to a bad request
+OVERLOAD_ERROR = re.compile(r"\b(?:429|5\d\d)\b|too many|timed out|timeout", re.IGNORECASE)
+
+def is_overload_error(result: Any) -> bool:
+    """Whether an API result is a rate-limit, server or timeout failure"""
+    if not isinstance(result, dict):
+        return False
+    return any(OVERLOAD_ERROR.search(str(error.get('message', ''))) for error in result.get('errors') or [])
 
 class PoliticsAndWarAPI:
     """API wrapper for Politics & War GraphQL API"""
@@ -14,119 +160,418 @@ class PoliticsAndWarAPI:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.politicsandwar.com/graphql"
+        self._endpoint = self._build_endpoint()
+        
+        # Persistent session so every query reuses pooled keep-alive connections
+        self._session = requests.Session()
+        # GraphQL reads are idempotent, so POSTs may be retried; 429s honour Retry-After
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504],
+                        allowed_methods=frozenset({"GET", "POST"}), respect_retry_after_header=True)
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
+        self._session.headers.update({
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Accept": "application/json",
+            "User-Agent": "spyv2"
+        })
+        
+        self._cache = TTLCache(maxsize=1024)
+        self._limiter = shared_bucket(api_key, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+    
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
-    def query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def query(self, query: str, variables: Optional[Dict[str, Any]] = None,
+              ttl: Optional[float] = None) -> Dict[str, Any]:
         """
         Execute a GraphQL query
         
         Args:
             query: GraphQL query string
             variables: Optional variables for the query
+            ttl: Optional cache lifetime in seconds; successful responses are
+                reused for identical query+variables until it expires
             
         Returns:
             Dict containing the API response
         """
-        # URL encode the query
-        encoded_query = urllib.parse.quote(query)
+        key = self._cache_key(query, variables) if ttl else None
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached[1]
         
-        # Build the full URL
-        url = f"{self.base_url}?api_key={self.api_key}&query={encoded_query}"
+        result = self._execute(query, variables)
+        self._cache_store(key, query, result, ttl)
+        return result
+    
+    def invalidate(self, prefix: str = ""):
+        """Drop cached responses whose query text starts with prefix (all by default)"""
+        for key, (cached_query, _) in self._cache.items():
+            if cached_query.startswith(prefix):
+                self._cache.pop(key)
+    
+    def _cache_key(self, query: str, variables: Optional[Dict[str, Any]]) -> bytes:
+        """Stable cache key for a query and its variables"""
+        raw = query.encode() + _dumps_sorted(variables or {})
+        return hashlib.blake2b(raw, digest_size=16).digest()
+    
+    def _cache_store(self, key: Optional[bytes], query: str, result: Dict[str, Any], ttl: Optional[float]):
+        """Cache a successful response; errors are never cached"""
+        if key is not None and 'errors' not in result:
+            self._cache.set(key, (query, result), ttl)
+    
+    def _execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a GraphQL query over HTTP"""
+        # GraphQL document and variables travel in the JSON body; only the key goes in the URL
+        payload = {"query": query, "variables": variables or {}}
+        self._limiter.acquire()
         
         try:
-            response = requests.get(url, timeout=30)
+            response = self._session.post(
+                self._endpoint,
+                json=payload,
+                timeout=30
+            )
+            self._pace_from_headers(response.headers)
             response.raise_for_status()
             
             # Try to parse JSON
             try:
-                result = response.json()
-                return result
-            except json.JSONDecodeError as e:
-                print(f"API returned invalid JSON: {e}")
-                print(f"Response content: {response.text[:500]}")
-                return {"errors": [{"message": f"Invalid JSON response: {e}"}]}
+                return orjson.loads(response.content)
+            except ValueError as e:
+                _log.warning("PnW API returned invalid JSON: %s (content: %.500s)", e, response.text)
+                return self._error_response(f"Invalid JSON response: {e}")
                 
         except requests.exceptions.RequestException as e:
-            print(f"API request failed: {e}")
-            print(f"URL: {url[:100]}...")  # Don't log full URL with API key
-            return {"errors": [{"message": str(e)}]}
+            _log.warning("PnW query failed: %s (query: %.100s)", self._redact(e), query)
+            return self._error_response(self._redact(e))
+    
+    def _pace_from_headers(self, headers):
+        """Pause the shared bucket when the server says the rate-limit window is nearly spent"""
+        try:
+            wait = float(headers.get("Retry-After") or 0)
+            remaining = headers.get("X-RateLimit-Remaining")
+            limit = headers.get("X-RateLimit-Limit")
+            if not wait and remaining is not None and limit and int(remaining) < int(limit) * RATE_LIMIT_LOW_WATER:
+                reset_after = headers.get("X-RateLimit-Reset-After")
+                reset = headers.get("X-RateLimit-Reset")
+                if reset_after is not None:
+                    wait = float(reset_after)
+                elif reset is not None:
+                    wait = float(reset) - time.time()
+        except ValueError:
+            return
+        if wait > 0:
+            self._limiter.pause(min(wait, MAX_SERVER_BACKOFF))
+    
+    def _build_endpoint(self) -> str:
+        """Request URL with the API key encoded once, instead of per request"""
+        return f"{self.base_url}?api_key={urllib.parse.quote(self.api_key, safe='')}"
+    
+    def _redact(self, error: Exception) -> str:
+        """Error text with the API key stripped (request exceptions embed the URL)"""
+        text = str(error) or type(error).__name__
+        return text.replace(urllib.parse.quote(self.api_key, safe=''), "***").replace(self.api_key, "***")
+    
+    @staticmethod
+    def _error_response(message: str) -> Dict[str, Any]:
+        """Response dict in the same shape as a GraphQL error reply"""
+        return {"errors": [{"message": message}]}
     
     def get_nation(self, nation_id: int = None) -> Dict[str, Any]:
         """Get nation information"""
         if nation_id:
-            query = f"{{nations(id:{nation_id}){{data{{nation_name leader_name alliance{{name}} score cities{{name}}}}}}}}"
-        else:
-            query = "{me{nation{nation_name leader_name alliance{name} score cities{name}}}}"
-        
-        return self.query(query)
+            nation_id = _ensure_int_id(nation_id, "nation_id")
+            return self.query(Q_NATION, {"id": [nation_id]}, ttl=NATION_TTL)
+        return self.query(Q_ME_NATION, ttl=NATION_TTL)
     
     def get_alliance(self, alliance_id: int) -> Dict[str, Any]:
         """Get alliance information"""
-        query = f"{{alliances(id:{alliance_id}){{data{{name acronym score nations{{data{{nation_name}}}}}}}}}}"
-        return self.query(query)
+        alliance_id = _ensure_int_id(alliance_id, "alliance_id")
+        return self.query(Q_ALLIANCE, {"id": [alliance_id]}, ttl=ALLIANCE_TTL)
+    
+    def find_alliance(self, name: str) -> Dict[str, Any]:
+        """Look up alliance IDs by exact alliance name"""
+        return self.query(Q_ALLIANCE_BY_NAME, {"name": [name]}, ttl=ALLIANCE_TTL)
+    
+    def get_alliance_with_members(self, alliance_id: int,
+                                  fields: tuple = ("nation_name", "score")) -> Dict[str, Any]:
+        """Get alliance information including the requested fields for each member nation"""
+        alliance_id = _ensure_int_id(alliance_id, "alliance_id")
+        return self.query(_alliance_members_query(tuple(fields)), {"id": [alliance_id]}, ttl=ALLIANCE_TTL)
     
     def get_wars(self, active_only: bool = True) -> Dict[str, Any]:
         """Get war information"""
-        query = "{wars{data{id date reason attacker{nation_name} defender{nation_name} turns_left}}}"
-        return self.query(query)
+        return self.query(Q_WARS)
     
     def get_game_info(self) -> Dict[str, Any]:
         """Get basic game information"""
-        query = "{game_info{game_date radiation{global north_america south_america europe africa asia australia antarctica}}}"
-        return self.query(query)
+        return self.query(Q_GAME_INFO, ttl=GAME_INFO_TTL)
     
     def search_nations(self, name: str = None, alliance_id: int = None, limit: int = 10) -> Dict[str, Any]:
         """Search for nations"""
-        filters = []
-        if name:
-            filters.append(f'nation_name:"{name}"')
         if alliance_id:
-            filters.append(f'alliance_id:{alliance_id}')
-        
-        filter_string = f"({','.join(filters)})" if filters else ""
-        query = f"{{nations{filter_string}{{data{{nation_name leader_name alliance{{name}} score}}}}}}"
+            alliance_id = _ensure_int_id(alliance_id, "alliance_id")
+        variables = {
+            "name": [name] if name else None,
+            "alliance_id": [alliance_id] if alliance_id else None,
+            "first": limit
+        }
+        return self.query(Q_SEARCH_NATIONS, variables)
+    
+    def search_nations_by_names(self, names: List[str], per_name: int = 10) -> Dict[str, Any]:
+        """Search for several nation names in one request; matches for all names share one list"""
+        return self.query(Q_SEARCH_NATIONS, {"name": list(names), "alliance_id": None,
+                                             "first": min(MAX_PAGE_SIZE, per_name * len(names))})
+    
+    def lookup_with_espionage(self, name: str) -> Dict[str, Any]:
+        """
+        Find a nation by name together with its spy and espionage fields
         
-        return self.query(query)
+        One request instead of search_nations() followed by get_spy_activity()
+        or check_espionage_status(); the result has the same shape as those
+        getters' by-id results.
+        """
+        return self.query(Q_LOOKUP_WITH_ESPIONAGE, {"name": [name]}, ttl=ESPIONAGE_STATUS_TTL)
     
     def get_spy_activity(self, nation_id: int = None) -> Dict[str, Any]:
         """Get spy-related activity for a nation"""
         if nation_id:
-            query = f"{{nations(id:[{nation_id}]){{data{{nation_name spy_casualties spy_kills spy_attacks espionage_available last_active}}}}}}"
-        else:
-            query = "{me{nation{nation_name spy_casualties spy_kills spy_attacks espionage_available last_active}}}"
-        
-        return self.query(query)
+            nation_id = _ensure_int_id(nation_id, "nation_id")
+            return self.query(Q_SPY, {"id": [nation_id]})
+        return self.query(Q_ME_SPY)
     
     def check_recent_attacks(self, nation_id: int = None, hours: int = 24) -> Dict[str, Any]:
-        """Check for recent attacks on or by a nation"""
-        from datetime import datetime, timedelta
+        """
+        Check for recent attacks on or by a nation
         
-        # Calculate the time threshold
-        time_ago = datetime.utcnow() - timedelta(hours=hours)
-        time_str = time_ago.strftime("%Y-%m-%dT%H:%M:%S")
+        Attackers and defenders are returned as att_id/def_id only; resolve
+        names with the cached get_nation() when they are actually displayed.
+        """
+        if nation_id:
+            nation_id = _ensure_int_id(nation_id, "nation_id")
+        hours = _ensure_int_id(hours, "hours")
+        
+        # Round the threshold down to the minute so repeat calls share a cache entry
+        now = int(time.time())
+        bucket = now - (now % RECENT_ATTACKS_BUCKET)
+        time_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(bucket - hours * 3600))
         
         if nation_id:
             # Check attacks involving this specific nation
-            query = f"{{warattacks(after:\"{time_str}\"){{data{{id date type attacker{{id nation_name}} defender{{id nation_name}} success}}}}}}"
-        else:
-            # Check recent attacks in general
-            query = f"{{warattacks(after:\"{time_str}\",first:50){{data{{id date type attacker{{nation_name}} defender{{nation_name}} success}}}}}}"
-        
-        return self.query(query)
+            return self.query(Q_RECENT_ATTACKS, {"after": time_str}, ttl=RECENT_ATTACKS_TTL)
+        # Check recent attacks in general
+        return self.query(Q_RECENT_ATTACKS_ALL, {"after": time_str}, ttl=RECENT_ATTACKS_TTL)
     
     def get_active_wars(self, nation_id: int = None) -> Dict[str, Any]:
         """Get active wars for a nation"""
         if nation_id:
-            query = f"{{wars(nation_id:[{nation_id}],active:true){{data{{id date reason attacker{{nation_name}} defender{{nation_name}} turns_left attacks{{type date}}}}}}}}"
-        else:
-            query = "{me{nation{wars(active:true){id date reason attacker{nation_name} defender{nation_name} turns_left attacks{type date}}}}}"
-        
-        return self.query(query)
+            nation_id = _ensure_int_id(nation_id, "nation_id")
+            return self.query(Q_ACTIVE_WARS, {"id": [nation_id]})
+        return self.query(Q_ME_ACTIVE_WARS)
     
     def check_espionage_status(self, nation_id: int = None) -> Dict[str, Any]:
         """Check if a nation is available for espionage and recent spy activity"""
         if nation_id:
-            query = f"{{nations(id:[{nation_id}]){{data{{nation_name espionage_available spy_casualties spy_kills beige_turns vacation_mode_turns last_active}}}}}}"
-        else:
-            query = "{me{nation{nation_name espionage_available spy_casualties spy_kills beige_turns vacation_mode_turns last_active}}}"
+            nation_id = _ensure_int_id(nation_id, "nation_id")
+            return self.query(Q_ESPIONAGE, {"id": [nation_id]}, ttl=ESPIONAGE_STATUS_TTL)
+        return self.query(Q_ME_ESPIONAGE, ttl=ESPIONAGE_STATUS_TTL)
+    
+    def check_espionage_status_many(self, nation_ids: List[int]) -> Dict[str, Any]:
+        """
+        Check up to MAX_PAGE_SIZE nations' espionage status in one request
         
-        return self.query(query)
+        Rows carry their `id`, since the API does not return them in request order.
+        """
+        ids = [_ensure_int_id(nation_id, "nation_id") for nation_id in nation_ids]
+        if len(ids) > MAX_PAGE_SIZE:
+            raise ValueError(f"at most {MAX_PAGE_SIZE} nation IDs per request, got {len(ids)}")
+        return self.query(Q_ESPIONAGE_MANY, {"id": ids, "first": len(ids)})
+    
+    def multi(self, *queries: str, variables: Optional[Dict[str, Any]] = None,
+              variable_defs: str = "") -> Dict[str, Any]:
+        """
+        Execute several root selections in a single HTTP request
+        
+        Args:
+            queries: Selection fragments without the outer braces,
+                e.g. 'nations(id:$id){data{nation_name}}'
+            variables: Optional variables shared by all fragments
+            variable_defs: Variable declarations for those fragments, e.g. '$id:[Int]'
+            
+        Returns:
+            Dict containing the API response, with each fragment's result
+            under the alias q0, q1, ... in submission order
+        """
+        return self.query(self._multi_document(queries, variable_defs), variables)
+    
+    def get_nation_intel(self, nation_id: int = None, include_wars: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Get spy activity, espionage status and optionally active wars in one request
+        
+        Returns:
+            Dict with 'spy_activity', 'espionage_status' (and 'active_wars') keys,
+            each shaped like the result of the matching single-purpose method
+        """
+        result = self.multi(*self._nation_intel_fragments(nation_id, include_wars),
+                            **self._nation_intel_variables(nation_id))
+        return self._split_nation_intel(result, nation_id, include_wars)
+    
+    def _multi_document(self, queries, variable_defs: str) -> str:
+        """Combine aliased fragments into one GraphQL document"""
+        return _combined_document(tuple(queries), variable_defs)
+    
+    def _nation_intel_fragments(self, nation_id: Optional[int], include_wars: bool) -> List[str]:
+        """Build the aliased fragments used by get_nation_intel"""
+        fragments = [_nation_selection(nation_id, SPY_FIELDS, ESPIONAGE_FIELDS)]
+        if include_wars:
+            fragments.append(_active_wars_selection(nation_id))
+        return fragments
+    
+    def _nation_intel_variables(self, nation_id: Optional[int]) -> Dict[str, Any]:
+        """multi() keyword arguments binding $id for get_nation_intel"""
+        if nation_id:
+            return {"variables": {"id": [_ensure_int_id(nation_id, "nation_id")]}, "variable_defs": "$id:[Int]"}
+        return {}
+    
+    def _split_nation_intel(self, result: Dict[str, Any], nation_id: Optional[int],
+                            include_wars: bool) -> Dict[str, Dict[str, Any]]:
+        """Demultiplex a get_nation_intel response back into per-method results"""
+        keys = ['spy_activity', 'espionage_status'] + (['active_wars'] if include_wars else [])
+        if 'errors' in result:
+            return {key: result for key in keys}
+        
+        data = result.get('data') or {}
+        nation_result = {'data': {'nations' if nation_id else 'me': data.get('q0')}}
+        intel = {'spy_activity': nation_result, 'espionage_status': nation_result}
+        if include_wars:
+            intel['active_wars'] = {'data': {'wars' if nation_id else 'me': data.get('q1')}}
+        return intel
+
+
+class AsyncPoliticsAndWarAPI(PoliticsAndWarAPI):
+    """
+    Asynchronous variant of the API wrapper backed by aiohttp
+    
+    Every getter returns an awaitable, so independent lookups can be overlapped:
+        async with AsyncPoliticsAndWarAPI(key) as api:
+            results = await asyncio.gather(*[api.check_espionage_status(i) for i in ids])
+    
+    With http2=True (requires httpx[http2]) all queries are multiplexed over a
+    single HTTP/2 connection, which is warmed up when entering the context.
+    """
+    
+    def __init__(self, api_key: str, max_concurrency: int = 16, http2: bool = False):
+        self.api_key = api_key
+        self.base_url = "https://api.politicsandwar.com/graphql"
+        self._endpoint = self._build_endpoint()
+        self._session = None
+        if http2 and httpx is None:
+            _log.warning("httpx[http2] is not installed, falling back to aiohttp over HTTP/1.1")
+        self.http2 = http2 and httpx is not None
+        # Cap in-flight requests to stay within PnW rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache = TTLCache(maxsize=1024)
+        self._limiter = shared_bucket(api_key, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+    
+    async def __aenter__(self):
+        self._get_session()
+        if self.http2:
+            # Pay the TLS/HTTP2 handshake up front; the result also primes the cache
+            await self.get_game_info()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    def _get_session(self):
+        """Create the client session lazily (it must be bound to a running loop)"""
+        headers = {"Accept-Encoding": ACCEPT_ENCODING, "Accept": "application/json", "User-Agent": "spyv2"}
+        if self.http2:
+            if self._session is None or self._session.is_closed:
+                self._session = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+                    timeout=30,
+                    headers=headers
+                )
+        elif self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers=headers
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._session is None:
+            return
+        if self.http2:
+            await self._session.aclose()
+        elif not self._session.closed:
+            await self._session.close()
+    
+    async def query(self, query: str, variables: Optional[Dict[str, Any]] = None,
+                    ttl: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query
+        
+        Args:
+            query: GraphQL query string
+            variables: Optional variables for the query
+            ttl: Optional cache lifetime in seconds
+            
+        Returns:
+            Dict containing the API response
+        """
+        key = self._cache_key(query, variables) if ttl else None
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached[1]
+        
+        result = await self._execute(query, variables)
+        self._cache_store(key, query, result, ttl)
+        return result
+    
+    async def _execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a GraphQL query over HTTP"""
+        payload = {"query": query, "variables": variables or {}}
+        
+        try:
+            await self._limiter.acquire_async()
+            async with self._semaphore:
+                if self.http2:
+                    response = await self._get_session().post(self._endpoint, json=payload)
+                    self._pace_from_headers(response.headers)
+                    response.raise_for_status()
+                    body = response.content
+                else:
+                    async with self._get_session().post(self._endpoint, json=payload) as response:
+                        self._pace_from_headers(response.headers)
+                        response.raise_for_status()
+                        body = await response.read()
+            
+            try:
+                return orjson.loads(body)
+            except ValueError as e:
+                _log.warning("PnW API returned invalid JSON: %s", e)
+                return self._error_response(f"Invalid JSON response: {e}")
+                    
+        except (aiohttp.ClientError, asyncio.TimeoutError, *HTTPX_ERRORS) as e:
+            _log.warning("PnW query failed: %s (query: %.100s)", self._redact(e), query)
+            return self._error_response(self._redact(e))
+    
+    async def get_nation_intel(self, nation_id: int = None, include_wars: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Get spy activity, espionage status and optionally active wars in one request"""
+        result = await self.multi(*self._nation_intel_fragments(nation_id, include_wars),
+                                  **self._nation_intel_variables(nation_id))
+        return self._split_nation_intel(result, nation_id, include_wars)
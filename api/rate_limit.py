@@ -0,0 +1,162 @@
+"""
+Client-side rate limiting for the Politics & War API
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+class TokenBucket:
+    """
+    Token bucket that paces callers to `rate` requests/second with bursts of `burst`
+
+    Each acquire reserves a token up front (the balance may go negative), so
+    concurrent callers queue in arrival order. State is guarded by a thread
+    lock rather than an asyncio lock, which lets one bucket be shared by
+    threads and by coroutines running on different event loops.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for at least `seconds` (server-requested backoff)"""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class AIMDController:
+    """
+    Adaptive cap on concurrent outbound requests
+
+    The limit grows additively after each fast, successful request and is
+    cut multiplicatively when a request is slow or the server pushes back
+    (429/5xx/timeout), so throughput follows what the API currently tolerates.
+
+    Background work (monitoring, indexing) may only fill `background_share`
+    of the limit and queues behind foreground waiters, which keeps the rest
+    free for user commands. Meant for a single event loop; callers pair
+    acquire() with release(), or use call().
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 16,
+                 target_latency: float = 2.0, increase: float = 0.5, decrease: float = 0.5,
+                 background_share: float = 0.7):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.background_share = background_share
+        self.in_flight = 0
+        self.background_in_flight = 0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        self._background_waiters: Deque[asyncio.Future] = collections.deque()
+
+    @property
+    def background_limit(self) -> int:
+        """Slots background work may hold under the current limit"""
+        return max(1, int(self.limit * self.background_share))
+
+    async def acquire(self, background: bool = False):
+        """Wait for a free slot under the current limit"""
+        waiters = self._background_waiters if background else self._waiters
+        if not waiters and self._has_room(background):
+            self._take(background)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation landed
+                self._give_back(background)
+                self._wake()
+            raise
+
+    def release(self, success: bool, latency: float, background: bool = False):
+        """Free a slot and adjust the limit from the outcome of the request"""
+        self._give_back(background)
+        if success and latency <= self.target_latency:
+            self.limit = min(self.maximum, self.limit + self.increase)
+        else:
+            self.limit = max(self.minimum, self.limit * self.decrease)
+        self._wake()
+
+    async def call(self, coro_factory: Callable[[], Awaitable[Any]], background: bool = False,
+                   failed: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Await coro_factory() in a slot; `failed(result)` marks results that should shrink the limit"""
+        await self.acquire(background)
+        started = time.monotonic()
+        result = None
+        try:
+            result = await coro_factory()
+            return result
+        finally:
+            self.release(not (failed and failed(result)), time.monotonic() - started, background)
+
+    def _has_room(self, background: bool) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        return not background or self.background_in_flight < self.background_limit
+
+    def _take(self, background: bool):
+        self.in_flight += 1
+        if background:
+            self.background_in_flight += 1
+
+    def _give_back(self, background: bool):
+        self.in_flight -= 1
+        if background:
+            self.background_in_flight -= 1
+
+    def _wake(self):
+        """Hand free slots to waiters in arrival order, foreground first"""
+        for background, waiters in ((False, self._waiters), (True, self._background_waiters)):
+            while waiters and self._has_room(background):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self._take(background)
+                    waiter.set_result(None)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def shared_bucket(key: str, rate: float, burst: int) -> TokenBucket:
+    """Return the process-wide bucket for an API key, creating it on first use"""
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+        return bucket
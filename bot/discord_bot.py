@@ -7,17 +7,56 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import os
+import time
+import itertools
 import asyncio
-from api.pnw_api import PoliticsAndWarAPI
+from typing import Any, Dict, Optional, Set
+from api.pnw_api import PoliticsAndWarAPI, is_overload_error
+from api.cache import TTLCache
+from api.batching import NationBatcher
+from api.rate_limit import AIMDController
 from utils.espionage_monitor import EspionageMonitor
 from database.espionage_tracker import EspionageTracker
+from utils.helpers import dig
+
+# Lifetime (seconds) of cached API reads shared by all command handlers
+COMMAND_CACHE_TTL = 30
+GAME_INFO_CACHE_TTL = 300
+# Monitoring stats are DB counts; a few seconds of staleness absorbs !monitor spam
+STATS_CACHE_TTL = 5
+
+MONITOR_TASK_NAME = "monitor-24_7"
+
+# Per-user allowance for commands that hit the PnW API: RATE uses per PER seconds
+COMMAND_COOLDOWN_RATE = 3
+COMMAND_COOLDOWN_PER = 10
+
+# Wars listed in one !wars embed (Discord caps embed size)
+MAX_WARS_SHOWN = 5
+
+# Result paths for the two nation response shapes: a by-name/by-id search and the key owner
+NATIONS_PATH = ('data', 'nations', 'data')
+ME_NATION_PATH = ('data', 'me', 'nation')
 
 class DiscordBot:
     """Discord bot for Politics & War interactions"""
     
-    def __init__(self):
-        self.token = os.getenv('DISCORD_TOKEN')
-        self.api_key = os.getenv('PNW_API_KEY')
+    def __init__(self, token: Optional[str] = None, api_key: Optional[str] = None,
+                 pnw_api: Optional[PoliticsAndWarAPI] = None,
+                 espionage_monitor: Optional[EspionageMonitor] = None,
+                 espionage_tracker: Optional[EspionageTracker] = None,
+                 rate_ctrl: Optional[AIMDController] = None):
+        """
+        Wire up the bot from already-built dependencies
+        
+        Use DiscordBot.create() to build them from the environment; passing
+        them directly keeps construction free of I/O (and lets tests inject fakes).
+        """
+        self.token = token
+        self.api_key = api_key
+        self.pnw_api = pnw_api
+        self.espionage_monitor = espionage_monitor
+        self.espionage_tracker = espionage_tracker
         
         # Set up bot intents for slash commands
         intents = discord.Intents.default()
@@ -26,38 +65,220 @@ class DiscordBot:
         # Initialize bot with both prefix and slash command support
         self.bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
         
+        # Strong references to background tasks; the loop only keeps weak ones
+        self._bg_tasks: Set[asyncio.Task] = set()
+        
+        # Popular lookups repeat within seconds across users; serve them from memory
+        self._api_cache = TTLCache(maxsize=2048, default_ttl=COMMAND_CACHE_TTL)
+        self._inflight: Dict[Any, asyncio.Future] = {}
+        
+        self._stats_cache = (0.0, None)
+        self._nation_batcher = NationBatcher(self._search_nations_batch)
+        
+        # Outbound calls from all commands share one adaptive concurrency limit;
+        # the monitor draws on the same one with background priority
+        self.rate_ctrl = rate_ctrl or AIMDController()
+        
+        # Help embeds never change, so build them once instead of per invocation
+        self._help_embed = self._build_help_embed()
+        self._slash_help_embed = self._build_slash_help_embed()
+        # Skeleton for the frequent !monitor reply; copied and filled per call
+        self._monitor_template = discord.Embed(title="🔍 24/7 Espionage Monitoring System", color=0x9932CC)
+        
+        # Add event handlers
+        self.setup_events()
+        self.setup_commands()
+        self.setup_slash_commands()  # Add slash commands alongside prefix commands
+    
+    @classmethod
+    async def create(cls) -> "DiscordBot":
+        """Build the bot from environment variables, constructing its dependencies off the event loop"""
+        token = os.getenv('DISCORD_TOKEN')
+        api_key = os.getenv('PNW_API_KEY')
+        pnw_api = espionage_monitor = espionage_tracker = None
+        rate_ctrl = AIMDController()
+        
         # Initialize API (defensive initialization)
-        if self.api_key:
+        if api_key:
             try:
-                self.pnw_api = PoliticsAndWarAPI(self.api_key)
+                pnw_api = PoliticsAndWarAPI(api_key)
             except Exception as e:
                 print(f"⚠️ Warning: Could not initialize API: {e}")
-                self.pnw_api = None
         else:
             print("⚠️ Warning: PNW_API_KEY not set, API features disabled")
-            self.pnw_api = None
         
-        # Initialize espionage monitoring system
-        if self.pnw_api:
+        # Initialize espionage monitoring system; the monitor shares the bot's tracker, so the
+        # database is opened (off the event loop) only once
+        if pnw_api:
             try:
-                self.espionage_monitor = EspionageMonitor(self.api_key)
-                self.espionage_tracker = EspionageTracker()
+                espionage_tracker = await asyncio.to_thread(EspionageTracker)
+                espionage_monitor = await asyncio.to_thread(EspionageMonitor, api_key, rate_ctrl, pnw_api,
+                                                            espionage_tracker)
             except Exception as e:
                 print(f"⚠️ Warning: Could not initialize monitoring system: {e}")
-                self.espionage_monitor = None
-                self.espionage_tracker = None
+                espionage_monitor = espionage_tracker = None
         else:
             print("⚠️ Warning: Monitoring system disabled (no API key)")
-            self.espionage_monitor = None
-            self.espionage_tracker = None
         
-        # Start 24/7 monitoring in background
-        self.monitoring_task = None
+        return cls(token, api_key, pnw_api, espionage_monitor, espionage_tracker, rate_ctrl)
+    
+    def _spawn_background(self, coro, name: str) -> asyncio.Task:
+        """Start a named background task and keep it referenced until it finishes"""
+        task = asyncio.create_task(coro, name=name)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
+    def _background_task(self, name: str) -> Optional[asyncio.Task]:
+        """Return the running background task with this name, if any"""
+        return next((t for t in self._bg_tasks if not t.done() and t.get_name() == name), None)
+    
+    async def _cached_call(self, key, coro_factory, ttl: float = COMMAND_CACHE_TTL):
+        """
+        Return a cached API result, or await coro_factory() and cache it if successful
         
-        # Add event handlers
-        self.setup_events()
-        self.setup_commands()
-        self.setup_slash_commands()  # Add slash commands alongside prefix commands
+        Concurrent misses for the same key share one in-flight request instead
+        of each hitting the API.
+        """
+        cached = self._api_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, coro_factory, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded so one caller timing out or being cancelled doesn't abort the shared request
+        return await asyncio.shield(task)
+    
+    async def _fetch_and_store(self, key, coro_factory, ttl: float):
+        """Run one API request and cache its result unless it failed"""
+        result = await coro_factory()
+        if 'errors' not in result:
+            self._api_cache.set(key, result, ttl)
+        return result
+    
+    async def _throttled(self, coro_factory):
+        """Await coro_factory() under the AIMD limit, feeding its outcome back into it"""
+        return await self.rate_ctrl.call(coro_factory, failed=is_overload_error)
+    
+    async def _api(self, method: str, *args, ttl: float = COMMAND_CACHE_TTL, **kwargs):
+        """Run a blocking PoliticsAndWarAPI method in a worker thread through the command cache"""
+        key = (method, args, frozenset(kwargs.items()))
+        func = getattr(self.pnw_api, method)
+        return await self._cached_call(key, lambda: self._throttled(lambda: asyncio.to_thread(func, *args, **kwargs)),
+                                       ttl)
+    
+    async def _by_name(self, method: str, nation_name: str):
+        """Cached name lookup; names are matched case-insensitively so the key is normalized"""
+        func = getattr(self.pnw_api, method)
+        return await self._cached_call((method, nation_name.lower()),
+                                       lambda: self._throttled(lambda: asyncio.to_thread(func, nation_name)))
+    
+    async def _lookup_nation(self, nation_name: str, by_id: str):
+        """
+        Fetch a nation's spy/espionage fields from a name or a numeric ID
+        
+        IDs go straight to the by-id getter; names are resolved together with
+        the fields in one request. Both results share the nations{data} shape.
+        """
+        if nation_name.isdigit():
+            return await self._api(by_id, int(nation_name))
+        return await self._by_name('lookup_with_espionage', nation_name)
+    
+    async def _search_nation(self, nation_name: str):
+        """Cached nation search by name; misses arriving together share one batched request"""
+        return await self._cached_call(('search_nations', nation_name.lower()),
+                                       lambda: self._nation_batcher.get(nation_name))
+    
+    async def _search_nations_batch(self, names):
+        """One throttled search_nations_by_names request for a NationBatcher batch"""
+        return await self._throttled(lambda: asyncio.to_thread(self.pnw_api.search_nations_by_names, names))
+    
+    async def _monitoring_stats(self, fresh: bool = False) -> Dict[str, Any]:
+        """Monitoring stats, reused for STATS_CACHE_TTL seconds unless fresh ones are requested"""
+        now = time.monotonic()
+        fetched_at, stats = self._stats_cache
+        if fresh or stats is None or now - fetched_at >= STATS_CACHE_TTL:
+            stats = await asyncio.to_thread(self.espionage_monitor.get_monitoring_stats)
+            self._stats_cache = (now, stats)
+        return stats
+    
+    @classmethod
+    def _embed(cls, title: str, color: int, fields, description: str = None) -> discord.Embed:
+        """Build an embed from (name, value, inline) tuples; None entries are skipped"""
+        return cls._add_fields(discord.Embed(title=title, description=description, color=color), fields)
+    
+    @staticmethod
+    def _add_fields(embed: discord.Embed, fields) -> discord.Embed:
+        """Append (name, value, inline) tuples to an embed; None entries are skipped"""
+        for field in fields:
+            if field:
+                name, value, inline = field
+                embed.add_field(name=name, value=value, inline=inline)
+        return embed
+    
+    @classmethod
+    def _build_help_embed(cls) -> discord.Embed:
+        """Static embed listing the prefix commands"""
+        return cls._embed("🤖 Politics & War Bot Commands", 0x0099ff, [
+            ("📊 Basic Commands",
+             "`!ping` - Check bot status\n"
+             "`!gameinfo` - Get game information\n"
+             "`!nation <name>` - Get nation info\n"
+             "`!commands` - Show this help",
+             False),
+            ("🕵️ Espionage Commands",
+             "`!spy [nation]` - Check spy activity\n"
+             "`!spycheck [nation]` - Detailed spy status\n"
+             "`!wars [nation]` - Show active wars\n"
+             "`!checknation <name>` - Manual nation check",
+             False),
+            ("🔍 24/7 Monitoring System",
+             "`!monitor` - System status\n"
+             "`!resets [alliance]` - Show reset times\n"
+             "`!startmonitor` - Start 24/7 monitoring (Admin)\n"
+             "`!stopmonitor` - Stop monitoring (Admin)\n"
+             "`!collect` - Index all nations (Admin)",
+             False),
+            ("💡 24/7 System Features",
+             "• **Auto-starts** when bot connects\n"
+             "• **Indexes all nations** in the game first\n"
+             "• **Skips vacation mode** nations\n"
+             "• **Only monitors alliance members**\n"
+             "• **Stops monitoring** once reset time found\n"
+             "• **Auto-adds new nations** every hour",
+             False),
+            ("💡 Tips",
+             "• Commands without `[nation]` use your nation\n"
+             "• Use nation names or IDs\n"
+             "• Reset times help predict daily reset schedules",
+             False),
+        ], description="Available commands for espionage monitoring and game info")
+    
+    @classmethod
+    def _build_slash_help_embed(cls) -> discord.Embed:
+        """Static embed listing the slash commands and their prefix equivalents"""
+        return cls._embed("🤖 Politics & War Bot Commands", 0x0099ff, [
+            ("📊 Basic Commands",
+             "`/commands` or `!commands` - Show this help\n"
+             "`/ping` or `!ping` - Check bot status\n"
+             "`/gameinfo` or `!gameinfo` - Get game information\n"
+             "`/nation` or `!nation <name>` - Get nation info",
+             False),
+            ("🕵️ Espionage Commands",
+             "`/spy` or `!spy [nation]` - Check spy activity\n"
+             "`/monitor` or `!monitor` - Check 24/7 monitoring status\n"
+             "`/resets` or `!resets [alliance]` - Show reset times",
+             False),
+            ("💡 How to Use",
+             "• Use **slash commands** (`/command`) - type `/` and select from menu\n"
+             "• Or use **prefix commands** (`!command`) - type `!` followed by command\n"
+             "• Slash commands are the modern Discord standard! ✨",
+             False),
+        ], description="Available commands for espionage monitoring and game info")
     
     def setup_events(self):
         """Set up bot events"""
@@ -80,11 +301,20 @@ class DiscordBot:
                 print("✅ Monitoring system available (managed by web dashboard)")
             else:
                 print("⚠️ Monitoring system not available")
+        
+        @self.bot.event
+        async def on_command_error(ctx, error):
+            # Cooldowns reject a command before any API work; answer briefly instead of logging a traceback
+            if isinstance(error, commands.CommandOnCooldown):
+                await ctx.send(f"⏳ Slow down - try again in {error.retry_after:.1f}s.", delete_after=5)
+                return
+            await commands.Bot.on_command_error(self.bot, ctx, error)
     
     def setup_commands(self):
         """Set up bot prefix commands"""
         
         @self.bot.command(name='nation')
+        @commands.cooldown(COMMAND_COOLDOWN_RATE, COMMAND_COOLDOWN_PER, commands.BucketType.user)
         async def get_nation_info(ctx, *, nation_name: str = None):
             """Get information about a nation"""
             if not self.pnw_api:
@@ -94,10 +324,10 @@ class DiscordBot:
             try:
                 if nation_name:
                     # Search for nation by name
-                    result = self.pnw_api.search_nations(name=nation_name)
+                    result = await self._search_nation(nation_name)
                 else:
                     # Get own nation info
-                    result = self.pnw_api.get_nation()
+                    result = await self._api('get_nation')
                 
                 if 'errors' in result:
                     await ctx.send(f"Error: {result['errors'][0]['message']}")
@@ -105,29 +335,23 @@ class DiscordBot:
                 
                 # Format and send response
                 if nation_name:
-                    nations = result.get('data', {}).get('nations', {}).get('data', [])
-                    if not nations:
+                    nation_data = dig(result, *NATIONS_PATH, 0)
+                    if not nation_data:
                         await ctx.send(f"No nation found with name: {nation_name}")
                         return
-                    nation_data = nations[0]
                 else:
-                    nation_data = result.get('data', {}).get('me', {}).get('nation', {})
-                
-                embed = discord.Embed(
-                    title=f"Nation: {nation_data.get('nation_name', 'Unknown')}",
-                    color=0x00ff00
-                )
-                embed.add_field(name="Leader", value=nation_data.get('leader_name', 'Unknown'), inline=True)
-                embed.add_field(name="Score", value=nation_data.get('score', 'Unknown'), inline=True)
+                    nation_data = dig(result, *ME_NATION_PATH, default={})
                 
                 alliance = nation_data.get('alliance', {})
-                if alliance:
-                    embed.add_field(name="Alliance", value=alliance.get('name', 'None'), inline=True)
-                
-                cities = nation_data.get('cities', [])
-                if cities:
-                    embed.add_field(name="Cities", value=len(cities), inline=True)
-                
+                cities = nation_data.get('num_cities')
+                fields = [
+                    ("Leader", nation_data.get('leader_name', 'Unknown'), True),
+                    ("Score", nation_data.get('score', 'Unknown'), True),
+                    ("Alliance", alliance.get('name', 'None'), True) if alliance else None,
+                    ("Cities", cities, True) if cities else None,
+                ]
+                
+                embed = self._embed(f"Nation: {nation_data.get('nation_name', 'Unknown')}", 0x00ff00, fields)
                 await ctx.send(embed=embed)
                 
             except Exception as e:
@@ -141,25 +365,21 @@ class DiscordBot:
                 return
                 
             try:
-                result = self.pnw_api.get_game_info()
+                result = await self._api('get_game_info', ttl=GAME_INFO_CACHE_TTL)
                 
                 if 'errors' in result:
                     await ctx.send(f"Error: {result['errors'][0]['message']}")
                     return
                 
-                game_info = result.get('data', {}).get('game_info', {})
-                
-                embed = discord.Embed(
-                    title="Politics & War Game Info",
-                    color=0x0099ff
-                )
-                embed.add_field(name="Game Date", value=game_info.get('game_date', 'Unknown'), inline=False)
+                game_info = dig(result, 'data', 'game_info', default={})
                 
                 radiation = game_info.get('radiation', {})
-                if radiation:
-                    embed.add_field(name="Global Radiation", value=radiation.get('global', 'Unknown'), inline=True)
+                fields = [
+                    ("Game Date", game_info.get('game_date', 'Unknown'), False),
+                    ("Global Radiation", radiation.get('global', 'Unknown'), True) if radiation else None,
+                ]
                 
-                await ctx.send(embed=embed)
+                await ctx.send(embed=self._embed("Politics & War Game Info", 0x0099ff, fields))
                 
             except Exception as e:
                 await ctx.send(f"An error occurred: {str(e)}")
@@ -167,63 +387,7 @@ class DiscordBot:
         @self.bot.command(name='commands')
         async def help_command(ctx):
             """Show all available commands"""
-            embed = discord.Embed(
-                title="🤖 Politics & War Bot Commands",
-                description="Available commands for espionage monitoring and game info",
-                color=0x0099ff
-            )
-            
-            # Basic commands
-            embed.add_field(
-                name="📊 Basic Commands",
-                value="`!ping` - Check bot status\n"
-                      "`!gameinfo` - Get game information\n"
-                      "`!nation <name>` - Get nation info\n"
-                      "`!commands` - Show this help",
-                inline=False
-            )
-            
-            # Spy commands
-            embed.add_field(
-                name="🕵️ Espionage Commands",
-                value="`!spy [nation]` - Check spy activity\n"
-                      "`!spycheck [nation]` - Detailed spy status\n"
-                      "`!wars [nation]` - Show active wars\n"
-                      "`!checknation <name>` - Manual nation check",
-                inline=False
-            )
-            
-            # Monitoring commands
-            embed.add_field(
-                name="🔍 24/7 Monitoring System",
-                value="`!monitor` - System status\n"
-                      "`!resets [alliance]` - Show reset times\n"
-                      "`!startmonitor` - Start 24/7 monitoring (Admin)\n"
-                      "`!stopmonitor` - Stop monitoring (Admin)\n"
-                      "`!collect` - Index all nations (Admin)",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 24/7 System Features",
-                value="• **Auto-starts** when bot connects\n"
-                      "• **Indexes all nations** in the game first\n"
-                      "• **Skips vacation mode** nations\n"
-                      "• **Only monitors alliance members**\n"
-                      "• **Stops monitoring** once reset time found\n"
-                      "• **Auto-adds new nations** every hour",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Tips",
-                value="• Commands without `[nation]` use your nation\n"
-                      "• Use nation names or IDs\n"
-                      "• Reset times help predict daily reset schedules",
-                inline=False
-            )
-            
-            await ctx.send(embed=embed)
+            await ctx.send(embed=self._help_embed)
         
         @self.bot.command(name='ping')
         async def ping(ctx):
@@ -231,21 +395,18 @@ class DiscordBot:
             await ctx.send(f'Pong! Latency: {round(self.bot.latency * 1000)}ms')
         
         @self.bot.command(name='spy')
+        @commands.cooldown(COMMAND_COOLDOWN_RATE, COMMAND_COOLDOWN_PER, commands.BucketType.user)
         async def check_spy_activity(ctx, *, nation_name: str = None):
             """Check spy activity for a nation"""
             try:
                 if nation_name:
-                    # Search for nation first to get ID
-                    search_result = self.pnw_api.search_nations(name=nation_name)
-                    if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                    # Resolve the name and fetch spy fields in one request
+                    result = await self._lookup_nation(nation_name, 'get_spy_activity')
+                    if 'errors' not in result and not dig(result, *NATIONS_PATH, 0):
                         await ctx.send(f"Nation '{nation_name}' not found.")
                         return
-                    
-                    nation_data = search_result['data']['nations']['data'][0]
-                    nation_id = nation_data['id']
-                    result = self.pnw_api.get_spy_activity(nation_id)
                 else:
-                    result = self.pnw_api.get_spy_activity()
+                    result = await self._api('get_spy_activity')
                 
                 if 'errors' in result:
                     await ctx.send(f"Error: {result['errors'][0]['message']}")
@@ -253,55 +414,50 @@ class DiscordBot:
                 
                 # Extract nation data
                 if nation_name:
-                    nation_data = result.get('data', {}).get('nations', {}).get('data', [{}])[0]
+                    nation_data = dig(result, *NATIONS_PATH, 0, default={})
                 else:
-                    nation_data = result.get('data', {}).get('me', {}).get('nation', {})
-                
-                embed = discord.Embed(
-                    title=f"🕵️ Spy Activity: {nation_data.get('nation_name', 'Unknown')}",
-                    color=0x800080
-                )
+                    nation_data = dig(result, *ME_NATION_PATH, default={})
                 
                 spy_casualties = nation_data.get('spy_casualties', 0)
                 spy_kills = nation_data.get('spy_kills', 0)
                 spy_attacks = nation_data.get('spy_attacks', 0)
                 espionage_available = nation_data.get('espionage_available', False)
                 
-                embed.add_field(name="Spies Lost", value=spy_casualties, inline=True)
-                embed.add_field(name="Spies Killed", value=spy_kills, inline=True)
-                embed.add_field(name="Spy Attacks Made", value=spy_attacks, inline=True)
-                embed.add_field(name="Espionage Available", value="✅ Yes" if espionage_available else "❌ No", inline=True)
-                
                 # Add interpretation
                 if spy_casualties > 0:
-                    embed.add_field(name="Recent Activity", value="⚠️ This nation has lost spies recently", inline=False)
+                    activity = ("Recent Activity", "⚠️ This nation has lost spies recently", False)
                 elif spy_kills > 0:
-                    embed.add_field(name="Defense Status", value="🛡️ This nation has killed enemy spies", inline=False)
+                    activity = ("Defense Status", "🛡️ This nation has killed enemy spies", False)
+                else:
+                    activity = None
                 
-                if not espionage_available:
-                    embed.add_field(name="Status", value="🛡️ Protected from espionage operations", inline=False)
+                fields = [
+                    ("Spies Lost", spy_casualties, True),
+                    ("Spies Killed", spy_kills, True),
+                    ("Spy Attacks Made", spy_attacks, True),
+                    ("Espionage Available", "✅ Yes" if espionage_available else "❌ No", True),
+                    activity,
+                    ("Status", "🛡️ Protected from espionage operations", False) if not espionage_available else None,
+                ]
                 
-                await ctx.send(embed=embed)
+                await ctx.send(embed=self._embed(f"🕵️ Spy Activity: {nation_data.get('nation_name', 'Unknown')}", 0x800080, fields))
                 
             except Exception as e:
                 await ctx.send(f"An error occurred: {str(e)}")
         
         @self.bot.command(name='spycheck')
+        @commands.cooldown(COMMAND_COOLDOWN_RATE, COMMAND_COOLDOWN_PER, commands.BucketType.user)
         async def check_espionage_status(ctx, *, nation_name: str = None):
             """Check if a nation can be spied on and their recent activity"""
             try:
                 if nation_name:
-                    # Search for nation first
-                    search_result = self.pnw_api.search_nations(name=nation_name)
-                    if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                    # Resolve the name and fetch espionage fields in one request
+                    result = await self._lookup_nation(nation_name, 'check_espionage_status')
+                    if 'errors' not in result and not dig(result, *NATIONS_PATH, 0):
                         await ctx.send(f"Nation '{nation_name}' not found.")
                         return
-                    
-                    nation_data = search_result['data']['nations']['data'][0]
-                    nation_id = nation_data['id']
-                    result = self.pnw_api.check_espionage_status(nation_id)
                 else:
-                    result = self.pnw_api.check_espionage_status()
+                    result = await self._api('check_espionage_status')
                 
                 if 'errors' in result:
                     await ctx.send(f"Error: {result['errors'][0]['message']}")
@@ -309,14 +465,9 @@ class DiscordBot:
                 
                 # Extract nation data
                 if nation_name:
-                    nation_data = result.get('data', {}).get('nations', {}).get('data', [{}])[0]
+                    nation_data = dig(result, *NATIONS_PATH, 0, default={})
                 else:
-                    nation_data = result.get('data', {}).get('me', {}).get('nation', {})
-                
-                embed = discord.Embed(
-                    title=f"🔍 Espionage Status: {nation_data.get('nation_name', 'Unknown')}",
-                    color=0x4B0082
-                )
+                    nation_data = dig(result, *ME_NATION_PATH, default={})
                 
                 espionage_available = nation_data.get('espionage_available', False)
                 beige_turns = nation_data.get('beige_turns', 0)
@@ -324,12 +475,6 @@ class DiscordBot:
                 spy_casualties = nation_data.get('spy_casualties', 0)
                 last_active = nation_data.get('last_active', 'Unknown')
                 
-                # Main status
-                if espionage_available:
-                    embed.add_field(name="Espionage Status", value="✅ Available for espionage", inline=False)
-                else:
-                    embed.add_field(name="Espionage Status", value="❌ Protected from espionage", inline=False)
-                
                 # Protection reasons
                 protection_reasons = []
                 if beige_turns > 0:
@@ -337,36 +482,38 @@ class DiscordBot:
                 if vmode_turns > 0:
                     protection_reasons.append(f"Vacation mode ({vmode_turns} turns left)")
                 
-                if protection_reasons:
-                    embed.add_field(name="Protection", value="\n".join(protection_reasons), inline=False)
+                fields = [
+                    ("Espionage Status", "✅ Available for espionage" if espionage_available else "❌ Protected from espionage", False),
+                    ("Protection", "\n".join(protection_reasons), False) if protection_reasons else None,
+                    ("⚠️ Recent Spy Activity", f"Lost {spy_casualties} spies recently", False) if spy_casualties > 0 else None,
+                    ("Last Active", last_active, True),
+                ]
                 
-                # Recent spy activity
-                if spy_casualties > 0:
-                    embed.add_field(name="⚠️ Recent Spy Activity", value=f"Lost {spy_casualties} spies recently", inline=False)
-                
-                embed.add_field(name="Last Active", value=last_active, inline=True)
-                
-                await ctx.send(embed=embed)
+                await ctx.send(embed=self._embed(f"🔍 Espionage Status: {nation_data.get('nation_name', 'Unknown')}", 0x4B0082, fields))
                 
             except Exception as e:
                 await ctx.send(f"An error occurred: {str(e)}")
         
         @self.bot.command(name='wars')
+        @commands.cooldown(COMMAND_COOLDOWN_RATE, COMMAND_COOLDOWN_PER, commands.BucketType.user)
         async def check_active_wars(ctx, *, nation_name: str = None):
             """Check active wars for a nation"""
             try:
-                if nation_name:
+                if nation_name and nation_name.isdigit():
+                    # Already an ID, no search needed
+                    result = await self._api('get_active_wars', int(nation_name))
+                elif nation_name:
                     # Search for nation first
-                    search_result = self.pnw_api.search_nations(name=nation_name)
-                    if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                    search_result = await self._search_nation(nation_name)
+                    nation_data = dig(search_result, *NATIONS_PATH, 0)
+                    if 'errors' in search_result or not nation_data:
                         await ctx.send(f"Nation '{nation_name}' not found.")
                         return
                     
-                    nation_data = search_result['data']['nations']['data'][0]
                     nation_id = nation_data['id']
-                    result = self.pnw_api.get_active_wars(nation_id)
+                    result = await self._api('get_active_wars', nation_id)
                 else:
-                    result = self.pnw_api.get_active_wars()
+                    result = await self._api('get_active_wars')
                 
                 if 'errors' in result:
                     await ctx.send(f"Error: {result['errors'][0]['message']}")
@@ -374,10 +521,10 @@ class DiscordBot:
                 
                 # Extract wars data
                 if nation_name:
-                    wars = result.get('data', {}).get('wars', {}).get('data', [])
+                    wars = dig(result, 'data', 'wars', 'data', default=[])
                     display_name = nation_name
                 else:
-                    nation_data = result.get('data', {}).get('me', {}).get('nation', {})
+                    nation_data = dig(result, *ME_NATION_PATH, default={})
                     wars = nation_data.get('wars', [])
                     display_name = nation_data.get('nation_name', 'Your nation')
                 
@@ -385,25 +532,25 @@ class DiscordBot:
                     await ctx.send(f"🕊️ {display_name} is not currently in any active wars.")
                     return
                 
-                embed = discord.Embed(
-                    title=f"⚔️ Active Wars: {display_name}",
-                    description=f"Currently involved in {len(wars)} war(s)",
-                    color=0xFF0000
-                )
-                
-                for war in wars[:5]:  # Limit to 5 wars to avoid embed size limits
+                fields = []
+                total = len(wars)
+                for war in itertools.islice(wars, MAX_WARS_SHOWN):  # Limit wars to avoid embed size limits
                     war_id = war.get('id', 'Unknown')
-                    attacker = war.get('attacker', {}).get('nation_name', 'Unknown')
-                    defender = war.get('defender', {}).get('nation_name', 'Unknown')
+                    attacker = dig(war, 'attacker', 'nation_name', default='Unknown')
+                    defender = dig(war, 'defender', 'nation_name', default='Unknown')
                     turns_left = war.get('turns_left', 'Unknown')
-                    reason = war.get('reason', 'No reason given')
+                    reason = war.get('reason') or 'No reason given'
                     
                     war_info = f"**Attacker:** {attacker}\n**Defender:** {defender}\n**Turns Left:** {turns_left}\n**Reason:** {reason[:100]}..."
-                    embed.add_field(name=f"War #{war_id}", value=war_info, inline=False)
+                    fields.append((f"War #{war_id}", war_info, False))
                 
-                if len(wars) > 5:
-                    embed.add_field(name="Note", value=f"Showing 5 of {len(wars)} wars", inline=False)
+                if total > len(fields):
+                    fields.append(("Note", f"Showing {len(fields)} of {total} wars", False))
                 
+                embed = self._embed(
+                    f"⚔️ Active Wars: {display_name}", 0xFF0000, fields,
+                    description=f"Currently involved in {total} war(s)"
+                )
                 await ctx.send(embed=embed)
                 
             except Exception as e:
@@ -413,41 +560,25 @@ class DiscordBot:
         async def monitor_status(ctx):
             """Check the espionage monitoring system status"""
             try:
-                stats = self.espionage_monitor.get_monitoring_stats()
-                
-                embed = discord.Embed(
-                    title="🔍 24/7 Espionage Monitoring System",
-                    color=0x9932CC
-                )
+                stats = await self._monitoring_stats()
                 
                 # System status
                 status_emoji = "🟢" if stats.get('is_running', False) else "🔴"
                 monitoring_emoji = "🟢" if stats.get('monitoring_active', False) else "🔴"
-                
-                embed.add_field(
-                    name="System Status", 
-                    value=f"{status_emoji} {'Running' if stats.get('is_running', False) else 'Stopped'}", 
-                    inline=True
-                )
-                
-                embed.add_field(
-                    name="Monitoring Status", 
-                    value=f"{monitoring_emoji} {'Active' if stats.get('monitoring_active', False) else 'Inactive'}", 
-                    inline=True
-                )
-                
-                # Database stats
-                embed.add_field(name="Nations Tracked", value=f"{stats.get('total_nations', 0):,}", inline=True)
-                embed.add_field(name="Currently Monitoring", value=f"{stats.get('monitoring_count', 0):,}", inline=True)
-                embed.add_field(name="Reset Times Detected", value=f"{stats.get('reset_times_detected', 0):,}", inline=True)
-                embed.add_field(name="Recent Checks (24h)", value=f"{stats.get('recent_checks_24h', 0):,}", inline=True)
-                
-                # Last scan info
                 last_scan = stats.get('last_full_scan')
-                if last_scan:
-                    embed.add_field(name="Last Full Scan", value=last_scan, inline=False)
                 
-                await ctx.send(embed=embed)
+                fields = [
+                    ("System Status", f"{status_emoji} {'Running' if stats.get('is_running', False) else 'Stopped'}", True),
+                    ("Monitoring Status", f"{monitoring_emoji} {'Active' if stats.get('monitoring_active', False) else 'Inactive'}", True),
+                    # Database stats
+                    ("Nations Tracked", f"{stats.get('total_nations', 0):,}", True),
+                    ("Currently Monitoring", f"{stats.get('monitoring_count', 0):,}", True),
+                    ("Reset Times Detected", f"{stats.get('reset_times_detected', 0):,}", True),
+                    ("Recent Checks (24h)", f"{stats.get('recent_checks_24h', 0):,}", True),
+                    ("Last Full Scan", last_scan, False) if last_scan else None,
+                ]
+                
+                await ctx.send(embed=self._add_fields(self._monitor_template.copy(), fields))
                 
             except Exception as e:
                 await ctx.send(f"An error occurred: {str(e)}")
@@ -464,9 +595,10 @@ class DiscordBot:
                 await ctx.send("🚀 Starting 24/7 espionage monitoring system...")
                 await ctx.send("📊 Phase 1: Indexing all nations...")
                 
-                # Start 24/7 monitoring in background
-                if not self.monitoring_task or self.monitoring_task.done():
-                    self.monitoring_task = asyncio.create_task(self.espionage_monitor.start_24_7_monitoring())
+                # Start 24/7 monitoring in background (at most one, even across reconnects)
+                if not self._background_task(MONITOR_TASK_NAME):
+                    self._spawn_background(self.espionage_monitor.start_24_7_monitoring(), MONITOR_TASK_NAME)
+                self._stats_cache = (0.0, None)
                 
                 await ctx.send("✅ 24/7 monitoring system started!\n"
                               "• All nations will be indexed first\n"
@@ -487,12 +619,18 @@ class DiscordBot:
                     return
                 
                 self.espionage_monitor.stop_monitoring()
+                self._stats_cache = (0.0, None)
                 
-                if self.monitoring_task and not self.monitoring_task.done():
-                    self.monitoring_task.cancel()
+                monitoring_task = self._background_task(MONITOR_TASK_NAME)
+                if monitoring_task:
+                    monitoring_task.cancel()
+                    # Let the cancellation finish so no half-stopped cycle keeps running
+                    await asyncio.gather(monitoring_task, return_exceptions=True)
                 
                 await ctx.send("🛑 Monitoring system stopped!")
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 await ctx.send(f"An error occurred: {str(e)}")
         
@@ -507,30 +645,22 @@ class DiscordBot:
                 result = await self.espionage_monitor.index_all_nations()
                 
                 if result.get('success'):
-                    embed = discord.Embed(
-                        title="✅ Nation Indexing Complete",
-                        color=0x00FF00
-                    )
-                    embed.add_field(name="Total Nations Processed", value=f"{result.get('total_nations', 0):,}", inline=True)
-                    embed.add_field(name="Alliance Nations Indexed", value=f"{result.get('alliance_nations', 0):,}", inline=True)
-                    
-                    # Get current monitoring stats
-                    stats = self.espionage_monitor.get_monitoring_stats()
-                    embed.add_field(name="Now Monitoring", value=f"{stats.get('monitoring_count', 0):,}", inline=True)
+                    # Indexing just changed the counts, so bypass the cached stats
+                    stats = await self._monitoring_stats(fresh=True)
                     
-                    embed.add_field(
-                        name="ℹ️ Note", 
-                        value="• Vacation mode nations were skipped\n"
-                              "• Only alliance members are monitored\n"
-                              "• Monitoring will find daily reset times", 
-                        inline=False
-                    )
+                    embed = self._embed("✅ Nation Indexing Complete", 0x00FF00, [
+                        ("Total Nations Processed", f"{result.get('total_nations', 0):,}", True),
+                        ("Alliance Nations Indexed", f"{result.get('alliance_nations', 0):,}", True),
+                        ("Now Monitoring", f"{stats.get('monitoring_count', 0):,}", True),
+                        ("ℹ️ Note",
+                         "• Vacation mode nations were skipped\n"
+                         "• Only alliance members are monitored\n"
+                         "• Monitoring will find daily reset times",
+                         False),
+                    ])
                 else:
-                    embed = discord.Embed(
-                        title="❌ Indexing Failed",
-                        description=f"Error: {result.get('error', 'Unknown error')}",
-                        color=0xFF0000
-                    )
+                    embed = self._embed("❌ Indexing Failed", 0xFF0000, [],
+                                        description=f"Error: {result.get('error', 'Unknown error')}")
                 
                 await ctx.send(embed=embed)
                 
@@ -538,16 +668,16 @@ class DiscordBot:
                 await ctx.send(f"An error occurred: {str(e)}")
         
         @self.bot.command(name='resets')
+        @commands.cooldown(COMMAND_COOLDOWN_RATE, COMMAND_COOLDOWN_PER, commands.BucketType.user)
         async def show_reset_times(ctx, *, alliance_name: str = None):
             """Show detected reset times for an alliance or all"""
             try:
                 # If alliance name provided, find the alliance
                 alliance_id = None
                 if alliance_name:
-                    search_result = self.pnw_api.query(f'{{alliances(name:["{alliance_name}"]){{data{{id name}}}}}}')
-                    if search_result.get('data', {}).get('alliances', {}).get('data'):
-                        alliance_id = search_result['data']['alliances']['data'][0]['id']
-                    else:
+                    search_result = await self._api('find_alliance', alliance_name)
+                    alliance_id = dig(search_result, 'data', 'alliances', 'data', 0, 'id')
+                    if alliance_id is None:
                         await ctx.send(f"Alliance '{alliance_name}' not found.")
                         return
                 
@@ -557,20 +687,17 @@ class DiscordBot:
                     await ctx.send(f"Error generating report: {report['error']}")
                     return
                 
-                embed = discord.Embed(
-                    title=f"🕐 Reset Times Report{' - ' + alliance_name if alliance_name else ''}",
-                    color=0x4169E1
-                )
-                
-                embed.add_field(name="Total Detections", value=f"{report.get('total_reset_times_detected', 0):,}", inline=True)
-                embed.add_field(name="Unique Nations", value=f"{report.get('unique_nations_with_resets', 0):,}", inline=True)
+                fields = [
+                    ("Total Detections", f"{report.get('total_reset_times_detected', 0):,}", True),
+                    ("Unique Nations", f"{report.get('unique_nations_with_resets', 0):,}", True),
+                ]
                 
                 # Show hourly distribution
                 hourly = report.get('hourly_distribution', {})
                 if hourly:
                     top_hours = sorted(hourly.items(), key=lambda x: x[1], reverse=True)[:5]
                     hour_text = "\n".join([f"{hour:02d}:00 - {count} resets" for hour, count in top_hours])
-                    embed.add_field(name="Peak Reset Hours (UTC)", value=hour_text, inline=False)
+                    fields.append(("Peak Reset Hours (UTC)", hour_text, False))
                 
                 # Show recent detections
                 recent = report.get('recent_detections', [])
@@ -579,25 +706,28 @@ class DiscordBot:
                         f"**{det['nation_name']}** - {det['reset_time'][:16]}" 
                         for det in recent[-5:]
                     ])
-                    embed.add_field(name="Recent Detections", value=recent_text, inline=False)
+                    fields.append(("Recent Detections", recent_text, False))
                 
-                await ctx.send(embed=embed)
+                await ctx.send(embed=self._embed(
+                    f"🕐 Reset Times Report{' - ' + alliance_name if alliance_name else ''}", 0x4169E1, fields
+                ))
                 
             except Exception as e:
                 await ctx.send(f"An error occurred: {str(e)}")
         
         @self.bot.command(name='checknation')
+        @commands.cooldown(COMMAND_COOLDOWN_RATE, COMMAND_COOLDOWN_PER, commands.BucketType.user)
         async def check_specific_nation(ctx, *, nation_name: str):
             """Manually check a specific nation's espionage status"""
             try:
-                # Find the nation
-                search_result = self.pnw_api.search_nations(name=nation_name)
-                if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                # Find the nation along with its current espionage status
+                search_result = await self._lookup_nation(nation_name, 'check_espionage_status')
+                nation_info = dig(search_result, *NATIONS_PATH, 0)
+                if 'errors' in search_result or not nation_info:
                     await ctx.send(f"Nation '{nation_name}' not found.")
                     return
                 
-                nation_data = search_result['data']['nations']['data'][0]
-                nation_id = nation_data['id']
+                nation_id = nation_info.get('id', nation_name)
                 
                 await ctx.send(f"🔍 Checking {nation_name}...")
                 
@@ -607,32 +737,19 @@ class DiscordBot:
                 if result.get('success'):
                     await ctx.send(f"✅ Successfully checked {nation_name}")
                     
-                    # Get current status
-                    spy_result = self.pnw_api.check_espionage_status(nation_id)
-                    if spy_result.get('data'):
-                        nation_info = spy_result['data']['nations']['data'][0]
-                        
-                        embed = discord.Embed(
-                            title=f"🔍 Current Status: {nation_name}",
-                            color=0x9932CC
-                        )
-                        
-                        espionage_available = nation_info.get('espionage_available', True)
-                        embed.add_field(
-                            name="Espionage Available", 
-                            value="✅ Yes" if espionage_available else "❌ No", 
-                            inline=True
-                        )
-                        
-                        if not espionage_available:
-                            beige = nation_info.get('beige_turns', 0)
-                            vmode = nation_info.get('vacation_mode_turns', 0)
-                            if beige > 0:
-                                embed.add_field(name="Protection", value=f"Beige ({beige} turns)", inline=True)
-                            elif vmode > 0:
-                                embed.add_field(name="Protection", value=f"Vacation ({vmode} turns)", inline=True)
-                        
-                        await ctx.send(embed=embed)
+                    # Show the status fetched with the lookup
+                    espionage_available = nation_info.get('espionage_available', True)
+                    fields = [("Espionage Available", "✅ Yes" if espionage_available else "❌ No", True)]
+                    
+                    if not espionage_available:
+                        beige = nation_info.get('beige_turns', 0)
+                        vmode = nation_info.get('vacation_mode_turns', 0)
+                        if beige > 0:
+                            fields.append(("Protection", f"Beige ({beige} turns)", True))
+                        elif vmode > 0:
+                            fields.append(("Protection", f"Vacation ({vmode} turns)", True))
+                    
+                    await ctx.send(embed=self._embed(f"🔍 Current Status: {nation_name}", 0x9932CC, fields))
                 else:
                     await ctx.send(f"❌ Error checking {nation_name}: {result.get('error', 'Unknown error')}")
                 
@@ -645,41 +762,7 @@ class DiscordBot:
         @self.bot.tree.command(name='commands', description='Show all available bot commands')
         async def slash_commands(interaction: discord.Interaction):
             """Show all available commands via slash command"""
-            embed = discord.Embed(
-                title="🤖 Politics & War Bot Commands",
-                description="Available commands for espionage monitoring and game info",
-                color=0x0099ff
-            )
-            
-            # Basic commands
-            embed.add_field(
-                name="📊 Basic Commands",
-                value="`/commands` or `!commands` - Show this help\n"
-                      "`/ping` or `!ping` - Check bot status\n"
-                      "`/gameinfo` or `!gameinfo` - Get game information\n"
-                      "`/nation` or `!nation <name>` - Get nation info",
-                inline=False
-            )
-            
-            # Spy commands
-            embed.add_field(
-                name="🕵️ Espionage Commands",
-                value="`/spy` or `!spy [nation]` - Check spy activity\n"
-                      "`/monitor` or `!monitor` - Check 24/7 monitoring status\n"
-                      "`/resets` or `!resets [alliance]` - Show reset times",
-                inline=False
-            )
-            
-            # Note about slash vs prefix
-            embed.add_field(
-                name="💡 How to Use",
-                value="• Use **slash commands** (`/command`) - type `/` and select from menu\n"
-                      "• Or use **prefix commands** (`!command`) - type `!` followed by command\n"
-                      "• Slash commands are the modern Discord standard! ✨",
-                inline=False
-            )
-            
-            await interaction.response.send_message(embed=embed)
+            await interaction.response.send_message(embed=self._slash_help_embed)
         
         @self.bot.tree.command(name='ping', description='Check if the bot is responsive')
         async def slash_ping(interaction: discord.Interaction):
@@ -694,17 +777,18 @@ class DiscordBot:
                 return
                 
             try:
-                stats = self.espionage_monitor.get_monitoring_stats()
-                
-                embed = discord.Embed(
-                    title="🔍 24/7 Espionage Monitoring Status",
-                    color=0x00ff00 if stats.get('is_running', False) else 0xff0000
+                stats = await self._monitoring_stats()
+                
+                embed = self._embed(
+                    "🔍 24/7 Espionage Monitoring Status",
+                    0x00ff00 if stats.get('is_running', False) else 0xff0000,
+                    [
+                        ("Status", "🟢 Running" if stats.get('is_running') else "🔴 Stopped", True),
+                        ("Nations Monitored", stats.get('total_nations', 0), True),
+                        ("Reset Times Found", stats.get('reset_times_detected', 0), True),
+                    ]
                 )
                 
-                embed.add_field(name="Status", value="🟢 Running" if stats.get('is_running') else "🔴 Stopped", inline=True)
-                embed.add_field(name="Nations Monitored", value=stats.get('total_nations', 0), inline=True)
-                embed.add_field(name="Reset Times Found", value=stats.get('reset_times_detected', 0), inline=True)
-                
                 await interaction.response.send_message(embed=embed)
                 
             except Exception as e:
@@ -723,12 +807,12 @@ class DiscordBot:
             try:
                 if nation:
                     # Search for the specified nation
-                    search_result = self.pnw_api.search_nations(name=nation)
+                    search_result = await self._search_nation(nation)
                     if 'errors' in search_result:
                         await interaction.followup.send(f"❌ Error: {search_result['errors'][0]['message']}")
                         return
                     
-                    nations = search_result.get('data', {}).get('nations', {}).get('data', [])
+                    nations = dig(search_result, *NATIONS_PATH, default=[])
                     if not nations:
                         await interaction.followup.send(f"❌ No nation found with name: {nation}")
                         return
@@ -737,35 +821,26 @@ class DiscordBot:
                     nation_name = nations[0]['nation_name']
                 else:
                     # Get own nation
-                    me_result = self.pnw_api.get_nation()
+                    me_result = await self._api('get_nation')
                     if 'errors' in me_result:
                         await interaction.followup.send(f"❌ Error: {me_result['errors'][0]['message']}")
                         return
                     
-                    nation_data = me_result.get('data', {}).get('me', {}).get('nation', {})
+                    nation_data = dig(me_result, *ME_NATION_PATH, default={})
                     nation_id = nation_data.get('id')
                     nation_name = nation_data.get('nation_name', 'Your Nation')
                 
-                # Get spy activity
-                spy_result = self.pnw_api.get_spy_activity(nation_id)
-                espionage_result = self.pnw_api.check_espionage_status(nation_id)
-                
-                embed = discord.Embed(
-                    title=f"🕵️ Spy Activity: {nation_name}",
-                    color=0x0099ff
-                )
-                
-                if 'data' in spy_result:
-                    embed.add_field(name="Spy Operations", value="Available", inline=True)
-                else:
-                    embed.add_field(name="Spy Operations", value="No recent activity", inline=True)
+                # Get spy activity and espionage status in one request
+                intel = await self._throttled(lambda: asyncio.to_thread(self.pnw_api.get_nation_intel, nation_id))
+                spy_result = intel['spy_activity']
+                espionage_result = intel['espionage_status']
                 
-                if 'data' in espionage_result:
-                    embed.add_field(name="Espionage Status", value="Available", inline=True)
-                else:
-                    embed.add_field(name="Espionage Status", value="No data", inline=True)
+                fields = [
+                    ("Spy Operations", "Available" if 'data' in spy_result else "No recent activity", True),
+                    ("Espionage Status", "Available" if 'data' in espionage_result else "No data", True),
+                ]
                 
-                await interaction.followup.send(embed=embed)
+                await interaction.followup.send(embed=self._embed(f"🕵️ Spy Activity: {nation_name}", 0x0099ff, fields))
                 
             except Exception as e:
                 await interaction.followup.send(f"❌ An error occurred: {str(e)}")
@@ -778,5 +853,7 @@ class DiscordBot:
         
         try:
             await self.bot.start(self.token)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             print(f"Error starting Discord bot: {e}")
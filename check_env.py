@@ -4,8 +4,14 @@ Run this script to verify your environment setup before starting the bot
 """
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
+@lru_cache(maxsize=1)
+def _load_env_file() -> bool:
+    """Load .env into the environment once per process; repeat checks reuse it"""
+    return load_dotenv()
+
 def check_environment():
     """Check if all required environment variables are properly set"""
     print("🔍 Environment Variable Setup Check")
@@ -14,13 +20,16 @@ def check_environment():
     # Load .env file if it exists
     env_file_exists = os.path.exists('.env')
     if env_file_exists:
-        load_dotenv()
+        _load_env_file()
         print("✅ .env file found and loaded")
     else:
         print("⚠️  .env file not found (using system environment variables)")
     
     print()
     
+    # One snapshot of the environment for both checks below
+    env = dict(os.environ)
+    
     # Required variables
     required_vars = {
         'DISCORD_TOKEN': 'Discord Bot Token (required for bot to connect)',
@@ -40,7 +49,7 @@ def check_environment():
     
     all_required_set = True
     for var, description in required_vars.items():
-        value = os.getenv(var)
+        value = env.get(var)
         if value:
             # Don't show full token for security
             display_value = f"{value[:8]}...{value[-4:]}" if len(value) > 12 else "***"
@@ -53,7 +62,7 @@ def check_environment():
     print("-" * 30)
     
     for var, (description, default) in optional_vars.items():
-        value = os.getenv(var)
+        value = env.get(var)
         if value:
             print(f"✅ {var:<15} : {value} ({description})")
         else:
@@ -4,23 +4,197 @@ Database models for tracking nation espionage availability and reset times
 
 import sqlite3
 import json
+import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import Iterator, List, Dict, Any, Optional, Sequence, Tuple
 import os
 
+_log = logging.getLogger(__name__)
+
+# Applied to every connection; WAL + synchronous=NORMAL avoids an fsync on each commit
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Rows pulled per fetchmany() by the streaming getters
+FETCH_CHUNK = 256
+
+# Stored in PRAGMA user_version once init_database has built the schema; bump it whenever
+# the tables, trigger or indexes below change so existing databases are brought up to date
+SCHEMA_VERSION = 2
+
+# Per-connection prepared-statement cache; connections are long-lived, so the
+# fixed SQL below is compiled once per thread and reused
+STATEMENT_CACHE_SIZE = 100
+
+# One status check: (nation_id, espionage_available, beige_turns, vacation_mode_turns, last_active)
+StatusRow = Tuple[int, bool, int, int, Optional[str]]
+
+# One indexed nation: (nation_id, nation_name, alliance_id, alliance_name)
+NationRow = Tuple[int, str, int, str]
+
+# Hot write statements, kept as constants so every call site shares the same cached statement
+_UPSERT_NATION = '''
+    INSERT INTO nations 
+    (id, nation_name, leader_name, alliance_id, alliance_name, score, cities, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(id) DO UPDATE SET
+        nation_name = excluded.nation_name, leader_name = excluded.leader_name,
+        alliance_id = excluded.alliance_id, alliance_name = excluded.alliance_name,
+        score = excluded.score, cities = excluded.cities,
+        last_updated = excluded.last_updated, is_active = 1
+'''
+_INSERT_STATUS = '''
+    INSERT INTO espionage_status 
+    (nation_id, espionage_available, beige_turns, vacation_mode_turns, last_active, checked_at)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+_QUEUE_NATION = '''
+    INSERT INTO monitoring_queue 
+    (nation_id, reason, next_check, added_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(nation_id) DO UPDATE SET reason = excluded.reason, next_check = excluded.next_check
+'''
+_INDEX_NATION = '''
+    INSERT INTO nations 
+    (id, nation_name, alliance_id, alliance_name, last_updated, is_active)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, 1)
+    ON CONFLICT(id) DO UPDATE SET
+        nation_name = excluded.nation_name, alliance_id = excluded.alliance_id,
+        alliance_name = excluded.alliance_name, last_updated = excluded.last_updated,
+        is_active = 1
+'''
+# Queues a nation unless its reset time is already known
+_QUEUE_UNRESOLVED = '''
+    INSERT INTO monitoring_queue 
+    (nation_id, reason, next_check, added_at)
+    SELECT ?1, ?2, ?3, CURRENT_TIMESTAMP
+    WHERE NOT EXISTS (SELECT 1 FROM reset_times WHERE nation_id = ?1)
+    ON CONFLICT(nation_id) DO UPDATE SET reason = excluded.reason, next_check = excluded.next_check
+'''
+_INSERT_RESET = '''
+    INSERT INTO reset_times 
+    (nation_id, reset_time, detection_method, created_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+'''
+_RESCHEDULE = 'UPDATE monitoring_queue SET next_check = ? WHERE nation_id = ?'
+_DEQUEUE = 'DELETE FROM monitoring_queue WHERE nation_id = ?'
+
+# Tables whose sizes shift daily (queue drains, history grows); their planner statistics are refreshed by analyze()
+ANALYZE_TABLES = ('monitoring_queue', 'reset_times', 'espionage_status')
+
+# Secondary indexes: name -> (table, indexed columns)
+INDEXES = {
+    'idx_nation_alliance': ('nations', 'alliance_id'),
+    # Equality on nation_id plus ordered checked_at turns the "last status" lookup into one seek
+    'idx_espionage_nation_checked': ('espionage_status', 'nation_id, checked_at DESC'),
+    'idx_espionage_checked': ('espionage_status', 'checked_at'),
+    'idx_reset_nation': ('reset_times', 'nation_id'),
+    # Serves the queue poll's ORDER BY priority DESC, next_check ASC without a sort step
+    'idx_monitoring_pri_next': ('monitoring_queue', 'priority DESC, next_check ASC'),
+    # Covers the next_check range filter, so the poll reads no table rows for the queue
+    'idx_monitoring_due': ('monitoring_queue', 'next_check, priority, nation_id, reason'),
+    # Newest-first listings (show_storage samples) walk these instead of sorting the whole table
+    'idx_nations_last_updated': ('nations', 'last_updated DESC'),
+    'idx_reset_created': ('reset_times', 'created_at DESC, nation_id'),
+}
+
+# Indexes replaced by the ones above; dropped from existing databases
+OBSOLETE_INDEXES = ('idx_monitoring_next_check', 'idx_espionage_nation')
+
+def open_db(db_path: str, readonly: bool = False, **connect_kwargs) -> sqlite3.Connection:
+    """
+    Open the tracker database with the tuned connection pragmas
+    
+    Shared by the tracker and the standalone scripts so every connection gets the
+    same settings. Writable connections also switch the file to WAL, so readers never
+    block the bot's writer; `readonly` connections take shared locks only.
+    """
+    if readonly:
+        conn = sqlite3.connect(f"{Path(db_path).absolute().as_uri()}?mode=ro", uri=True, **connect_kwargs)
+    else:
+        conn = sqlite3.connect(db_path, **connect_kwargs)
+        # journal_mode is persistent in the file and a no-op once set
+        conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 class EspionageTracker:
     """Database manager for tracking nation espionage availability"""
     
     def __init__(self, db_path: str = "database/espionage_tracker.db"):
         self.db_path = db_path
+        # One long-lived connection per thread, reused across calls
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection to the tracker database, opened with the tuned pragmas on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = open_db(self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+            # Rows support both positional and column-name access, so getters can return them as-is
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def connection(self) -> sqlite3.Connection:
+        """
+        This thread's long-lived tracker connection, for callers running their own SQL
+        
+        Use it as `with tracker.connection() as conn:`; the block commits (or rolls
+        back) on exit but leaves the connection open for the thread's next caller.
+        Rows come back as sqlite3.Row.
+        """
+        return self._connect()
+    
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in a BEGIN IMMEDIATE transaction, committing on success"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    
+    def close(self):
+        """Close every connection this tracker has opened, letting SQLite refresh stale planner statistics first"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            conn.close()
+        self._local = threading.local()
+    
     def init_database(self):
         """Initialize the database with required tables"""
         # Ensure directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        with sqlite3.connect(self.db_path) as conn:
+        # Schema already current: skip the DDL entirely
+        conn = self._connect()
+        if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+        
+        with self._write() as conn:
             cursor = conn.cursor()
             
             # Nations table - stores basic nation information
@@ -52,6 +226,19 @@ class EspionageTracker:
                 )
             ''')
             
+            # Espionage status archive - status rows moved out of the hot table by archive_old_statuses
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS espionage_status_archive (
+                    id INTEGER PRIMARY KEY,
+                    nation_id INTEGER,
+                    espionage_available BOOLEAN,
+                    beige_turns INTEGER DEFAULT 0,
+                    vacation_mode_turns INTEGER DEFAULT 0,
+                    last_active TIMESTAMP,
+                    checked_at TIMESTAMP
+                )
+            ''')
+            
             # Reset times table - stores detected daily reset times
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS reset_times (
@@ -79,26 +266,70 @@ class EspionageTracker:
                 )
             ''')
             
-            # Create indexes for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_nation_alliance ON nations (alliance_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_espionage_nation ON espionage_status (nation_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_espionage_checked ON espionage_status (checked_at)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_reset_nation ON reset_times (nation_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_monitoring_next_check ON monitoring_queue (next_check)')
+            # One queue entry per nation, backing the ON CONFLICT(nation_id) upserts. Databases
+            # from before the constraint may hold duplicates; keep the newest entry of each
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_monitoring_nation'")
+            if cursor.fetchone() is None:
+                cursor.execute('''
+                    DELETE FROM monitoring_queue
+                    WHERE id NOT IN (SELECT MAX(id) FROM monitoring_queue GROUP BY nation_id)
+                ''')
+                cursor.execute('CREATE UNIQUE INDEX idx_monitoring_nation ON monitoring_queue (nation_id)')
             
-            conn.commit()
+            # Reset detection: a protection -> available transition records the reset time
+            # and ends monitoring for that nation, for every status row however it is inserted
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_reset_detect
+                AFTER INSERT ON espionage_status
+                WHEN NEW.espionage_available AND (
+                    SELECT espionage_available FROM espionage_status
+                    WHERE nation_id = NEW.nation_id AND id <> NEW.id
+                    ORDER BY checked_at DESC, id DESC
+                    LIMIT 1
+                ) = 0
+                BEGIN
+                    INSERT INTO reset_times (nation_id, reset_time, detection_method, created_at)
+                    VALUES (NEW.nation_id, CURRENT_TIMESTAMP, 'protection_to_available', CURRENT_TIMESTAMP);
+                    DELETE FROM monitoring_queue WHERE nation_id = NEW.nation_id;
+                END
+            ''')
+        
+        # Create indexes for better performance
+        self.create_indexes()
+        with self._write() as conn:
+            for name in OBSOLETE_INDEXES:
+                conn.execute(f'DROP INDEX IF EXISTS {name}')
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def create_indexes(self, *tables: str):
+        """Create the secondary indexes (all, or only those on the given tables)"""
+        with self._write() as conn:
+            for name, (table, columns) in INDEXES.items():
+                if not tables or table in tables:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+    
+    def drop_indexes(self, *tables: str):
+        """
+        Drop the secondary indexes (all, or only those on the given tables)
+        
+        Bulk loads can bracket themselves with drop_indexes()/create_indexes()
+        so rows are inserted without per-row B-tree maintenance. This also clears
+        the schema version, so the next init_database() re-runs its DDL and
+        restores any index a load that died midway left missing.
+        """
+        with self._write() as conn:
+            for name, (table, _) in INDEXES.items():
+                if not tables or table in tables:
+                    conn.execute(f'DROP INDEX IF EXISTS {name}')
+            conn.execute("PRAGMA user_version = 0")
     
     def add_nation(self, nation_data: Dict[str, Any]) -> bool:
         """Add or update a nation in the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO nations 
-                    (id, nation_name, leader_name, alliance_id, alliance_name, score, cities, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
+                cursor.execute(_UPSERT_NATION, (
                     nation_data.get('id'),
                     nation_data.get('nation_name'),
                     nation_data.get('leader_name'),
@@ -107,83 +338,104 @@ class EspionageTracker:
                     nation_data.get('score'),
                     nation_data.get('num_cities')
                 ))
-                
-                conn.commit()
                 return True
         except Exception as e:
-            print(f"Error adding nation {nation_data.get('nation_name', 'Unknown')}: {e}")
+            _log.error("Error adding nation %s: %s", nation_data.get('nation_name', 'Unknown'), e)
             return False
     
     def update_espionage_status(self, nation_id: int, status_data: Dict[str, Any]) -> bool:
         """Update espionage status for a nation"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT INTO espionage_status 
-                    (nation_id, espionage_available, beige_turns, vacation_mode_turns, last_active, checked_at)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
+                cursor.execute(_INSERT_STATUS, (
                     nation_id,
                     status_data.get('espionage_available', True),
                     status_data.get('beige_turns', 0),
                     status_data.get('vacation_mode_turns', 0),
                     status_data.get('last_active')
                 ))
-                
-                conn.commit()
                 return True
         except Exception as e:
-            print(f"Error updating espionage status for nation {nation_id}: {e}")
+            _log.error("Error updating espionage status for nation %s: %s", nation_id, e)
             return False
     
     def add_to_monitoring_queue(self, nation_id: int, reason: str = "espionage_unavailable") -> bool:
         """Add a nation to the monitoring queue"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
                 # Calculate next check time (2 hours from now)
                 next_check = datetime.utcnow() + timedelta(hours=2)
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO monitoring_queue 
-                    (nation_id, reason, next_check, added_at)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (nation_id, reason, next_check))
-                
-                conn.commit()
+                cursor.execute(_QUEUE_NATION, (nation_id, reason, next_check))
                 return True
         except Exception as e:
-            print(f"Error adding nation {nation_id} to monitoring queue: {e}")
+            _log.error("Error adding nation %s to monitoring queue: %s", nation_id, e)
             return False
     
+    def add_nations_bulk(self, nations: Sequence[Dict[str, Any]], queued: Sequence[Tuple[int, str]] = ()) -> int:
+        """
+        Add nations with their espionage status in one transaction
+        
+        Equivalent to update_espionage_status for every nation and
+        add_to_monitoring_queue for every (nation_id, reason) in queued. Nations
+        are upserted like add_or_update_nation: only the id, name and alliance
+        columns are written, so leader, score and city counts are left as they are.
+        
+        Returns:
+            Number of nations written (0 if the transaction failed)
+        """
+        if not nations:
+            return 0
+        
+        try:
+            with self._write() as conn:
+                cursor = conn.cursor()
+                
+                cursor.executemany(_INDEX_NATION, [(
+                    nation.get('id'),
+                    nation.get('nation_name'),
+                    nation.get('alliance_id'),
+                    nation.get('alliance', {}).get('name') if nation.get('alliance') else None
+                ) for nation in nations])
+                cursor.executemany(_INSERT_STATUS, [(
+                    nation.get('id'),
+                    nation.get('espionage_available', True),
+                    nation.get('beige_turns', 0),
+                    nation.get('vacation_mode_turns', 0),
+                    nation.get('last_active')
+                ) for nation in nations])
+                
+                if queued:
+                    next_check = datetime.utcnow() + timedelta(hours=2)
+                    cursor.executemany(_QUEUE_NATION, [(nation_id, reason, next_check) for nation_id, reason in queued])
+                return len(nations)
+        except Exception as e:
+            _log.error("Error adding %s nations: %s", len(nations), e)
+            return 0
+    
     def record_reset_time(self, nation_id: int, reset_time: datetime, detection_method: str = "espionage_availability") -> bool:
         """Record a detected reset time for a nation"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT INTO reset_times 
-                    (nation_id, reset_time, detection_method, created_at)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (nation_id, reset_time, detection_method))
+                cursor.execute(_INSERT_RESET, (nation_id, reset_time, detection_method))
                 
                 # Remove from monitoring queue since we found the reset time
-                cursor.execute('DELETE FROM monitoring_queue WHERE nation_id = ?', (nation_id,))
-                
-                conn.commit()
+                cursor.execute(_DEQUEUE, (nation_id,))
                 return True
         except Exception as e:
-            print(f"Error recording reset time for nation {nation_id}: {e}")
+            _log.error("Error recording reset time for nation %s: %s", nation_id, e)
             return False
     
-    def get_nations_to_monitor(self) -> List[Dict[str, Any]]:
+    def get_nations_to_monitor(self) -> List[sqlite3.Row]:
         """Get nations that need to be checked (next_check time has passed)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -195,23 +447,35 @@ class EspionageTracker:
                     LIMIT 50
                 ''')
                 
-                return [
-                    {
-                        'nation_id': row[0],
-                        'nation_name': row[1],
-                        'reason': row[2],
-                        'next_check': row[3]
-                    }
-                    for row in cursor.fetchall()
-                ]
+                return cursor.fetchall()
+        except Exception as e:
+            _log.error("Error getting nations to monitor: %s", e)
+            return []
+    
+    def get_nation_ids_to_monitor(self) -> List[int]:
+        """IDs of the nations get_nations_to_monitor would return, in the same order"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT mq.nation_id
+                    FROM monitoring_queue mq
+                    JOIN nations n ON mq.nation_id = n.id
+                    WHERE mq.next_check <= CURRENT_TIMESTAMP
+                    ORDER BY mq.priority DESC, mq.next_check ASC
+                    LIMIT 50
+                ''')
+                
+                return [row[0] for row in cursor.fetchall()]
         except Exception as e:
-            print(f"Error getting nations to monitor: {e}")
+            _log.error("Error getting nations to monitor: %s", e)
             return []
     
-    def get_nation_reset_times(self, nation_id: int = None) -> List[Dict[str, Any]]:
-        """Get reset times for a nation or all nations"""
+    def get_nation_reset_times(self, nation_id: int = None) -> Iterator[sqlite3.Row]:
+        """Yield reset times for a nation or all nations, fetched FETCH_CHUNK rows at a time"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 if nation_id:
@@ -233,26 +497,18 @@ class EspionageTracker:
                         LIMIT 100
                     ''')
                 
-                return [
-                    {
-                        'nation_id': row[0],
-                        'nation_name': row[1],
-                        'reset_time': row[2],
-                        'confidence_level': row[3],
-                        'detection_method': row[4],
-                        'verified': row[5],
-                        'created_at': row[6]
-                    }
-                    for row in cursor.fetchall()
-                ]
+                while True:
+                    rows = cursor.fetchmany(FETCH_CHUNK)
+                    if not rows:
+                        break
+                    yield from rows
         except Exception as e:
-            print(f"Error getting reset times: {e}")
-            return []
+            _log.error("Error getting reset times: %s", e)
     
-    def get_alliance_nations(self, alliance_id: int = None) -> List[Dict[str, Any]]:
+    def get_alliance_nations(self, alliance_id: int = None) -> List[sqlite3.Row]:
         """Get all nations in alliances (or specific alliance)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 if alliance_id:
@@ -270,93 +526,80 @@ class EspionageTracker:
                         ORDER BY alliance_id, score DESC
                     ''')
                 
-                return [
-                    {
-                        'id': row[0],
-                        'nation_name': row[1],
-                        'leader_name': row[2],
-                        'alliance_id': row[3],
-                        'alliance_name': row[4],
-                        'score': row[5],
-                        'cities': row[6]
-                    }
-                    for row in cursor.fetchall()
-                ]
+                return cursor.fetchall()
         except Exception as e:
-            print(f"Error getting alliance nations: {e}")
+            _log.error("Error getting alliance nations: %s", e)
             return []
     
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
-                # Total nations
-                cursor.execute('SELECT COUNT(*) FROM nations WHERE alliance_id > 0 AND is_active = 1')
-                total_nations = cursor.fetchone()[0]
-                
-                # Nations being monitored
-                cursor.execute('SELECT COUNT(*) FROM monitoring_queue')
-                monitoring_count = cursor.fetchone()[0]
-                
-                # Reset times detected
-                cursor.execute('SELECT COUNT(*) FROM reset_times')
-                reset_times_count = cursor.fetchone()[0]
-                
-                # Recent status checks
-                cursor.execute('SELECT COUNT(*) FROM espionage_status WHERE checked_at > datetime("now", "-24 hours")')
-                recent_checks = cursor.fetchone()[0]
-                
-                return {
-                    'total_nations': total_nations,
-                    'monitoring_count': monitoring_count,
-                    'reset_times_detected': reset_times_count,
-                    'recent_checks_24h': recent_checks
-                }
+                # One statement for all counts; the bound cutoff (in CURRENT_TIMESTAMP's format)
+                # lets idx_espionage_checked answer the recent-checks count as an index range scan
+                cutoff = (datetime.utcnow() - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                    SELECT
+                        (SELECT COUNT(*) FROM nations WHERE alliance_id > 0 AND is_active = 1) AS total_nations,
+                        (SELECT COUNT(*) FROM monitoring_queue) AS monitoring_count,
+                        (SELECT COUNT(*) FROM reset_times) AS reset_times_detected,
+                        (SELECT COUNT(*) FROM espionage_status WHERE checked_at > ?) AS recent_checks_24h
+                ''', (cutoff,))
+                
+                return dict(cursor.fetchone())
         except Exception as e:
-            print(f"Error getting stats: {e}")
+            _log.error("Error getting stats: %s", e)
             return {}
     
     def add_or_update_nation(self, nation_id: int, nation_name: str, alliance_id: int, 
                            alliance_name: str, last_active: str, should_monitor: bool = True) -> bool:
         """Add or update a nation and optionally add to monitoring"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Add/update nation
-                cursor.execute('''
-                    INSERT OR REPLACE INTO nations 
-                    (id, nation_name, alliance_id, alliance_name, last_updated, is_active)
-                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, 1)
-                ''', (nation_id, nation_name, alliance_id, alliance_name))
-                
-                # Add to monitoring if requested and not already found reset time
-                if should_monitor:
-                    # Check if we already have reset time for this nation
-                    cursor.execute('SELECT COUNT(*) FROM reset_times WHERE nation_id = ?', (nation_id,))
-                    has_reset_time = cursor.fetchone()[0] > 0
-                    
-                    if not has_reset_time:
-                        # Add to monitoring queue  
-                        next_check = datetime.utcnow() + timedelta(hours=2)  # Check in 2 hours (turn change interval)
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO monitoring_queue 
-                            (nation_id, reason, next_check, added_at)
-                            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                        ''', (nation_id, "new_nation_monitoring", next_check))
-                
-                conn.commit()
+            with self._write() as conn:
+                self._index_nations(conn.cursor(), [(nation_id, nation_name, alliance_id, alliance_name)],
+                                    should_monitor)
                 return True
         except Exception as e:
-            print(f"Error adding/updating nation {nation_name}: {e}")
+            _log.error("Error adding/updating nation %s: %s", nation_name, e)
             return False
     
-    def get_nations_needing_monitoring(self) -> List[Dict[str, Any]]:
+    def add_or_update_nations_bulk(self, rows: Sequence[NationRow], should_monitor: bool = True) -> int:
+        """
+        Add or update many nations in one transaction, like add_or_update_nation
+        
+        Args:
+            rows: (nation_id, nation_name, alliance_id, alliance_name) tuples
+            should_monitor: Queue the nations whose reset time isn't known yet
+            
+        Returns:
+            Number of nations written (0 if the transaction failed)
+        """
+        if not rows:
+            return 0
+        
+        try:
+            with self._write() as conn:
+                self._index_nations(conn.cursor(), rows, should_monitor)
+                return len(rows)
+        except Exception as e:
+            _log.error("Error adding/updating %s nations: %s", len(rows), e)
+            return 0
+    
+    def _index_nations(self, cursor: sqlite3.Cursor, rows: Sequence[NationRow], should_monitor: bool):
+        """Upsert nations and queue the unresolved ones, inside the caller's transaction"""
+        cursor.executemany(_INDEX_NATION, rows)
+        
+        # Add to monitoring if requested and not already found reset time
+        if should_monitor:
+            next_check = datetime.utcnow() + timedelta(hours=2)  # Check in 2 hours (turn change interval)
+            cursor.executemany(_QUEUE_UNRESOLVED, [(row[0], "new_nation_monitoring", next_check) for row in rows])
+    
+    def get_nations_needing_monitoring(self) -> List[sqlite3.Row]:
         """Get nations that need espionage monitoring (no reset time found yet)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -369,165 +612,173 @@ class EspionageTracker:
                     LIMIT 100
                 ''')
                 
-                return [
-                    {
-                        'nation_id': row[0],
-                        'nation_name': row[1],
-                        'alliance_name': row[2],
-                        'next_check': row[3]
-                    }
-                    for row in cursor.fetchall()
-                ]
+                return cursor.fetchall()
         except Exception as e:
-            print(f"Error getting nations needing monitoring: {e}")
+            _log.error("Error getting nations needing monitoring: %s", e)
             return []
     
     def record_espionage_status(self, nation_id: int, espionage_available: bool, 
                               beige_turns: int, vacation_mode_turns: int) -> bool:
         """Record espionage status and detect reset time if status changed"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                # Get last status for this nation
-                cursor.execute('''
-                    SELECT espionage_available, checked_at 
-                    FROM espionage_status 
-                    WHERE nation_id = ? 
-                    ORDER BY checked_at DESC 
-                    LIMIT 1
-                ''', (nation_id,))
-                
-                last_status = cursor.fetchone()
-                reset_detected = False
-                
-                # Check for reset time detection (protection -> available)
-                if last_status:
-                    last_available = bool(last_status[0])
-                    
-                    # If last check was unavailable and now available = reset time!
-                    if not last_available and espionage_available:
-                        # Record reset time
-                        now = datetime.utcnow()
-                        cursor.execute('''
-                            INSERT INTO reset_times 
-                            (nation_id, reset_time, detection_method, created_at)
-                            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                        ''', (nation_id, now, "protection_to_available"))
-                        
-                        reset_detected = True
-                
-                # Record current status
-                cursor.execute('''
-                    INSERT INTO espionage_status 
-                    (nation_id, espionage_available, beige_turns, vacation_mode_turns, checked_at)
-                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (nation_id, espionage_available, beige_turns, vacation_mode_turns))
+                # trg_reset_detect records the reset time (and dequeues the nation) on protection -> available
+                reset_detected = bool(self._insert_statuses(
+                    cursor, [(nation_id, espionage_available, beige_turns, vacation_mode_turns, None)]
+                ))
                 
                 # Update next check time if still monitoring
                 if not reset_detected:
                     next_check = datetime.utcnow() + timedelta(hours=2)  # Check again in 2 hours (turn change)
-                    cursor.execute('''
-                        UPDATE monitoring_queue 
-                        SET next_check = ? 
-                        WHERE nation_id = ?
-                    ''', (next_check, nation_id))
-                
-                conn.commit()
+                    cursor.execute(_RESCHEDULE, (next_check, nation_id))
                 return reset_detected
                 
         except Exception as e:
-            print(f"Error recording espionage status for nation {nation_id}: {e}")
+            _log.error("Error recording espionage status for nation %s: %s", nation_id, e)
             return False
     
+    def record_espionage_status_bulk(self, updates: Sequence[StatusRow]) -> List[int]:
+        """
+        Record many status checks in one transaction, detecting reset times like record_espionage_status
+        
+        Args:
+            updates: (nation_id, espionage_available, beige_turns, vacation_mode_turns, last_active) tuples
+            
+        Returns:
+            IDs of the nations whose reset time was detected; they are removed from the monitoring queue
+        """
+        if not updates:
+            return []
+        
+        try:
+            with self._write() as conn:
+                cursor = conn.cursor()
+                
+                # trg_reset_detect handles reset detection row by row, repeats of a nation included
+                reset_ids = self._insert_statuses(cursor, updates)
+                
+                # Found nations were dequeued by the trigger; the rest are rescheduled
+                next_check = datetime.utcnow() + timedelta(hours=2)  # Check again in 2 hours (turn change)
+                cursor.executemany(_RESCHEDULE, [(next_check, nation_id)
+                                                 for nation_id in dict.fromkeys(u[0] for u in updates)])
+                return reset_ids
+                
+        except Exception as e:
+            _log.error("Error recording espionage status for %s nations: %s", len(updates), e)
+            return []
+    
+    @staticmethod
+    def _insert_statuses(cursor: sqlite3.Cursor, rows: Sequence[StatusRow]) -> List[int]:
+        """Insert status rows and return the nation IDs trg_reset_detect found a reset time for"""
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM reset_times')
+        watermark = cursor.fetchone()[0]
+        cursor.executemany(_INSERT_STATUS, rows)
+        cursor.execute('SELECT nation_id FROM reset_times WHERE id > ? ORDER BY id', (watermark,))
+        return [row[0] for row in cursor.fetchall()]
+    
     def stop_monitoring_nation(self, nation_id: int) -> bool:
         """Remove a nation from monitoring (reset time found)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
-                cursor.execute('DELETE FROM monitoring_queue WHERE nation_id = ?', (nation_id,))
-                conn.commit()
+                cursor.execute(_DEQUEUE, (nation_id,))
+                return True
+        except Exception as e:
+            _log.error("Error stopping monitoring for nation %s: %s", nation_id, e)
+            return False
+    
+    def analyze(self) -> bool:
+        """Refresh the query planner's statistics (sqlite_stat1) for ANALYZE_TABLES"""
+        try:
+            with self._write() as conn:
+                for table in ANALYZE_TABLES:
+                    conn.execute(f'ANALYZE {table}')
                 return True
         except Exception as e:
-            print(f"Error stopping monitoring for nation {nation_id}: {e}")
+            _log.error("Error analyzing database: %s", e)
             return False
     
+    def archive_old_statuses(self, days: int = 30) -> int:
+        """
+        Move status rows older than `days` into espionage_status_archive
+        
+        Keeps espionage_status (and the indexes behind the last-status lookup) limited
+        to recent history. Returns the number of rows archived.
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            with self._write() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO espionage_status_archive
+                    SELECT * FROM espionage_status WHERE checked_at < ?
+                ''', (cutoff,))
+                cursor.execute('DELETE FROM espionage_status WHERE checked_at < ?', (cutoff,))
+                return cursor.rowcount
+        except Exception as e:
+            _log.error("Error archiving old espionage statuses: %s", e)
+            return 0
+    
     def get_latest_nation_id(self) -> int:
         """Get the highest nation ID in our database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT COALESCE(MAX(id), 0) FROM nations')
                 return cursor.fetchone()[0]
         except Exception as e:
-            print(f"Error getting latest nation ID: {e}")
+            _log.error("Error getting latest nation ID: %s", e)
             return 0
     
     def cleanup_monitoring_queue(self) -> int:
         """Clean up monitoring queue (remove vacation/non-alliance nations)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write() as conn:
                 cursor = conn.cursor()
                 
-                # Remove nations that are no longer active or went into vacation
+                # Remove nations that already have reset times, are no longer active or went into
+                # vacation; correlated EXISTS lets each queue row stop at its first index hit
                 cursor.execute('''
                     DELETE FROM monitoring_queue 
-                    WHERE nation_id IN (
-                        SELECT n.id FROM nations n
-                        WHERE n.alliance_id IS NULL 
-                        OR n.is_active = 0
+                    WHERE EXISTS (
+                        SELECT 1 FROM reset_times r
+                        WHERE r.nation_id = monitoring_queue.nation_id
                     )
-                ''')
-                
-                # Remove nations that already have reset times
-                cursor.execute('''
-                    DELETE FROM monitoring_queue 
-                    WHERE nation_id IN (
-                        SELECT nation_id FROM reset_times
+                    OR EXISTS (
+                        SELECT 1 FROM nations n
+                        WHERE n.id = monitoring_queue.nation_id
+                        AND (n.alliance_id IS NULL OR n.is_active = 0)
                     )
                 ''')
                 
                 cleanup_count = cursor.rowcount
-                conn.commit()
                 return cleanup_count
                 
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            _log.error("Error during cleanup: %s", e)
             return 0
     
     def get_database_stats(self) -> Dict[str, Any]:
         """Get comprehensive database statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
-                # Total nations
-                cursor.execute('SELECT COUNT(*) FROM nations WHERE alliance_id IS NOT NULL AND is_active = 1')
-                total_nations = cursor.fetchone()[0]
-                
-                # Nations being monitored
-                cursor.execute('SELECT COUNT(*) FROM monitoring_queue')
-                monitoring_count = cursor.fetchone()[0]
-                
-                # Reset times detected
-                cursor.execute('SELECT COUNT(*) FROM reset_times')
-                reset_times_count = cursor.fetchone()[0]
-                
-                # Recent status checks
-                cursor.execute('SELECT COUNT(*) FROM espionage_status WHERE checked_at > datetime("now", "-24 hours")')
-                recent_checks = cursor.fetchone()[0]
-                
-                # Unique nations with reset times
-                cursor.execute('SELECT COUNT(DISTINCT nation_id) FROM reset_times')
-                unique_nations_with_resets = cursor.fetchone()[0]
-                
-                return {
-                    'total_nations': total_nations,
-                    'monitoring_count': monitoring_count,
-                    'reset_times_detected': reset_times_count,
-                    'recent_checks_24h': recent_checks,
-                    'unique_nations_with_resets': unique_nations_with_resets
-                }
+                # One statement for all counts; the bound cutoff (in CURRENT_TIMESTAMP's format)
+                # lets idx_espionage_checked answer the recent-checks count as an index range scan
+                cutoff = (datetime.utcnow() - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                    SELECT
+                        (SELECT COUNT(*) FROM nations WHERE alliance_id IS NOT NULL AND is_active = 1) AS total_nations,
+                        (SELECT COUNT(*) FROM monitoring_queue) AS monitoring_count,
+                        (SELECT COUNT(*) FROM reset_times) AS reset_times_detected,
+                        (SELECT COUNT(*) FROM espionage_status WHERE checked_at > ?) AS recent_checks_24h,
+                        (SELECT COUNT(DISTINCT nation_id) FROM reset_times) AS unique_nations_with_resets
+                ''', (cutoff,))
+                
+                return dict(cursor.fetchone())
         except Exception as e:
-            print(f"Error getting database stats: {e}")
+            _log.error("Error getting database stats: %s", e)
             return {}
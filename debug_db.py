@@ -5,68 +5,79 @@ Quick database debug script to check what's in the database
 
 import sqlite3
 import os
+import sys
+from typing import Optional
+from database.espionage_tracker import open_db
 
-# Find the database
+# Queries run by debug_database(); a missing table surfaces as OperationalError.
+# Q_NATION_COUNTS gets the total, active and alliance nation counts in one scan
+Q_NATION_COUNTS = '''
+    SELECT COUNT(*), COALESCE(SUM(is_active = 1), 0), COALESCE(SUM(alliance_id IS NOT NULL), 0)
+    FROM nations
+'''
+Q_SAMPLE_NATIONS = 'SELECT id, nation_name, alliance_id FROM nations LIMIT 5'
+Q_COUNT_QUEUE = 'SELECT COUNT(*) FROM monitoring_queue'
+Q_COUNT_RESETS = 'SELECT COUNT(*) FROM reset_times'
+
+# Usual database locations, checked in order when no path is given
 db_paths = [
     'database/espionage.db',
     'espionage.db',
     'bot/database/espionage.db'
 ]
 
-for db_path in db_paths:
-    if os.path.exists(db_path):
-        print(f"Found database at: {db_path}")
-        
-        try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check tables exist
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = cursor.fetchall()
-                print(f"Tables: {[table[0] for table in tables]}")
-                
-                # Check nations table
-                if ('nations',) in tables:
-                    cursor.execute('SELECT COUNT(*) FROM nations')
-                    total_nations = cursor.fetchone()[0]
-                    print(f"Total nations: {total_nations}")
-                    
-                    cursor.execute('SELECT COUNT(*) FROM nations WHERE is_active = 1')
-                    active_nations = cursor.fetchone()[0]
-                    print(f"Active nations: {active_nations}")
-                    
-                    cursor.execute('SELECT COUNT(*) FROM nations WHERE alliance_id IS NOT NULL')
-                    alliance_nations = cursor.fetchone()[0]
-                    print(f"Alliance nations: {alliance_nations}")
-                    
-                    # Sample data
-                    cursor.execute('SELECT id, nation_name, alliance_id FROM nations LIMIT 5')
-                    sample = cursor.fetchall()
-                    print(f"Sample nations: {sample}")
-                else:
-                    print("Nations table not found!")
-                
-                # Check monitoring queue
-                if ('monitoring_queue',) in tables:
-                    cursor.execute('SELECT COUNT(*) FROM monitoring_queue')
-                    queue_count = cursor.fetchone()[0]
-                    print(f"Monitoring queue: {queue_count}")
-                else:
-                    print("Monitoring queue table not found!")
-                
-                # Check reset times
-                if ('reset_times',) in tables:
-                    cursor.execute('SELECT COUNT(*) FROM reset_times')
-                    reset_count = cursor.fetchone()[0]
-                    print(f"Reset times: {reset_count}")
-                else:
-                    print("Reset times table not found!")
+def find_database() -> Optional[str]:
+    """The database path from argv or ESPIONAGE_DB, else the first of db_paths that exists"""
+    if len(sys.argv) > 1:
+        return sys.argv[1]
+    return os.getenv('ESPIONAGE_DB') or next((path for path in db_paths if os.path.exists(path)), None)
+
+def debug_database(db_path: str):
+    """Print table counts and a few sample rows for the database at db_path"""
+    print(f"Found database at: {db_path}")
+    
+    try:
+        with open_db(db_path, readonly=True) as conn:
+            cursor = conn.cursor()
+            
+            # Check nations table
+            try:
+                cursor.execute(Q_NATION_COUNTS)
+                total_nations, active_nations, alliance_nations = cursor.fetchone()
+                print(f"Total nations: {total_nations}")
+                print(f"Active nations: {active_nations}")
+                print(f"Alliance nations: {alliance_nations}")
                 
-        except Exception as e:
-            print(f"Error accessing database: {e}")
-        
-        break
-else:
-    print("No database found!")
-    print("Checked paths:", db_paths)
+                # Sample data
+                cursor.execute(Q_SAMPLE_NATIONS)
+                sample = cursor.fetchmany(5)
+                print(f"Sample nations: {sample}")
+            except sqlite3.OperationalError:
+                print("Nations table not found!")
+            
+            # Check monitoring queue
+            try:
+                cursor.execute(Q_COUNT_QUEUE)
+                queue_count = cursor.fetchone()[0]
+                print(f"Monitoring queue: {queue_count}")
+            except sqlite3.OperationalError:
+                print("Monitoring queue table not found!")
+            
+            # Check reset times
+            try:
+                cursor.execute(Q_COUNT_RESETS)
+                reset_count = cursor.fetchone()[0]
+                print(f"Reset times: {reset_count}")
+            except sqlite3.OperationalError:
+                print("Reset times table not found!")
+            
+    except Exception as e:
+        print(f"Error accessing database: {e}")
+
+if __name__ == "__main__":
+    db_path = find_database()
+    if db_path and os.path.exists(db_path):
+        debug_database(db_path)
+    else:
+        print("No database found!")
+        print("Checked paths:", [db_path] if db_path else db_paths)
@@ -4,37 +4,73 @@ Simple health server for Railway deployment
 Only runs Flask for health checks without requiring environment variables
 """
 
-from flask import Flask, jsonify
+import json
 import os
 
-def create_health_app():
-    """Create a minimal Flask app with just health endpoint"""
+SERVICE_NAME = "Politics & War Discord Bot"
+
+# orjson encodes the payloads much faster; fall back to the stdlib without it
+try:
+    import orjson
+    
+    def _json_body(payload: dict) -> bytes:
+        """Compact JSON encoding of a response payload"""
+        return orjson.dumps(payload)
+except ImportError:
+    def _json_body(payload: dict) -> bytes:
+        """Compact JSON encoding of a response payload"""
+        return json.dumps(payload, separators=(',', ':')).encode()
+
+# waitress worker threads and open-connection cap for the health server
+WSGI_THREADS = 8
+WSGI_CONNECTION_LIMIT = 200
+
+def create_health_app(mode: str = "health-only", status: str = "health-only mode",
+                      message: str = "Set DISCORD_TOKEN and PNW_API_KEY to enable full functionality",
+                      error: str = None):
+    """
+    Create a minimal Flask app with just health endpoints
+    
+    Shared by every entry point that can't (or shouldn't) start the full bot;
+    `mode` and `status` tell them apart, and `error` records why a fallback started.
+    """
+    # Imported here so `import health_server` stays cheap for callers that never serve
+    from flask import Flask
+    
     app = Flask(__name__)
+    extra = {"error": error} if error else {}
+    
+    # The payloads never change for the life of the app, so serialize them once
+    health_body = _json_body({
+        "status": "healthy",
+        "service": SERVICE_NAME,
+        "version": "2.0",
+        "mode": mode,
+        **extra
+    })
+    index_body = _json_body({
+        "service": SERVICE_NAME,
+        "status": status,
+        "message": message,
+        **extra
+    })
     
     @app.route('/health')
     def health():
         """Health check endpoint for Railway deployment"""
-        return jsonify({
-            "status": "healthy",
-            "service": "Politics & War Discord Bot",
-            "version": "2.0",
-            "mode": "health-only"
-        }), 200
+        return app.response_class(health_body, status=200, mimetype='application/json')
     
     @app.route('/')
     def index():
         """Root endpoint"""
-        return jsonify({
-            "service": "Politics & War Discord Bot",
-            "status": "health-only mode",
-            "message": "Set DISCORD_TOKEN and PNW_API_KEY to enable full functionality"
-        })
+        return app.response_class(index_body, mimetype='application/json')
     
     return app
 
-def main():
-    """Run the health server"""
-    app = create_health_app()
+
+def run_health_server(app=None):
+    """Run a health app (the default health-only one if none is given) on Railway's PORT"""
+    app = app or create_health_app()
     
     # Railway uses PORT environment variable
     port = int(os.getenv('PORT', 5000))
@@ -43,7 +79,24 @@ def main():
     print(f"🏥 Health server starting on {host}:{port}")
     print("🔗 Health check available at /health")
     
-    app.run(host=host, port=port, debug=False)
+    # Prefer the waitress WSGI server (a real thread pool) when it is installed
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host=host, port=port, debug=False)
+    else:
+        serve(app, host=host, port=port, threads=WSGI_THREADS, connection_limit=WSGI_CONNECTION_LIMIT)
+
+def main():
+    """Run the health server, described by startup.py's HEALTH_* variables when it falls back here"""
+    mode = os.getenv('HEALTH_MODE')
+    if mode:
+        app = create_health_app(mode=mode, status=f"{mode} mode",
+                                message=os.getenv('HEALTH_MESSAGE', ''),
+                                error=os.getenv('HEALTH_ERROR'))
+    else:
+        app = None
+    run_health_server(app)
 
 if __name__ == "__main__":
     main()
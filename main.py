@@ -1,42 +1,59 @@
 """
 Main entry point for the Politics & War Discord Bot
 Runs both the Discord bot and web dashboard with espionage monitoring
+
+Usage: python main.py [--mode=full|health|minimal]
+  full     Discord bot, dashboard and monitoring (default)
+  health   health endpoints only
+  minimal  health endpoints only, reporting the minimal deployment-test mode
 """
 
+import logging
 import os
 import sys
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+required_vars = ['DISCORD_TOKEN', 'PNW_API_KEY']
+
+# Load environment variables from .env, unless the platform (e.g. Railway) already supplied them
+if not all(os.getenv(var) for var in required_vars):
+    load_dotenv(override=False)
+
+# Progress and errors from the monitoring modules go through logging; LOG_LEVEL=DEBUG adds per-page detail
+logging.basicConfig(level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO),
+                    format='%(message)s')
 
-def start_health_only_server():
+MODES = ('full', 'health', 'minimal')
+
+def parse_mode(argv) -> str:
+    """The --mode=... value from argv, 'full' when absent or unknown"""
+    for arg in argv:
+        if arg.startswith('--mode='):
+            mode = arg.split('=', 1)[1]
+            if mode in MODES:
+                return mode
+    return 'full'
+
+def start_health_only_server(**app_options):
     """Start minimal health server when main application can't start"""
-    from flask import Flask, jsonify
-    
-    app = Flask(__name__)
-    
-    @app.route('/health')
-    def health():
-        return jsonify({
-            "status": "healthy",
-            "service": "Politics & War Discord Bot",
-            "mode": "health-only"
-        }), 200
-    
-    @app.route('/')
-    def root():
-        return jsonify({
-            "status": "health-only mode",
-            "message": "Set DISCORD_TOKEN and PNW_API_KEY environment variables to enable full functionality"
-        })
-    
-    port = int(os.getenv('PORT', 5000))
-    print(f"🏥 Health-only server starting on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    # Imported here so Flask is only loaded by the paths that serve it
+    from health_server import create_health_app, run_health_server
+    run_health_server(create_health_app(**app_options))
+
+MODE = parse_mode(sys.argv[1:])
+
+if MODE == 'minimal':
+    start_health_only_server(
+        mode="minimal-test", status="minimal test mode",
+        message="This is a minimal test to verify Railway deployment"
+    )
+    sys.exit(0)
+
+if MODE == 'health':
+    start_health_only_server()
+    sys.exit(0)
 
 # Check for required environment variables FIRST
-required_vars = ['DISCORD_TOKEN', 'PNW_API_KEY']
 missing_vars = [var for var in required_vars if not os.getenv(var)]
 
 if missing_vars:
@@ -56,55 +73,92 @@ except ImportError as e:
     start_health_only_server()
     sys.exit(0)
 
+# Startup banner, written with a single print
+BANNER = """\
+🚀 Starting Politics & War Discord Bot with Espionage Monitoring...
+✅ Environment variables configured
+📊 Web dashboard will be available at http://localhost:5000
+🤖 Discord bot will connect to Discord
+🔍 24/7 Espionage monitoring system (auto-starts)
+
+New 24/7 System Features:
+  • Auto-indexes ALL nations in the game
+  • Skips vacation mode nations
+  • Only monitors alliance members
+  • Stops monitoring once reset time found
+  • Auto-adds new nations every hour
+
+Available Discord Commands:
+🆕 Slash Commands (Modern Discord Standard):
+  /commands - Show all commands
+  /ping - Check bot status
+  /monitor - Check 24/7 monitoring status
+  /spy [nation] - Check spy activity
+
+📜 Prefix Commands (Also Available):
+  !commands - Show all commands
+  !monitor - Check 24/7 monitoring status
+  !resets [alliance] - Show detected reset times
+  !spy [nation] - Check spy activity
+  !spycheck [nation] - Detailed spy status
+
+Admin Commands:
+  !startmonitor - Manual start (auto-starts anyway)
+  !stopmonitor - Stop monitoring
+  !collect - Force full nation indexing
+
+Starting services..."""
+
+async def run_services(*coros):
+    """
+    Run the service coroutines together; a failure in one cancels the others
+    
+    Failures surface as an ExceptionGroup from asyncio.TaskGroup on Python 3.11+.
+    Older interpreters gather the services instead and raise the first failure.
+    """
+    if hasattr(asyncio, 'TaskGroup'):
+        async with asyncio.TaskGroup() as services:
+            for coro in coros:
+                services.create_task(coro)
+        return
+    
+    services = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        await asyncio.gather(*services)
+    except BaseException:
+        for task in services:
+            task.cancel()
+        raise
+
 async def main():
     """Main application entry point"""
-    print("🚀 Starting Politics & War Discord Bot with Espionage Monitoring...")
-    print("✅ Environment variables configured")
-    print("📊 Web dashboard will be available at http://localhost:5000")
-    print("🤖 Discord bot will connect to Discord")
-    print("🔍 24/7 Espionage monitoring system (auto-starts)")
-    print("\nNew 24/7 System Features:")
-    print("  • Auto-indexes ALL nations in the game")
-    print("  • Skips vacation mode nations")
-    print("  • Only monitors alliance members")
-    print("  • Stops monitoring once reset time found")
-    print("  • Auto-adds new nations every hour")
-    print("\nAvailable Discord Commands:")
-    print("🆕 Slash Commands (Modern Discord Standard):")
-    print("  /commands - Show all commands")
-    print("  /ping - Check bot status") 
-    print("  /monitor - Check 24/7 monitoring status")
-    print("  /spy [nation] - Check spy activity")
-    print("\n📜 Prefix Commands (Also Available):")
-    print("  !commands - Show all commands")
-    print("  !monitor - Check 24/7 monitoring status")
-    print("  !resets [alliance] - Show detected reset times")
-    print("  !spy [nation] - Check spy activity")
-    print("  !spycheck [nation] - Detailed spy status")
-    print("\nAdmin Commands:")
-    print("  !startmonitor - Manual start (auto-starts anyway)")
-    print("  !stopmonitor - Stop monitoring")
-    print("  !collect - Force full nation indexing")
-    print("\nStarting services...")
+    print(BANNER)
     
     # Initialize bot
-    bot = DiscordBot()
+    bot = await DiscordBot.create()
     
     # Initialize web dashboard
     dashboard = WebDashboard()
     
     try:
-        # Start both services
-        await asyncio.gather(
-            bot.start(),
-            dashboard.start()
-        )
+        # Start both services; the dashboard serves Flask from its own thread, and a failure
+        # in either task cancels the other instead of leaving it running alone
+        await run_services(bot.start(), dashboard.start())
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...")
     except Exception as e:
-        print(f"❌ Error starting services: {e}")
+        # TaskGroup (Python 3.11+) reports every failed service in one ExceptionGroup
+        for error in getattr(e, 'exceptions', [e]):
+            print(f"❌ Error starting services: {error}")
 
 if __name__ == "__main__":
+    # Use the faster uvloop event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except Exception as e:
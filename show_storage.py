@@ -3,10 +3,45 @@ Demo script showing how the espionage monitoring system stores data
 Run this to see exactly what gets stored and how
 """
 
-import sqlite3
 import os
 from datetime import datetime, timedelta
-from database.espionage_tracker import EspionageTracker
+from database.espionage_tracker import EspionageTracker, open_db
+
+# Schema walk and sample queries
+Q_TABLES = "SELECT name FROM sqlite_master WHERE type='table'"
+Q_TABLE_COLUMNS = 'SELECT name, type, "notnull" FROM pragma_table_info(?)'
+Q_SAMPLE_NATIONS = """
+    SELECT id, nation_name, alliance_name, is_active 
+    FROM nations 
+    ORDER BY last_updated DESC 
+    LIMIT 5
+"""
+Q_SAMPLE_QUEUE = """
+    SELECT mq.nation_id, n.nation_name, mq.reason, mq.next_check
+    FROM monitoring_queue mq
+    JOIN nations n ON mq.nation_id = n.id
+    ORDER BY mq.next_check
+    LIMIT 5
+"""
+Q_SAMPLE_RESETS = """
+    SELECT rt.nation_id, n.nation_name, rt.reset_time, rt.detection_method
+    FROM reset_times rt
+    JOIN nations n ON rt.nation_id = n.id
+    ORDER BY rt.created_at DESC
+    LIMIT 5
+"""
+Q_SAMPLE_STATUSES = """
+    SELECT es.nation_id, n.nation_name, es.espionage_available, 
+           es.beige_turns, es.checked_at
+    FROM espionage_status es
+    JOIN nations n ON es.nation_id = n.id
+    ORDER BY es.checked_at DESC
+    LIMIT 5
+"""
+
+def _quote_identifier(name: str) -> str:
+    """Quote a table name for use in SQL text"""
+    return '"' + name.replace('"', '""') + '"'
 
 def show_storage_demo():
     """Demonstrate how data is stored in the system"""
@@ -36,36 +71,43 @@ def show_storage_demo():
     print(f"  Reset times found: {stats.get('reset_times_detected', 0):,}")
     print(f"  Recent checks (24h): {stats.get('recent_checks_24h', 0):,}")
     
+    # One connection for the schema walk and the samples, so its page cache stays warm between them
+    conn = open_db(db_path, readonly=True)
+    
     # Show table schemas
     print(f"\n🏗️ Database Schema:")
     print("-" * 40)
     
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conn:
             cursor = conn.cursor()
             
             # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            cursor.execute(Q_TABLES)
+            tables = [row[0] for row in cursor]
             
-            for table_name in tables:
-                table = table_name[0]
-                print(f"\n📋 Table: {table}")
+            # Row counts for every table in one statement
+            counts = {}
+            if tables:
+                cursor.execute(
+                    " UNION ALL ".join(f"SELECT ?, COUNT(*) FROM {_quote_identifier(table)}" for table in tables),
+                    tables
+                )
+                counts = dict(cursor)
+            
+            for table in tables:
+                # Each table's block is built up and written with a single print
+                lines = [f"\n📋 Table: {table}"]
                 
                 # Get table info
-                cursor.execute(f"PRAGMA table_info({table})")
-                columns = cursor.fetchall()
-                
-                for col in columns:
-                    col_name = col[1]
-                    col_type = col[2]
-                    not_null = "NOT NULL" if col[3] else ""
-                    print(f"  {col_name:<20} {col_type:<15} {not_null}")
+                for col in cursor.execute(Q_TABLE_COLUMNS, (table,)):
+                    col_name = col[0]
+                    col_type = col[1]
+                    not_null = "NOT NULL" if col[2] else ""
+                    lines.append(f"  {col_name:<20} {col_type:<15} {not_null}")
                 
-                # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                print(f"  → {count:,} rows")
+                lines.append(f"  → {counts[table]:,} rows")
+                print("\n".join(lines))
     
     except Exception as e:
         print(f"Error reading database: {e}")
@@ -75,83 +117,73 @@ def show_storage_demo():
     print("-" * 40)
     
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conn:
             cursor = conn.cursor()
             
             # Sample nations
-            cursor.execute("""
-                SELECT id, nation_name, alliance_name, is_active 
-                FROM nations 
-                ORDER BY last_updated DESC 
-                LIMIT 5
-            """)
-            nations = cursor.fetchall()
+            cursor.execute(Q_SAMPLE_NATIONS)
+            nations = cursor.fetchmany(5)
             
             if nations:
-                print("\n🏛️ Recent Nations:")
-                print("ID       | Nation Name           | Alliance    | Active")
-                print("-" * 55)
+                lines = [
+                    "\n🏛️ Recent Nations:",
+                    "ID       | Nation Name           | Alliance    | Active",
+                    "-" * 55
+                ]
                 for nation in nations:
-                    print(f"{nation[0]:<8} | {nation[1]:<20} | {nation[2] or 'None':<10} | {nation[3]}")
+                    lines.append(f"{nation[0]:<8} | {nation[1]:<20} | {nation[2] or 'None':<10} | {nation[3]}")
+                print("\n".join(lines))
             
             # Sample monitoring queue
-            cursor.execute("""
-                SELECT mq.nation_id, n.nation_name, mq.reason, mq.next_check
-                FROM monitoring_queue mq
-                JOIN nations n ON mq.nation_id = n.id
-                ORDER BY mq.next_check
-                LIMIT 5
-            """)
-            queue = cursor.fetchall()
+            cursor.execute(Q_SAMPLE_QUEUE)
+            queue = cursor.fetchmany(5)
             
             if queue:
-                print("\n📋 Monitoring Queue (next to check):")
-                print("Nation ID | Nation Name      | Reason              | Next Check")
-                print("-" * 70)
+                lines = [
+                    "\n📋 Monitoring Queue (next to check):",
+                    "Nation ID | Nation Name      | Reason              | Next Check",
+                    "-" * 70
+                ]
                 for item in queue:
                     next_check = item[3][:19] if item[3] else "Unknown"
-                    print(f"{item[0]:<9} | {item[1]:<15} | {item[2]:<18} | {next_check}")
+                    lines.append(f"{item[0]:<9} | {item[1]:<15} | {item[2]:<18} | {next_check}")
+                print("\n".join(lines))
             
             # Sample reset times
-            cursor.execute("""
-                SELECT rt.nation_id, n.nation_name, rt.reset_time, rt.detection_method
-                FROM reset_times rt
-                JOIN nations n ON rt.nation_id = n.id
-                ORDER BY rt.created_at DESC
-                LIMIT 5
-            """)
-            resets = cursor.fetchall()
+            cursor.execute(Q_SAMPLE_RESETS)
+            resets = cursor.fetchmany(5)
             
             if resets:
-                print("\n⏰ Recent Reset Time Detections:")
-                print("Nation ID | Nation Name      | Reset Time          | Method")
-                print("-" * 70)
+                lines = [
+                    "\n⏰ Recent Reset Time Detections:",
+                    "Nation ID | Nation Name      | Reset Time          | Method",
+                    "-" * 70
+                ]
                 for reset in resets:
                     reset_time = reset[2][:19] if reset[2] else "Unknown"
-                    print(f"{reset[0]:<9} | {reset[1]:<15} | {reset_time} | {reset[3]}")
+                    lines.append(f"{reset[0]:<9} | {reset[1]:<15} | {reset_time} | {reset[3]}")
+                print("\n".join(lines))
             
             # Sample espionage status
-            cursor.execute("""
-                SELECT es.nation_id, n.nation_name, es.espionage_available, 
-                       es.beige_turns, es.checked_at
-                FROM espionage_status es
-                JOIN nations n ON es.nation_id = n.id
-                ORDER BY es.checked_at DESC
-                LIMIT 5
-            """)
-            statuses = cursor.fetchall()
+            cursor.execute(Q_SAMPLE_STATUSES)
+            statuses = cursor.fetchmany(5)
             
             if statuses:
-                print("\n🔍 Recent Espionage Status Checks:")
-                print("Nation ID | Nation Name      | Available | Beige | Checked At")
-                print("-" * 65)
+                lines = [
+                    "\n🔍 Recent Espionage Status Checks:",
+                    "Nation ID | Nation Name      | Available | Beige | Checked At",
+                    "-" * 65
+                ]
                 for status in statuses:
                     available = "Yes" if status[2] else "No"
                     checked = status[4][:19] if status[4] else "Unknown"
-                    print(f"{status[0]:<9} | {status[1]:<15} | {available:<9} | {status[3]:<5} | {checked}")
+                    lines.append(f"{status[0]:<9} | {status[1]:<15} | {available:<9} | {status[3]:<5} | {checked}")
+                print("\n".join(lines))
     
     except Exception as e:
         print(f"Error reading sample data: {e}")
+    finally:
+        conn.close()
     
     print(f"\n🎯 How Data Flows:")
     print("-" * 40)
@@ -5,31 +5,21 @@ Minimal health server for Railway - no dependencies on main application
 
 import os
 import sys
+from health_server import create_health_app, run_health_server
+
+# Re-runs health_server in place of this process; FALLBACK_ENV tells it why
+FALLBACK_CMD = [sys.executable, "-m", "health_server"]
+
+def exec_health_fallback(mode: str, message: str, error: Exception):
+    """Replace the failed application process with a fresh health-only server"""
+    print("🏥 Falling back to health-only mode")
+    sys.stdout.flush()
+    os.environ.update(HEALTH_MODE=mode, HEALTH_MESSAGE=message, HEALTH_ERROR=str(error))
+    os.execvp(FALLBACK_CMD[0], FALLBACK_CMD)
 
 # Check if we need to run health-only mode
 if len(sys.argv) > 1 and sys.argv[1] == '--health-only':
-    from flask import Flask, jsonify
-    
-    app = Flask(__name__)
-    
-    @app.route('/health')
-    def health():
-        return jsonify({
-            "status": "healthy",
-            "service": "Politics & War Discord Bot",
-            "mode": "health-only"
-        }), 200
-    
-    @app.route('/')
-    def root():
-        return jsonify({
-            "status": "health-only mode",
-            "message": "Add environment variables to enable full functionality"
-        })
-    
-    port = int(os.getenv('PORT', 5000))
-    print(f"🏥 Health-only server starting on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    run_health_server(create_health_app(message="Add environment variables to enable full functionality"))
     sys.exit(0)
 
 # Otherwise, try to run the full application
@@ -40,61 +30,11 @@ try:
     
     # Run the main application
     asyncio.run(main())
-    
+
 except ImportError as e:
     print(f"❌ Import error: {e}")
-    print("🏥 Falling back to health-only mode")
-    
-    from flask import Flask, jsonify
-    
-    app = Flask(__name__)
-    
-    @app.route('/health')
-    def health():
-        return jsonify({
-            "status": "healthy",
-            "service": "Politics & War Discord Bot",
-            "mode": "health-fallback",
-            "error": str(e)
-        }), 200
-    
-    @app.route('/')
-    def root():
-        return jsonify({
-            "status": "health-fallback mode",
-            "message": "Import error occurred, running minimal health server",
-            "error": str(e)
-        })
-    
-    port = int(os.getenv('PORT', 5000))
-    print(f"🏥 Health fallback server starting on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    exec_health_fallback("health-fallback", "Import error occurred, running minimal health server", e)
 
 except Exception as e:
     print(f"❌ Application error: {e}")
-    print("🏥 Falling back to health-only mode")
-    
-    from flask import Flask, jsonify
-    
-    app = Flask(__name__)
-    
-    @app.route('/health')
-    def health():
-        return jsonify({
-            "status": "healthy",
-            "service": "Politics & War Discord Bot",
-            "mode": "health-emergency",
-            "error": str(e)
-        }), 200
-    
-    @app.route('/')
-    def root():
-        return jsonify({
-            "status": "health-emergency mode",
-            "message": "Application error occurred, running minimal health server",
-            "error": str(e)
-        })
-    
-    port = int(os.getenv('PORT', 5000))
-    print(f"🏥 Health emergency server starting on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    exec_health_fallback("health-emergency", "Application error occurred, running minimal health server", e)
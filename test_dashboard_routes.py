@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test the dashboard's monitoring routes against a temporary database
+"""
+
+import os
+import sys
+import tempfile
+from database.espionage_tracker import EspionageTracker
+from web.dashboard import WebDashboard
+
+class FakeMonitor:
+    """Stands in for EspionageMonitor, answering status checks without calling the API"""
+
+    def __init__(self):
+        self.checked = []
+
+    async def check_nation_espionage_status(self, nation_id: int):
+        self.checked.append(nation_id)
+        if nation_id == 2:
+            raise RuntimeError("API unavailable")
+        return {'nation_id': nation_id, 'espionage_available': True}
+
+def test_monitor_test_check():
+    """POST /api/monitor/test-check checks the queued nations and reports each one"""
+    print("Testing /api/monitor/test-check...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = EspionageTracker(os.path.join(tmp, "tracker.db"))
+        for nation_id, name in ((1, "Alpha"), (2, "Beta")):
+            tracker.add_nation({'id': nation_id, 'nation_name': name, 'alliance_id': 0})
+            tracker.add_to_monitoring_queue(nation_id)
+        # Make both nations due now (the queue schedules them 2 hours out)
+        with tracker.connection() as conn:
+            conn.execute("UPDATE monitoring_queue SET next_check = datetime('now', '-1 minute')")
+
+        # Create dashboard without environment variables, then attach the test tracker and monitor
+        dashboard = WebDashboard()
+        dashboard.espionage_tracker = tracker
+        dashboard.espionage_monitor = FakeMonitor()
+
+        response = dashboard.app.test_client().post('/api/monitor/test-check')
+        data = response.get_json()
+        print(f"Status Code: {response.status_code}")
+        print(f"Response: {data}")
+
+        assert response.status_code == 200, data
+        assert sorted(dashboard.espionage_monitor.checked) == [1, 2]
+        results = {entry['nation_id']: entry for entry in data['results']}
+        assert results[1]['nation_name'] == "Alpha"
+        assert results[1]['result']['espionage_available'] is True
+        assert results[2]['error'] == "API unavailable"
+        tracker.close()
+
+    print("✅ Test check endpoint working!")
+
+if __name__ == "__main__":
+    try:
+        test_monitor_test_check()
+    except AssertionError as e:
+        print(f"❌ Test check endpoint failed! {e}")
+        sys.exit(1)
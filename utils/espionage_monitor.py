@@ -4,32 +4,135 @@ Optimized to skip vacation mode nations and focus on alliance members only
 """
 
 import asyncio
-import schedule
+import heapq
+import logging
 import time
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import os
 from utils.nation_collector import NationCollector
 from database.espionage_tracker import EspionageTracker
-from api.pnw_api import PoliticsAndWarAPI
+from api.pnw_api import MAX_PAGE_SIZE, AsyncPoliticsAndWarAPI, PoliticsAndWarAPI, is_overload_error
+from api.rate_limit import AIMDController
+
+_log = logging.getLogger(__name__)
+
+# Nations whose status is fetched by one request in a monitoring cycle; each batch is one database write
+STATUS_BATCH_SIZE = MAX_PAGE_SIZE
+
+# Cap on status requests in flight at once (the shared token bucket still paces the request rate)
+STATUS_CHECK_CONCURRENCY = 10
+
+# Newest detections listed by get_reset_time_report
+RECENT_DETECTIONS = 10
+
+# Status checks older than this many days are moved to the archive table by the daily cleanup
+STATUS_ARCHIVE_DAYS = 30
+
+# One page of the nation index. Page 1 also asks for paginatorInfo.lastPage so the remaining pages
+# can be fetched together; the others skip it, since the server counts every nation to produce it
+NATION_PAGE_QUERY = """
+query($page: Int, $with_count: Boolean!) {
+  nations(first: 100, page: $page) {
+    paginatorInfo @include(if: $with_count) {
+      lastPage
+    }
+    data {
+      id
+      nation_name
+      alliance_id
+      vacation_mode_turns
+    }
+  }
+}
+"""
+
+# Cheapest query that proves the API key and endpoint work
+CONNECTION_TEST_QUERY = """
+{
+  nations(first: 1) {
+    data {
+      id
+      nation_name
+    }
+  }
+}
+"""
+
+# Nations newer than the latest one already indexed
+NEW_NATIONS_QUERY = """
+query($latest_id: Int) {
+  nations(id_gt: $latest_id, first: 100) {
+    data {
+      id
+      nation_name
+      alliance_id
+      alliance {
+        id
+        name
+      }
+      vacation_mode_turns
+      beige_turns
+      last_active
+      espionage_available
+    }
+  }
+}
+"""
+
+# Periods (seconds) of the 24/7 jobs
+NEW_NATION_CHECK_INTERVAL = 60 * 60
+MONITORING_CYCLE_INTERVAL = 2 * 60 * 60  # turn changes
+CLEANUP_INTERVAL = 24 * 60 * 60
+
+# Tables written by index_all_nations; their indexes are rebuilt after a first-time load
+BULK_LOAD_TABLES = ('nations', 'monitoring_queue')
 
 class EspionageMonitor:
     """Monitors espionage availability changes and detects reset times"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, rate_ctrl: Optional[AIMDController] = None,
+                 api: Optional[PoliticsAndWarAPI] = None, tracker: Optional[EspionageTracker] = None):
         self.api_key = api_key
-        self.api = PoliticsAndWarAPI(api_key)
-        self.collector = NationCollector(api_key)
-        self.tracker = EspionageTracker()
+        # Reuse the caller's client when given, so its connection pool and cache are shared
+        self.api = api or PoliticsAndWarAPI(api_key)
+        # Shared with the bot's command path; monitor requests run in its background share
+        self.rate_ctrl = rate_ctrl
+        # One tracker (and so one set of per-thread connections and statement caches) for the monitor and its collector
+        self.tracker = tracker or EspionageTracker()
+        self.collector = NationCollector(api_key, rate_ctrl, async_api=self._get_async_api, tracker=self.tracker)
         self.is_running = False
         self.last_full_scan = None
         self.monitoring_active = False
+        # Set by stop_monitoring to end start_24_7_monitoring
+        self._stopped: Optional[asyncio.Event] = None
+        # aiohttp client for the status checks, bound to the loop it was created on
+        self._async_api: Optional[AsyncPoliticsAndWarAPI] = None
+        self._async_loop = None
+    
+    def _get_async_api(self) -> AsyncPoliticsAndWarAPI:
+        """The async client for the running loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        if self._async_api is None or self._async_loop is not loop:
+            self._async_api = AsyncPoliticsAndWarAPI(self.api_key, max_concurrency=STATUS_CHECK_CONCURRENCY)
+            self._async_loop = loop
+        return self._async_api
+    
+    async def _admit(self, coro_factory) -> Dict[str, Any]:
+        """Await an API call, admitted as background work when a controller is shared"""
+        if self.rate_ctrl is None:
+            return await coro_factory()
+        return await self.rate_ctrl.call(coro_factory, background=True, failed=is_overload_error)
+    
+    async def _query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query in a worker thread"""
+        return await self._admit(lambda: asyncio.to_thread(self.api.query, query, variables))
     
     def update_heartbeat(self):
         """Update monitoring heartbeat in database"""
         try:
-            import sqlite3
-            with sqlite3.connect(self.tracker.db_path) as conn:
+            with self.tracker.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE monitoring_status 
@@ -38,170 +141,159 @@ class EspionageMonitor:
                 ''')
                 conn.commit()
         except Exception as e:
-            print(f"⚠️ Failed to update heartbeat: {e}")
+            _log.warning("⚠️ Failed to update heartbeat: %s", e)
     
     async def start_24_7_monitoring(self):
         """Start the 24/7 monitoring system (monitoring only, indexing done separately)"""
-        print("🚀 Starting 24/7 Espionage Monitoring System...")
+        _log.info("🚀 Starting 24/7 Espionage Monitoring System...")
         self.is_running = True
+        # Created before the first cycle so a stop_monitoring() during it is not lost
+        self._stopped = asyncio.Event()
         
         # Start monitoring espionage activity (indexing should be done separately)
-        print("🔍 Starting espionage monitoring...")
+        _log.info("🔍 Starting espionage monitoring...")
         await self.start_espionage_monitoring()
+        if not self.is_running:
+            return
         
         # Schedule regular tasks
-        schedule.every(1).hours.do(self._schedule_new_nation_check)
-        schedule.every(2).hours.do(self._schedule_monitoring_cycle)  # Every 2 hours for turn changes
-        schedule.every(24).hours.do(self._schedule_cleanup)
+        jobs = [
+            asyncio.create_task(self._periodic(NEW_NATION_CHECK_INTERVAL, self.check_new_nations)),
+            asyncio.create_task(self._periodic(MONITORING_CYCLE_INTERVAL, self.monitoring_cycle)),
+            asyncio.create_task(self._periodic(CLEANUP_INTERVAL, self.cleanup_completed_nations))
+        ]
         
-        print("⏰ Scheduled tasks:")
-        print("   • New nation check: Every 1 hour")
-        print("   • Monitoring cycle: Every 2 hours (turn changes)")
-        print("   • Database cleanup: Every 24 hours")
+        _log.info("⏰ Scheduled tasks:")
+        _log.info("   • New nation check: Every 1 hour")
+        _log.info("   • Monitoring cycle: Every 2 hours (turn changes)")
+        _log.info("   • Database cleanup: Every 24 hours")
         
-        # Main 24/7 monitoring loop
+        # Run until stop_monitoring() (or cancellation), then take the jobs down with us
+        try:
+            await self._stopped.wait()
+        finally:
+            for job in jobs:
+                job.cancel()
+    
+    async def _periodic(self, interval: float, job):
+        """Await job() every `interval` seconds while monitoring runs; a failed run doesn't end the loop"""
         while self.is_running:
-            schedule.run_pending()
-            await asyncio.sleep(60)  # Check every minute for scheduled tasks
+            await asyncio.sleep(interval)
+            try:
+                await job()
+            except Exception as e:
+                _log.error("💥 Error in scheduled %s: %s", job.__name__, e)
     
     async def index_all_nations(self) -> Dict[str, Any]:
         """Index all nations in the game, filtering for alliance members only"""
-        print("🗂️ Indexing all nations in the game...")
+        _log.info("🗂️ Indexing all nations in the game...")
         
         # First, test if API is working with a simple query
-        print("🔍 Testing API connection...")
-        test_query = """
-        {
-          nations(first: 1) {
-            data {
-              id
-              nation_name
-            }
-          }
-        }
-        """
-        
-        test_result = self.api.query(test_query)
-        print(f"📊 Test API result: {test_result}")
+        _log.info("🔍 Testing API connection...")
+        test_result = await self._query(CONNECTION_TEST_QUERY)
+        _log.debug("📊 Test API result: %s", test_result)
         if test_result is None or 'errors' in test_result:
-            print(f"❌ API test failed: {test_result}")
+            _log.error("❌ API test failed: %s", test_result)
             return {'success': False, 'error': f'API connection test failed: {test_result}'}
         
-        print("✅ API connection test passed")
+        _log.info("✅ API connection test passed")
+        
+        # A first-time load into an empty table is cheaper with the indexes built afterwards
+        bulk_load = self.tracker.get_latest_nation_id() == 0
+        if bulk_load:
+            self.tracker.drop_indexes(*BULK_LOAD_TABLES)
         
         try:
-            page = 1
             total_nations = 0
             alliance_nations = 0
+            failed_pages = 0
             
-            while True:
-                print(f"  � Processing page {page}...")
-                
-                # Get nations with alliance info (simplified query)
-                query = f"""
-                {{
-                  nations(first: 100, page: {page}) {{
-                    paginatorInfo {{
-                      hasMorePages
-                      currentPage
-                    }}
-                    data {{
-                      id
-                      nation_name
-                      alliance_id
-                      vacation_mode_turns
-                    }}
-                  }}
-                }}
-                """
-                
-                print(f"📊 Executing query for page {page}...")
-                result = self.api.query(query)
-                print(f"📊 Raw result type: {type(result)}")
-                print(f"📊 Raw result: {str(result)[:200]}...")
-                
-                # Better error handling for API response
-                if result is None:
-                    print(f"❌ API returned None on page {page} - possible rate limit or network issue")
-                    break
-                
-                if 'errors' in result:
-                    print(f"❌ Error on page {page}: {result['errors']}")
-                    break
-                
-                # Check if we have valid data structure
-                if 'data' not in result:
-                    print(f"❌ No 'data' key in result on page {page}: {result}")
-                    break
-                
-                nations_data = result.get('data', {}).get('nations', {})
-                if not nations_data:
-                    print(f"❌ No nations data on page {page}")
-                    break
-                
-                nations = nations_data.get('data', [])
-                
-                if not nations:
-                    break
-                
-                # Process each nation
-                for nation in nations:
-                    total_nations += 1
-                    
-                    # Skip nations not in alliance
-                    if not nation.get('alliance_id'):
-                        continue
-                    
-                    # Skip vacation mode nations (they don't need monitoring)
-                    if nation.get('vacation_mode_turns', 0) > 0:
+            # Page 1 also tells us how many pages there are
+            _log.debug("  📄 Processing page 1...")
+            nations_data = await self._fetch_nation_page(1)
+            if nations_data is None:
+                return {'success': False, 'error': 'Failed to fetch the first page of nations'}
+            last_page = (nations_data.get('paginatorInfo') or {}).get('lastPage') or 1
+            nations = nations_data.get('data') or []
+            total_nations += len(nations)
+            alliance_nations += self._index_nations(nations)
+            
+            # The other pages are requested together (the API client caps how many are in flight)
+            # and each is written as soon as it arrives
+            fetches = [asyncio.create_task(self._fetch_nation_page(page)) for page in range(2, last_page + 1)]
+            try:
+                for next_page in asyncio.as_completed(fetches):
+                    nations_data = await next_page
+                    if nations_data is None:
+                        failed_pages += 1
                         continue
                     
-                    # Add to database (simplified data)
-                    self.tracker.add_or_update_nation(
-                        nation_id=nation['id'],
-                        nation_name=nation['nation_name'],
-                        alliance_id=nation['alliance_id'],
-                        alliance_name='',  # Not fetching alliance name for now
-                        last_active='',    # Not fetching last_active for now
-                        should_monitor=True  # Start monitoring immediately
-                    )
-                    
-                    alliance_nations += 1
-                
-                # Check if more pages
-                paginator = nations_data.get('paginatorInfo', {})
-                if not paginator.get('hasMorePages', False):
-                    break
-                
-                page += 1
-                
-                # Rate limiting: 60 requests per minute = 1 request per second
-                # Using 1.5 seconds for safety margin to avoid 429 errors
-                print(f"⏳ Rate limiting: waiting 1.5 seconds before next request...")
-                await asyncio.sleep(1.5)  # Conservative rate limiting
+                    nations = nations_data.get('data') or []
+                    total_nations += len(nations)
+                    alliance_nations += self._index_nations(nations)
+            finally:
+                for fetch in fetches:
+                    fetch.cancel()
             
-            print(f"✅ Indexing complete!")
-            print(f"   • Total nations processed: {total_nations:,}")
-            print(f"   • Alliance nations indexed: {alliance_nations:,}")
+            _log.info("✅ Indexing complete!")
+            _log.info("   • Total nations processed: %s", format(total_nations, ','))
+            _log.info("   • Alliance nations indexed: %s", format(alliance_nations, ','))
+            if failed_pages:
+                _log.info("   • Pages that failed to load: %s", format(failed_pages, ','))
             
             return {
                 'success': True,
                 'total_nations': total_nations,
-                'alliance_nations': alliance_nations
+                'alliance_nations': alliance_nations,
+                'failed_pages': failed_pages
             }
             
         except Exception as e:
-            print(f"❌ Error during indexing: {e}")
+            _log.error("❌ Error during indexing: %s", e)
             return {'success': False, 'error': str(e)}
+        finally:
+            if bulk_load:
+                self.tracker.create_indexes(*BULK_LOAD_TABLES)
+    
+    async def _fetch_nation_page(self, page: int) -> Optional[Dict[str, Any]]:
+        """Fetch one page of the nation index; None if the request failed"""
+        try:
+            api = self._get_async_api()
+            result = await self._admit(lambda: api.query(NATION_PAGE_QUERY, {"page": page, "with_count": page == 1}))
+        except Exception as e:
+            _log.error("❌ Error fetching page %s: %s", page, e)
+            return None
+        
+        if 'errors' in result:
+            _log.error("❌ Error on page %s: %s", page, result['errors'])
+            return None
+        
+        nations_data = (result.get('data') or {}).get('nations')
+        if not nations_data:
+            _log.error("❌ No nations data on page %s", page)
+            return None
+        return nations_data
+    
+    def _index_nations(self, nations: List[Dict[str, Any]]) -> int:
+        """Store the alliance members of one index page in one transaction; returns how many were stored"""
+        rows = [
+            # Simplified data: alliance name isn't fetched for now
+            (nation['id'], nation['nation_name'], nation['alliance_id'], '')
+            for nation in nations
+            # Skip nations not in alliance, and vacation mode nations (they don't need monitoring)
+            if nation.get('alliance_id') and not nation.get('vacation_mode_turns', 0) > 0
+        ]
+        # Start monitoring immediately
+        return self.tracker.add_or_update_nations_bulk(rows, should_monitor=True)
     
     async def start_espionage_monitoring(self):
         """Start monitoring espionage status for indexed nations"""
-        print("🔍 Starting espionage monitoring for alliance nations...")
+        _log.info("🔍 Starting espionage monitoring for alliance nations...")
         self.monitoring_active = True
         
         # Get nations that need monitoring (no reset time found yet)
         nations_to_monitor = self.tracker.get_nations_needing_monitoring()
-        print(f"📊 Found {len(nations_to_monitor)} nations needing monitoring")
+        _log.info("📊 Found %s nations needing monitoring", len(nations_to_monitor))
         
         # Start monitoring cycle
         await self.monitoring_cycle()
@@ -211,7 +303,7 @@ class EspionageMonitor:
         if not self.monitoring_active:
             return {'success': False, 'message': 'Monitoring not active'}
         
-        print(f"🔍 [{datetime.utcnow()}] Running monitoring cycle...")
+        _log.info("🔍 [%s] Running monitoring cycle...", datetime.utcnow())
         
         # Update heartbeat
         self.update_heartbeat()
@@ -221,46 +313,38 @@ class EspionageMonitor:
             nations_to_check = self.tracker.get_nations_needing_monitoring()
             
             if not nations_to_check:
-                print("✅ No nations need monitoring (all reset times found)")
+                _log.info("✅ No nations need monitoring (all reset times found)")
                 return {'success': True, 'checked_nations': 0, 'message': 'All reset times found'}
             
-            checked_nations = 0
+            checked_nations = len(nations_to_check)
             reset_times_found = 0
+            nation_names = {nation['nation_id']: nation['nation_name'] for nation in nations_to_check}
+            nation_ids = list(nation_names)
+            pending = []
             
-            for nation in nations_to_check:
-                nation_id = nation['nation_id']
-                
-                # Check current espionage status
-                current_status = await self.check_nation_espionage_status(nation_id)
-                
-                if current_status:
-                    # Check if this is a status change (protection -> available = reset time!)
-                    reset_detected = self.tracker.record_espionage_status(
-                        nation_id=nation_id,
-                        espionage_available=current_status['espionage_available'],
-                        beige_turns=current_status.get('beige_turns', 0),
-                        vacation_mode_turns=current_status.get('vacation_mode_turns', 0)
-                    )
-                    
-                    if reset_detected:
-                        print(f"🎯 Reset time detected for {nation['nation_name']}!")
-                        reset_times_found += 1
-                        
-                        # Stop monitoring this nation (reset time found)
-                        self.tracker.stop_monitoring_nation(nation_id)
+            # One request per batch, all in flight together; pacing comes from the API client's
+            # semaphore and token bucket. Each batch is written as soon as it arrives
+            batches = [self.check_nations_espionage_status_batch(nation_ids[start:start + STATUS_BATCH_SIZE])
+                       for start in range(0, len(nation_ids), STATUS_BATCH_SIZE)]
+            for next_batch in asyncio.as_completed(batches):
+                statuses = await next_batch
                 
-                checked_nations += 1
+                for nation_id, current_status in statuses.items():
+                    pending.append((
+                        nation_id,
+                        current_status['espionage_available'],
+                        current_status.get('beige_turns', 0),
+                        current_status.get('vacation_mode_turns', 0),
+                        current_status.get('last_active')
+                    ))
                 
-                # Update heartbeat every 10 nations
-                if checked_nations % 10 == 0:
-                    self.update_heartbeat()
-                
-                # Rate limiting
-                await asyncio.sleep(0.5)
+                # Write the batch's statuses and update heartbeat
+                reset_times_found += self._flush_statuses(pending, nation_names)
+                self.update_heartbeat()
             
-            print(f"✅ Monitoring cycle completed")
-            print(f"   • Nations checked: {checked_nations}")
-            print(f"   • Reset times found: {reset_times_found}")
+            _log.info("✅ Monitoring cycle completed")
+            _log.info("   • Nations checked: %s", checked_nations)
+            _log.info("   • Reset times found: %s", reset_times_found)
             
             return {
                 'success': True,
@@ -269,42 +353,33 @@ class EspionageMonitor:
             }
             
         except Exception as e:
-            print(f"💥 Error during monitoring cycle: {e}")
+            _log.error("💥 Error during monitoring cycle: %s", e)
             return {'success': False, 'error': str(e)}
     
+    def _flush_statuses(self, pending: List[tuple], nation_names: Dict[int, str]) -> int:
+        """Record the buffered status checks in one transaction; returns how many reset times were found"""
+        if not pending:
+            return 0
+        # Protection -> available = reset time! Those nations also leave the monitoring queue
+        reset_ids = self.tracker.record_espionage_status_bulk(pending)
+        pending.clear()
+        for nation_id in reset_ids:
+            _log.info("🎯 Reset time detected for %s!", nation_names.get(nation_id, nation_id))
+        return len(reset_ids)
+    
     async def check_new_nations(self) -> Dict[str, Any]:
         """Check for new nations and add them to monitoring"""
-        print("🆕 Checking for new nations...")
+        _log.info("🆕 Checking for new nations...")
         
         try:
             # Get the latest nation ID in our database
             latest_id = self.tracker.get_latest_nation_id()
             
             # Query for nations with ID greater than our latest
-            query = f"""
-            {{
-              nations(id_gt: {latest_id}, first: 100) {{
-                data {{
-                  id
-                  nation_name
-                  alliance_id
-                  alliance {{
-                    id
-                    name
-                  }}
-                  vacation_mode_turns
-                  beige_turns
-                  last_active
-                  espionage_available
-                }}
-              }}
-            }}
-            """
-            
-            result = self.api.query(query)
+            result = await self._query(NEW_NATIONS_QUERY, {"latest_id": latest_id})
             
             if 'errors' in result:
-                print(f"❌ Error checking new nations: {result['errors']}")
+                _log.error("❌ Error checking new nations: %s", result['errors'])
                 return {'success': False, 'error': str(result['errors'])}
             
             nations = result.get('data', {}).get('nations', {}).get('data', [])
@@ -332,7 +407,7 @@ class EspionageMonitor:
                 new_nations_added += 1
             
             if new_nations_added > 0:
-                print(f"✅ Added {new_nations_added} new nations to monitoring")
+                _log.info("✅ Added %s new nations to monitoring", new_nations_added)
             
             return {
                 'success': True,
@@ -340,26 +415,14 @@ class EspionageMonitor:
             }
             
         except Exception as e:
-            print(f"❌ Error checking new nations: {e}")
+            _log.error("❌ Error checking new nations: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def check_nation_espionage_status(self, nation_id: int) -> Dict[str, Any]:
         """Check a specific nation's espionage status"""
         try:
-            query = f"""
-            {{
-              nations(id: [{nation_id}]) {{
-                data {{
-                  id
-                  espionage_available
-                  beige_turns
-                  vacation_mode_turns
-                }}
-              }}
-            }}
-            """
-            
-            result = self.api.query(query)
+            api = self._get_async_api()
+            result = await self._admit(lambda: api.check_espionage_status(nation_id))
             
             if 'errors' in result:
                 return None
@@ -368,12 +431,29 @@ class EspionageMonitor:
             return nations[0] if nations else None
             
         except Exception as e:
-            print(f"❌ Error checking nation {nation_id}: {e}")
+            _log.error("❌ Error checking nation %s: %s", nation_id, e)
             return None
     
+    async def check_nations_espionage_status_batch(self, nation_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Check up to STATUS_BATCH_SIZE nations' espionage status in one request; returns {nation_id: status}"""
+        try:
+            api = self._get_async_api()
+            result = await self._admit(lambda: api.check_espionage_status_many(nation_ids))
+            
+            if 'errors' in result:
+                _log.error("❌ Error checking %s nations: %s", len(nation_ids), result['errors'])
+                return {}
+            
+            nations = result.get('data', {}).get('nations', {}).get('data', [])
+            return {int(nation['id']): nation for nation in nations}
+            
+        except Exception as e:
+            _log.error("❌ Error checking %s nations: %s", len(nation_ids), e)
+            return {}
+    
     async def cleanup_completed_nations(self):
         """Clean up nations that no longer need monitoring"""
-        print("🧹 Running cleanup...")
+        _log.info("🧹 Running cleanup...")
         
         # Remove nations from monitoring queue if:
         # 1. Reset time already found
@@ -381,49 +461,32 @@ class EspionageMonitor:
         # 3. Nation left alliance
         
         cleanup_count = self.tracker.cleanup_monitoring_queue()
-        print(f"✅ Cleanup completed: {cleanup_count} nations removed from monitoring")
-    
-    def _schedule_new_nation_check(self):
-        """Schedule new nation check (called by scheduler)"""
-        asyncio.create_task(self.check_new_nations())
-    
-    def _schedule_monitoring_cycle(self):
-        """Schedule monitoring cycle (called by scheduler)"""
-        asyncio.create_task(self.monitoring_cycle())
-    
-    def _schedule_cleanup(self):
-        """Schedule cleanup (called by scheduler)"""
-        asyncio.create_task(self.cleanup_completed_nations())
+        _log.info("✅ Cleanup completed: %s nations removed from monitoring", cleanup_count)
+        
+        # Rotate old status history out of the hot table (off the event loop; the first run can be large)
+        archived = await asyncio.to_thread(self.tracker.archive_old_statuses, STATUS_ARCHIVE_DAYS)
+        _log.info("🗄️ Archived %s status checks older than %s days", archived, STATUS_ARCHIVE_DAYS)
+        
+        # Queue and history sizes have shifted since yesterday; keep the planner's statistics current
+        await asyncio.to_thread(self.tracker.analyze)
     
     def stop_monitoring(self):
         """Stop the monitoring system"""
-        print("🛑 Stopping Espionage Monitoring System...")
+        _log.info("🛑 Stopping Espionage Monitoring System...")
         self.is_running = False
         self.monitoring_active = False
-    
-    def get_monitoring_stats(self) -> Dict[str, Any]:
-        """Get monitoring system statistics"""
-        stats = self.tracker.get_database_stats()
-        
-        return {
-            'is_running': self.is_running,
-            'monitoring_active': self.monitoring_active,
-            'total_nations': stats.get('total_nations', 0),
-            'monitoring_count': stats.get('monitoring_count', 0),
-            'reset_times_detected': stats.get('reset_times_detected', 0),
-            'recent_checks_24h': stats.get('recent_checks_24h', 0),
-            'last_full_scan': self.last_full_scan.isoformat() if self.last_full_scan else None
-        }
+        if self._stopped is not None:
+            self._stopped.set()
     
     async def manual_check_nation(self, nation_id: int) -> Dict[str, Any]:
         """Manually check a specific nation's espionage status"""
-        print(f"🔍 Manual check for nation ID: {nation_id}")
+        _log.info("🔍 Manual check for nation ID: %s", nation_id)
         
         try:
             result = await self.collector.update_specific_nations([nation_id])
             return result
         except Exception as e:
-            print(f"💥 Error during manual check: {e}")
+            _log.error("💥 Error during manual check: %s", e)
             return {'success': False, 'error': str(e)}
     
     def get_monitoring_stats(self) -> Dict[str, Any]:
@@ -433,6 +496,7 @@ class EspionageMonitor:
         # Add monitoring-specific stats
         stats.update({
             'is_running': self.is_running,
+            'monitoring_active': self.monitoring_active,
             'last_full_scan': self.last_full_scan.isoformat() if self.last_full_scan else None,
             'next_monitoring_cycle': self._get_next_scheduled_time('monitoring'),
             'next_full_rescan': self._get_next_scheduled_time('rescan')
@@ -442,53 +506,61 @@ class EspionageMonitor:
     
     def _get_next_scheduled_time(self, task_type: str) -> str:
         """Get the next scheduled time for a task"""
-        try:
-            # This is a simplified version - in a real implementation,
-            # you'd want to track this more precisely
-            if task_type == 'monitoring':
-                return (datetime.utcnow() + timedelta(hours=2)).isoformat()
-            elif task_type == 'rescan':
-                return (datetime.utcnow() + timedelta(hours=24)).isoformat()
-        except:
-            return "Unknown"
+        # This is a simplified version - in a real implementation,
+        # you'd want to track this more precisely
+        if task_type == 'monitoring':
+            return (datetime.utcnow() + timedelta(hours=2)).isoformat()
+        elif task_type == 'rescan':
+            return (datetime.utcnow() + timedelta(hours=24)).isoformat()
+        return "Unknown"
     
     async def get_reset_time_report(self, alliance_id: int = None) -> Dict[str, Any]:
         """Generate a report of detected reset times"""
-        print("📊 Generating reset time report...")
+        _log.info("📊 Generating reset time report...")
         
         try:
             reset_times = self.tracker.get_nation_reset_times()
             
             # Group by alliance if specified
+            alliance_nation_ids = None
             if alliance_id:
                 alliance_nations = self.tracker.get_alliance_nations(alliance_id)
-                alliance_nation_ids = {n['id'] for n in alliance_nations}
-                reset_times = [rt for rt in reset_times if rt['nation_id'] in alliance_nation_ids]
-            
-            # Sort by reset time
-            reset_times.sort(key=lambda x: x['reset_time'])
+                alliance_nation_ids = frozenset(n['id'] for n in alliance_nations)
             
-            # Generate statistics
-            total_detected = len(reset_times)
-            unique_nations = len(set(rt['nation_id'] for rt in reset_times))
-            
-            # Group by hour of day
-            hourly_distribution = {}
-            for rt in reset_times:
-                try:
-                    hour = datetime.fromisoformat(rt['reset_time'].replace('Z', '+00:00')).hour
-                    hourly_distribution[hour] = hourly_distribution.get(hour, 0) + 1
-                except:
+            # One pass over the streamed rows collects every statistic; only the newest
+            # RECENT_DETECTIONS rows are kept (in a min-heap), so nothing is fully sorted
+            total_detected = 0
+            unique_nation_ids = set()
+            hourly_distribution = Counter()
+            recent = []
+            for seq, rt in enumerate(reset_times):
+                if alliance_nation_ids is not None and rt['nation_id'] not in alliance_nation_ids:
                     continue
+                
+                total_detected += 1
+                unique_nation_ids.add(rt['nation_id'])
+                
+                # Group by hour of day, read straight from the "YYYY-MM-DD HH:..." text (ISO 8601
+                # 'T' form included) rather than parsing each timestamp; keys become ints at the end
+                hour = (rt['reset_time'] or '')[11:13]
+                if hour.isdigit():
+                    hourly_distribution[hour] += 1
+                
+                # seq breaks ties in arrival order, as the stable sort this replaces did
+                entry = (rt['reset_time'], seq, rt)
+                if len(recent) < RECENT_DETECTIONS:
+                    heapq.heappush(recent, entry)
+                else:
+                    heapq.heappushpop(recent, entry)
             
             return {
                 'total_reset_times_detected': total_detected,
-                'unique_nations_with_resets': unique_nations,
-                'hourly_distribution': hourly_distribution,
-                'recent_detections': reset_times[-10:],  # Last 10 detections
+                'unique_nations_with_resets': len(unique_nation_ids),
+                'hourly_distribution': {int(hour): count for hour, count in hourly_distribution.items()},
+                'recent_detections': [dict(rt) for _, _, rt in sorted(recent)],  # Oldest first
                 'generated_at': datetime.utcnow().isoformat()
             }
             
         except Exception as e:
-            print(f"💥 Error generating reset time report: {e}")
+            _log.error("💥 Error generating reset time report: %s", e)
             return {'success': False, 'error': str(e)}
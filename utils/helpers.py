@@ -4,26 +4,52 @@ Utility functions for the Politics & War Discord Bot
 
 import json
 import datetime
+import functools
+from dataclasses import dataclass
 from typing import Dict, Any, List
 
+# NumPy vectorizes calculate_nation_strength_batch; fall back to plain Python without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Military strength contributed by one unit of each type
+MILITARY_WEIGHTS = {'soldiers': 1, 'tanks': 40, 'aircraft': 20, 'ships': 30}
+
 def format_number(number: float) -> str:
     """Format large numbers with commas"""
     if isinstance(number, (int, float)):
         return f"{number:,.2f}" if isinstance(number, float) else f"{number:,}"
     return str(number)
 
+@functools.lru_cache(maxsize=8192)
 def format_date(date_string: str) -> str:
-    """Format ISO date string to readable format"""
+    """Format ISO date string to readable format (memoized; timestamps repeat across rows)"""
+    # Empty and non-date values (e.g. "Unknown") are passed through without attempting a parse
+    if not isinstance(date_string, str) or not date_string[:4].isdigit():
+        return date_string
     try:
         dt = datetime.datetime.fromisoformat(date_string.replace('Z', '+00:00'))
         return dt.strftime('%Y-%m-%d %H:%M UTC')
-    except:
+    except ValueError:
         return date_string
 
 def safe_get(dictionary: Dict[str, Any], key: str, default: Any = "Unknown") -> Any:
     """Safely get a value from a dictionary"""
     return dictionary.get(key, default)
 
+def dig(obj: Any, *path, default: Any = None) -> Any:
+    """Follow dict keys / list indexes into a nested response; default if the path breaks or hits None"""
+    for key in path:
+        try:
+            obj = obj[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+        if obj is None:
+            return default
+    return obj
+
 def calculate_nation_strength(nation_data: Dict[str, Any]) -> Dict[str, float]:
     """Calculate various strength metrics for a nation"""
     soldiers = safe_get(nation_data, 'soldiers', 0)
@@ -32,7 +58,8 @@ def calculate_nation_strength(nation_data: Dict[str, Any]) -> Dict[str, float]:
     ships = safe_get(nation_data, 'ships', 0)
     
     # Basic military strength calculation
-    military_strength = (soldiers * 1) + (tanks * 40) + (aircraft * 20) + (ships * 30)
+    military_strength = (soldiers * MILITARY_WEIGHTS['soldiers'] + tanks * MILITARY_WEIGHTS['tanks'] +
+                         aircraft * MILITARY_WEIGHTS['aircraft'] + ships * MILITARY_WEIGHTS['ships'])
     
     return {
         'military_strength': military_strength,
@@ -42,17 +69,53 @@ def calculate_nation_strength(nation_data: Dict[str, Any]) -> Dict[str, float]:
         'ships': ships
     }
 
+def calculate_nation_strength_batch(nations: List[Dict[str, Any]]) -> List[int]:
+    """Military strength of many nations at once, as calculate_nation_strength computes it"""
+    units = [[nation.get(unit, 0) for unit in MILITARY_WEIGHTS] for nation in nations]
+    if np is None:
+        weights = list(MILITARY_WEIGHTS.values())
+        return [sum(count * weight for count, weight in zip(row, weights)) for row in units]
+    
+    # One (nations x unit types) matrix times the weight vector
+    counts = np.array(units, dtype=np.int64).reshape(len(nations), len(MILITARY_WEIGHTS))
+    return (counts @ np.fromiter(MILITARY_WEIGHTS.values(), dtype=np.int64)).tolist()
+
+@dataclass
+class NationView:
+    """Display fields of a nation, read once from an API nation dict"""
+    # Spelled out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('name', 'leader', 'alliance', 'score', 'cities', 'founded', 'last_active')
+    
+    name: str
+    leader: str
+    alliance: str
+    score: str
+    cities: int
+    founded: str
+    last_active: str
+    
+    @classmethod
+    def from_api(cls, nation_data: Dict[str, Any]) -> "NationView":
+        """Build the view in one pass over the response fields"""
+        alliance = nation_data.get('alliance')
+        cities = nation_data.get('num_cities')
+        return cls(
+            name=nation_data.get('nation_name') or "Unknown",
+            leader=nation_data.get('leader_name') or "Unknown",
+            alliance=(alliance.get('name') if alliance else None) or 'None',
+            score=format_number(nation_data.get('score') or 0),
+            cities=cities if cities is not None else len(nation_data.get('cities') or ()),
+            founded=format_date(nation_data.get('date') or ''),
+            last_active=format_date(nation_data.get('last_active') or '')
+        )
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """The fields as the dict create_nation_embed_data returns"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
 def create_nation_embed_data(nation_data: Dict[str, Any]) -> Dict[str, Any]:
     """Create structured data for Discord embeds"""
-    return {
-        'name': safe_get(nation_data, 'nation_name'),
-        'leader': safe_get(nation_data, 'leader_name'),
-        'alliance': safe_get(nation_data.get('alliance', {}), 'name', 'None'),
-        'score': format_number(safe_get(nation_data, 'score', 0)),
-        'cities': len(nation_data.get('cities', [])),
-        'founded': format_date(safe_get(nation_data, 'date', '')),
-        'last_active': format_date(safe_get(nation_data, 'last_active', ''))
-    }
+    return NationView.from_api(nation_data).as_dict()
 
 def validate_api_response(response: Dict[str, Any]) -> bool:
     """Validate that an API response is successful"""
@@ -3,124 +3,166 @@ Data collection system for fetching and storing all alliance nations
 """
 
 import asyncio
+import logging
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from api.pnw_api import PoliticsAndWarAPI
+from datetime import datetime
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from api.pnw_api import AsyncPoliticsAndWarAPI, is_overload_error
+from api.rate_limit import AIMDController
 from database.espionage_tracker import EspionageTracker
 
+_log = logging.getLogger(__name__)
+
+# Nations per page of the full collection
+COLLECT_PAGE_SIZE = 500
+
+# One page of nations for the full collection, by ID after the previous page's last one
+# (keyset pagination: each page is an index seek, where page offsets make the server skip rows).
+# Only the fields add_nations_bulk stores are selected
+COLLECT_PAGE_QUERY = '''query($after_id: Int, $first: Int) {
+    nations(
+        id_gt: $after_id,
+        first: $first,
+        orderBy: {column: ID, order: ASC}
+    ) {
+        data {
+            id
+            nation_name
+            alliance_id
+            alliance {
+                name
+            }
+            espionage_available
+            beige_turns
+            vacation_mode_turns
+            last_active
+        }
+    }
+}'''
+
+# Nations per status batch in update_specific_nations
+STATUS_BATCH_SIZE = 50
+
+# Espionage status for a batch of nations by ID
+STATUS_BATCH_QUERY = '''query($ids: [Int]) {
+    nations(id: $ids) {
+        data {
+            id
+            nation_name
+            espionage_available
+            beige_turns
+            vacation_mode_turns
+            last_active
+        }
+    }
+}'''
+
 class NationCollector:
     """Collects and stores nation data from the Politics & War API"""
     
-    def __init__(self, api_key: str):
-        self.api = PoliticsAndWarAPI(api_key)
-        self.tracker = EspionageTracker()
-        self.request_delay = 1.0  # Delay between API requests to avoid rate limiting
+    def __init__(self, api_key: str, rate_ctrl: Optional[AIMDController] = None,
+                 async_api: Optional[Callable[[], AsyncPoliticsAndWarAPI]] = None,
+                 tracker: Optional[EspionageTracker] = None):
+        self.api_key = api_key
+        self.rate_ctrl = rate_ctrl
+        self.tracker = tracker or EspionageTracker()
+        # Returns the aiohttp client to query with; the owner's (e.g. the monitor's) when given,
+        # so every request shares one keep-alive session
+        self._get_async_api = async_api or self._own_async_api
+        self._async_api: Optional[AsyncPoliticsAndWarAPI] = None
+        self._async_loop = None
+    
+    def _own_async_api(self) -> AsyncPoliticsAndWarAPI:
+        """The collector's own async client for the running loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        if self._async_api is None or self._async_loop is not loop:
+            self._async_api = AsyncPoliticsAndWarAPI(self.api_key)
+            self._async_loop = loop
+        return self._async_api
+    
+    async def close(self):
+        """Close the collector's own async client, if it made one"""
+        if self._async_api is not None:
+            await self._async_api.close()
+            self._async_api = None
+    
+    async def _query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query on the event loop, admitted as background work when a controller is shared"""
+        api = self._get_async_api()
+        if self.rate_ctrl is None:
+            return await api.query(query, variables)
+        return await self.rate_ctrl.call(lambda: api.query(query, variables),
+                                         background=True, failed=is_overload_error)
+    
+    async def _fetch_collect_page(self, after_id: int) -> Dict[str, Any]:
+        """Fetch the collection page of nations with IDs above after_id"""
+        # Fetch nations with alliance filter (alliance_id > 0 means they're in an alliance)
+        return await self._query(COLLECT_PAGE_QUERY, {"after_id": after_id, "first": COLLECT_PAGE_SIZE})
+    
+    def _store_collected_nations(self, alliance_nations: List[Dict[str, Any]]) -> int:
+        """Store one page of alliance nations and their espionage status; returns how many were stored"""
+        # Nations without espionage available go into the monitoring queue, tagged by why
+        queued = [
+            (nation['id'],
+             "beige_protection" if nation.get('beige_turns', 0) > 0
+             else "vacation_mode" if nation.get('vacation_mode_turns', 0) > 0
+             else "initially_protected")
+            for nation in alliance_nations if not nation.get('espionage_available', True)
+        ]
+        return self.tracker.add_nations_bulk(alliance_nations, queued)
     
     async def collect_all_alliance_nations(self) -> Dict[str, Any]:
         """Collect all nations that are in alliances"""
-        print("🔍 Starting collection of all alliance nations...")
+        _log.info("🔍 Starting collection of all alliance nations...")
         
         collected_nations = 0
         total_pages = 0
         errors = 0
         
+        next_fetch = None
         try:
             page = 1
-            while True:
-                print(f"📖 Processing page {page}...")
-                
-                # Fetch nations with alliance filter (alliance_id > 0 means they're in an alliance)
-                query = f'''{{
-                    nations(
-                        first: 500,
-                        page: {page}
-                    ) {{
-                        paginatorInfo {{
-                            currentPage
-                            lastPage
-                            hasMorePages
-                        }}
-                        data {{
-                            id
-                            nation_name
-                            leader_name
-                            alliance_id
-                            alliance {{
-                                name
-                            }}
-                            score
-                            num_cities
-                            espionage_available
-                            beige_turns
-                            vacation_mode_turns
-                            last_active
-                        }}
-                    }}
-                }}'''
+            # The next page is fetched while the current one is written, so API and DB time overlap
+            next_fetch = asyncio.create_task(self._fetch_collect_page(0))
+            while next_fetch is not None:
+                _log.debug("📖 Processing page %s...", page)
                 
-                result = self.api.query(query)
+                result, next_fetch = await next_fetch, None
                 
                 if 'errors' in result:
-                    print(f"❌ Error on page {page}: {result['errors'][0]['message']}")
+                    _log.error("❌ Error on page %s: %s", page, result['errors'][0]['message'])
                     errors += 1
                     break
                 
                 data = result.get('data', {}).get('nations', {})
-                paginator_info = data.get('paginatorInfo', {})
                 nations = data.get('data', [])
                 
+                # A short page is the last one; otherwise start on the page after it
+                if len(nations) == COLLECT_PAGE_SIZE:
+                    next_fetch = asyncio.create_task(
+                        self._fetch_collect_page(max(int(nation['id']) for nation in nations)))
+                
                 # Filter for alliance nations only
                 alliance_nations = [n for n in nations if n.get('alliance_id', 0) > 0]
                 
-                print(f"📊 Found {len(alliance_nations)}/{len(nations)} alliance nations on page {page}")
+                _log.debug("📊 Found %s/%s alliance nations on page %s", len(alliance_nations), len(nations), page)
                 
-                # Store nations and their espionage status
-                for nation in alliance_nations:
-                    # Add nation to database
-                    success = self.tracker.add_nation(nation)
-                    
-                    if success:
-                        # Update espionage status
-                        status_data = {
-                            'espionage_available': nation.get('espionage_available', True),
-                            'beige_turns': nation.get('beige_turns', 0),
-                            'vacation_mode_turns': nation.get('vacation_mode_turns', 0),
-                            'last_active': nation.get('last_active')
-                        }
-                        
-                        self.tracker.update_espionage_status(nation['id'], status_data)
-                        
-                        # If espionage is not available, add to monitoring queue
-                        if not nation.get('espionage_available', True):
-                            reason = "initially_protected"
-                            if nation.get('beige_turns', 0) > 0:
-                                reason = "beige_protection"
-                            elif nation.get('vacation_mode_turns', 0) > 0:
-                                reason = "vacation_mode"
-                            
-                            self.tracker.add_to_monitoring_queue(nation['id'], reason)
-                        
-                        collected_nations += 1
+                # Store nations and their espionage status (off the loop, so the next fetch proceeds)
+                collected_nations += await asyncio.to_thread(self._store_collected_nations, alliance_nations)
                 
                 total_pages = page
-                
-                # Check if there are more pages
-                if not paginator_info.get('hasMorePages', False):
-                    break
-                
                 page += 1
                 
-                # Rate limiting delay
-                await asyncio.sleep(self.request_delay)
-                
                 # Progress update every 10 pages
                 if page % 10 == 0:
-                    print(f"🔄 Progress: {page} pages processed, {collected_nations} nations collected")
+                    _log.info("🔄 Progress: %s pages processed, %s nations collected", page, collected_nations)
         
         except Exception as e:
-            print(f"💥 Critical error during collection: {e}")
+            _log.error("💥 Critical error during collection: %s", e)
             errors += 1
+        finally:
+            if next_fetch is not None:
+                next_fetch.cancel()
         
         stats = self.tracker.get_stats()
         
@@ -133,85 +175,29 @@ class NationCollector:
             'completion_time': datetime.utcnow().isoformat()
         }
         
-        print(f"✅ Collection complete!")
-        print(f"📈 Nations collected: {collected_nations}")
-        print(f"📄 Pages processed: {total_pages}")
-        print(f"🔍 Nations being monitored: {stats.get('monitoring_count', 0)}")
-        print(f"❌ Errors: {errors}")
+        _log.info("✅ Collection complete!")
+        _log.info("📈 Nations collected: %s", collected_nations)
+        _log.info("📄 Pages processed: %s", total_pages)
+        _log.info("🔍 Nations being monitored: %s", stats.get('monitoring_count', 0))
+        _log.info("❌ Errors: %s", errors)
         
         return result
     
     async def update_specific_nations(self, nation_ids: List[int]) -> Dict[str, Any]:
         """Update specific nations' espionage status"""
-        print(f"🔄 Updating {len(nation_ids)} specific nations...")
+        _log.info("🔄 Updating %s specific nations...", len(nation_ids))
         
         updated = 0
         errors = 0
         
-        # Process in batches to avoid API limits
-        batch_size = 50
-        
-        for i in range(0, len(nation_ids), batch_size):
-            batch = nation_ids[i:i + batch_size]
-            
-            print(f"📦 Processing batch {i//batch_size + 1}: nations {i+1}-{min(i+batch_size, len(nation_ids))}")
-            
-            try:
-                # Query this batch of nations
-                id_list = ','.join(map(str, batch))
-                query = f'''{{
-                    nations(id: [{id_list}]) {{
-                        data {{
-                            id
-                            nation_name
-                            espionage_available
-                            beige_turns
-                            vacation_mode_turns
-                            last_active
-                        }}
-                    }}
-                }}'''
-                
-                result = self.api.query(query)
-                
-                if 'errors' in result:
-                    print(f"❌ Error in batch: {result['errors'][0]['message']}")
-                    errors += 1
-                    continue
-                
-                nations = result.get('data', {}).get('nations', {}).get('data', [])
-                
-                for nation in nations:
-                    # Update espionage status
-                    status_data = {
-                        'espionage_available': nation.get('espionage_available', True),
-                        'beige_turns': nation.get('beige_turns', 0),
-                        'vacation_mode_turns': nation.get('vacation_mode_turns', 0),
-                        'last_active': nation.get('last_active')
-                    }
-                    
-                    success = self.tracker.update_espionage_status(nation['id'], status_data)
-                    
-                    if success:
-                        updated += 1
-                        
-                        # Check if espionage became available (potential reset time detection)
-                        if nation.get('espionage_available', True):
-                            # This might be a reset time - record it
-                            reset_time = datetime.utcnow()
-                            self.tracker.record_reset_time(
-                                nation['id'], 
-                                reset_time, 
-                                "monitoring_check"
-                            )
-                            print(f"🎯 Detected potential reset time for {nation.get('nation_name', 'Unknown')}: {reset_time}")
-                
-                # Rate limiting
-                await asyncio.sleep(self.request_delay)
-                
-            except Exception as e:
-                print(f"💥 Error processing batch: {e}")
-                errors += 1
+        # Process in batches to avoid API limits; the batches run concurrently, capped by the
+        # API client's in-flight limit and paced by its token bucket, and are tallied as they finish
+        batches = [self._update_batch(nation_ids[start:start + STATUS_BATCH_SIZE], start)
+                   for start in range(0, len(nation_ids), STATUS_BATCH_SIZE)]
+        for next_batch in asyncio.as_completed(batches):
+            batch_updated, batch_failed = await next_batch
+            updated += batch_updated
+            errors += batch_failed
         
         return {
             'success': errors == 0,
@@ -220,30 +206,56 @@ class NationCollector:
             'completion_time': datetime.utcnow().isoformat()
         }
     
+    async def _update_batch(self, batch: List[int], start: int) -> Tuple[int, bool]:
+        """Fetch and record one batch of statuses; returns (nations updated, whether the batch failed)"""
+        _log.debug("📦 Processing batch %s: nations %s-%s",
+                   start // STATUS_BATCH_SIZE + 1, start + 1, start + len(batch))
+        
+        try:
+            # Query this batch of nations
+            result = await self._query(STATUS_BATCH_QUERY, {"ids": batch})
+            
+            if 'errors' in result:
+                _log.error("❌ Error in batch: %s", result['errors'][0]['message'])
+                return 0, True
+            
+            nations = result.get('data', {}).get('nations', {}).get('data', [])
+            
+            # One transaction for the whole batch; the tracker's reset-detection trigger records a
+            # reset time for each nation whose protection just ended, and the rest are rescheduled
+            rows = [
+                (
+                    nation['id'],
+                    nation.get('espionage_available', True),
+                    nation.get('beige_turns', 0),
+                    nation.get('vacation_mode_turns', 0),
+                    nation.get('last_active')
+                )
+                for nation in nations
+            ]
+            if rows:
+                self.tracker.record_espionage_status_bulk(rows)
+            return len(rows), False
+            
+        except Exception as e:
+            _log.error("💥 Error processing batch: %s", e)
+            return 0, True
+    
     async def run_monitoring_cycle(self) -> Dict[str, Any]:
         """Run a monitoring cycle to check nations that need updates"""
-        print("🔍 Starting monitoring cycle...")
+        _log.info("🔍 Starting monitoring cycle...")
         
-        # Get nations that need to be checked
-        nations_to_check = self.tracker.get_nations_to_monitor()
+        # Get the IDs of nations that need to be checked
+        nation_ids = self.tracker.get_nation_ids_to_monitor()
         
-        if not nations_to_check:
-            print("✅ No nations need monitoring at this time")
+        if not nation_ids:
+            _log.info("✅ No nations need monitoring at this time")
             return {'success': True, 'checked_nations': 0, 'message': 'No nations to check'}
         
-        print(f"📋 Found {len(nations_to_check)} nations to check")
+        _log.info("📋 Found %s nations to check", len(nation_ids))
         
-        # Extract nation IDs
-        nation_ids = [nation['nation_id'] for nation in nations_to_check]
-        
-        # Update their status
+        # Update their status (this also reschedules the nations still protected)
         result = await self.update_specific_nations(nation_ids)
         
-        # Update next check times for nations still protected
-        for nation in nations_to_check:
-            # Schedule next check in 2 hours
-            next_check = datetime.utcnow() + timedelta(hours=2)
-            # This would be handled by the update process
-        
-        print(f"✅ Monitoring cycle complete: {result}")
+        _log.info("✅ Monitoring cycle complete: %s", result)
         return result
@@ -4,20 +4,85 @@ Provides a web interface for bot control and monitoring
 """
 
 from flask import Flask, render_template, request, jsonify
+import concurrent.futures
+import functools
+import gzip
+import hashlib
+import logging
 import os
-import sqlite3
 import asyncio
 import time
-from threading import Thread
+from datetime import datetime, timedelta
+from threading import Lock, Thread
+from typing import Optional
+from api.cache import TTLCache
 from api.pnw_api import PoliticsAndWarAPI
 from utils.espionage_monitor import EspionageMonitor
 from database.espionage_tracker import EspionageTracker
 
+_log = logging.getLogger(__name__)
+
+# jsonify encodes through orjson when it is installed, and through Flask's stdlib provider otherwise
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider that serializes with orjson"""
+        
+        def _encode(self, obj) -> bytes:
+            """orjson encoding of obj with the provider's settings"""
+            # Datetimes go through Flask's default hook so they keep its HTTP-date format
+            option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=self.default, option=option)
+        
+        def dumps(self, obj, **kwargs) -> str:
+            return self._encode(obj).decode()
+        
+        def response(self, *args, **kwargs):
+            # jsonify's path: hand orjson's bytes to the response without a str round trip
+            body = self._encode(self._prepare_response_obj(args, kwargs))
+            return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+except ImportError:
+    OrjsonProvider = None
+
+# Nation IDs never change, so name -> ID lookups for the spy and war routes are kept for an hour
+NATION_ID_TTL = 3600
+
+# waitress worker threads serving dashboard requests
+WSGI_THREADS = 8
+
+# Largest page /api/database/nations returns (the nations table asks for 1000 at most)
+NATIONS_PAGE_MAX = 1000
+
+# Largest number of checks /api/database/recent-activity returns
+RECENT_ACTIVITY_MAX = 200
+
+# Longest a request thread waits on a coroutine before giving up (long jobs run in the background)
+ASYNC_RESULT_TIMEOUT = 60
+
+# Cached GET responses kept (path + query string), across all read endpoints
+RESPONSE_CACHE_SIZE = 1024
+
+# Cached responses at least this large are also kept gzipped, for clients that accept it
+COMPRESS_MIN_SIZE = 500
+
+def _invalid_int_arg(*names: str):
+    """The first of these query parameters that is given (non-empty) but not an integer, if any"""
+    for name in names:
+        if request.args.get(name) and request.args.get(name, type=int) is None:
+            return name
+    return None
+
 class WebDashboard:
     """Web dashboard for bot control"""
     
     def __init__(self):
         self.app = Flask(__name__)
+        if OrjsonProvider is not None:
+            self.app.json = OrjsonProvider(self.app)
         self.app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key')
         
         # Initialize API (defensive initialization)
@@ -27,35 +92,133 @@ class WebDashboard:
                 self.pnw_api = PoliticsAndWarAPI(api_key)
                 # Initialize monitoring system
                 self.espionage_tracker = EspionageTracker()
-                self.espionage_monitor = EspionageMonitor(api_key)
+                # Share the dashboard's client and tracker so both use one connection pool, response cache
+                # and set of database connections
+                self.espionage_monitor = EspionageMonitor(api_key, api=self.pnw_api, tracker=self.espionage_tracker)
             except Exception as e:
-                print(f"⚠️ Warning: Could not initialize monitoring system: {e}")
+                _log.warning("⚠️ Warning: Could not initialize monitoring system: %s", e)
                 self.pnw_api = None
                 self.espionage_tracker = None
                 self.espionage_monitor = None
         else:
-            print("⚠️ Warning: PNW_API_KEY not set, monitoring features disabled")
+            _log.warning("⚠️ Warning: PNW_API_KEY not set, monitoring features disabled")
             self.pnw_api = None
             self.espionage_tracker = None
             self.espionage_monitor = None
         
+        # Lower-cased nation name -> nation ID, shared by the request threads
+        self._nation_ids = TTLCache(maxsize=4096, default_ttl=NATION_ID_TTL)
+        # (path, query string) -> (body, mimetype) of successful read endpoint responses
+        self._responses = TTLCache(maxsize=RESPONSE_CACHE_SIZE)
+        
+        # One event loop, on its own thread, runs every coroutine the dashboard starts, so the
+        # monitor's aiohttp session (bound to its loop) stays open across requests
+        self._loop = asyncio.new_event_loop()
+        Thread(target=self._loop.run_forever, daemon=True, name="DashboardLoop").start()
+        # Futures of coroutines started without waiting, kept referenced until they finish
+        self._bg_tasks = set()
+        # The 24/7 monitoring started from /api/monitor/start, so repeat requests don't start another
+        self._monitor_task = None
+        self._monitor_lock = Lock()
+        # Likewise the nation collection started from /api/monitor/collect
+        self._collect_task = None
+        
         # Set up routes
         self.setup_routes()
         
         # Auto-initialize monitoring system on startup
         self.auto_initialize_monitoring()
     
+    def _run_async(self, coro, timeout: Optional[float] = ASYNC_RESULT_TIMEOUT):
+        """
+        Run a coroutine on the dashboard's event loop and wait for its result
+        
+        Waits at most timeout seconds (None waits indefinitely), then cancels the
+        coroutine and raises TimeoutError, so a hung call can't hold a waitress thread.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Timed out after {timeout}s waiting for the monitoring system")
+    
+    def _cached(self, ttl: float):
+        """
+        Route decorator caching a read endpoint's successful responses for ttl seconds
+        
+        The query string is part of the key, so ?nation=, ?limit= etc. are cached
+        separately. Error responses, including 200s whose JSON carries an "error" or
+        "errors" key, are never cached, and any POST clears the cache
+        (see setup_routes), since the monitoring actions change what these endpoints report.
+        Successful responses carry a weak ETag of their body, so a poll whose data hasn't
+        changed gets an empty 304 Not Modified. Bodies of COMPRESS_MIN_SIZE bytes or more are
+        gzipped once when cached and sent compressed to clients that accept gzip.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                key = (request.path, request.query_string)
+                cached = self._responses.get(key)
+                if cached is not None:
+                    body, mimetype, etag, gzipped = cached
+                else:
+                    response = self.app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    # GraphQL failures (rate limits, upstream errors) come back as 200 with an error payload
+                    payload = response.get_json(silent=True) if response.is_json else None
+                    if isinstance(payload, dict) and ('errors' in payload or 'error' in payload):
+                        return response
+                    
+                    body, mimetype = response.get_data(), response.mimetype
+                    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+                    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= COMPRESS_MIN_SIZE else None
+                    self._responses.set(key, (body, mimetype, etag, gzipped), ttl)
+                
+                if gzipped is not None and 'gzip' in request.accept_encodings:
+                    response = self.app.response_class(gzipped, mimetype=mimetype)
+                    response.headers['Content-Encoding'] = 'gzip'
+                else:
+                    response = self.app.response_class(body, mimetype=mimetype)
+                if gzipped is not None:
+                    response.vary.add('Accept-Encoding')
+                response.set_etag(etag, weak=True)
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
+    
+    def _resolve_nation_id(self, nation_name: str):
+        """Nation ID for a name (None if no nation has it), searching the API only on a cache miss"""
+        key = nation_name.lower()
+        nation_id = self._nation_ids.get(key)
+        if nation_id is None:
+            search_result = self.pnw_api.search_nations(name=nation_name)
+            if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                return None
+            
+            nation_id = search_result['data']['nations']['data'][0]['id']
+            self._nation_ids.set(key, nation_id)
+        return nation_id
+    
+    def _spawn_background(self, coro):
+        """Start a coroutine on the dashboard's event loop without waiting, keeping it referenced until it finishes"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        self._bg_tasks.add(future)
+        future.add_done_callback(self._bg_tasks.discard)
+        return future
+    
     def auto_initialize_monitoring(self):
         """Auto-initialize monitoring system on startup"""
         if not self.espionage_tracker or not self.espionage_monitor:
-            print("⚠️ Monitoring system not available, skipping auto-initialization")
+            _log.warning("⚠️ Monitoring system not available, skipping auto-initialization")
             return
         
-        print("🚀 Auto-initializing monitoring system...")
+        _log.info("🚀 Auto-initializing monitoring system...")
         
         try:
             # Check if monitoring queue needs population
-            with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+            with self.espionage_tracker.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Count current monitoring queue
@@ -71,12 +234,12 @@ class WebDashboard:
                 ''')
                 nations_needing_monitoring = cursor.fetchone()[0]
                 
-                print(f"📊 Monitoring Queue: {queue_count} nations")
-                print(f"📊 Nations needing monitoring: {nations_needing_monitoring}")
+                _log.info("📊 Monitoring Queue: %s nations", queue_count)
+                _log.info("📊 Nations needing monitoring: %s", nations_needing_monitoring)
                 
                 # Auto-populate queue if it's empty or very small
                 if queue_count < 100 and nations_needing_monitoring > 0:
-                    print("📝 Auto-populating monitoring queue...")
+                    _log.info("📝 Auto-populating monitoring queue...")
                     
                     # Find nations not in monitoring queue and without reset times
                     cursor.execute('''
@@ -94,20 +257,22 @@ class WebDashboard:
                     added_count = 0
                     for (nation_id,) in nations_to_add:
                         cursor.execute('''
-                            INSERT OR REPLACE INTO monitoring_queue 
+                            INSERT INTO monitoring_queue 
                             (nation_id, reason, next_check, added_at, priority)
                             VALUES (?, ?, datetime('now', '+' || (? % 120) || ' minutes'), CURRENT_TIMESTAMP, 5)
+                            ON CONFLICT(nation_id) DO UPDATE SET
+                                reason = excluded.reason, next_check = excluded.next_check, priority = excluded.priority
                         ''', (nation_id, "auto_init", added_count))
                         added_count += 1
                     
                     conn.commit()
-                    print(f"✅ Added {added_count} nations to monitoring queue")
+                    _log.info("✅ Added %s nations to monitoring queue", added_count)
                 
                 # Start background monitoring
                 self.start_background_monitoring()
                 
         except Exception as e:
-            print(f"⚠️ Error during auto-initialization: {e}")
+            _log.warning("⚠️ Error during auto-initialization: %s", e)
     
     def start_background_monitoring(self):
         """Start monitoring in background thread with proper sequencing"""
@@ -116,20 +281,18 @@ class WebDashboard:
 
         # Check if monitoring is already running
         if hasattr(self, '_monitoring_thread') and self._monitoring_thread and self._monitoring_thread.is_alive():
-            print("⚠️ Monitoring already running, skipping start")
+            _log.warning("⚠️ Monitoring already running, skipping start")
             return
             
-        print("🔄 Starting background monitoring...")
+        _log.info("🔄 Starting background monitoring...")
         
         def monitoring_worker():
             """Background monitoring worker with sequential operations"""
             try:
                 import time  # Import here for thread context
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
                 
                 # Mark monitoring as active
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     cursor.execute('''
                         CREATE TABLE IF NOT EXISTS monitoring_status (
@@ -147,34 +310,35 @@ class WebDashboard:
                     conn.commit()
                 
                 # Step 1: Index all nations first (respecting rate limits)
-                print("📊 Step 1: Indexing all nations (respecting 60 req/min limit)...")
-                print("⏳ Starting indexing in 5 seconds to avoid conflicts...")
+                _log.info("📊 Step 1: Indexing all nations (respecting 60 req/min limit)...")
+                _log.info("⏳ Starting indexing in 5 seconds to avoid conflicts...")
                 time.sleep(5)  # Prevent multiple indexing processes
                 
-                print("🔄 Starting nation indexing...")
-                indexing_result = loop.run_until_complete(self.espionage_monitor.index_all_nations())
-                print(f"📋 Indexing result: {indexing_result}")
+                _log.info("🔄 Starting nation indexing...")
+                # The worker thread is not a request thread, so it waits for the full index
+                indexing_result = self._run_async(self.espionage_monitor.index_all_nations(), timeout=None)
+                _log.info("📋 Indexing result: %s", indexing_result)
                 
                 if indexing_result.get('success'):
-                    print(f"✅ Indexing complete: {indexing_result.get('alliance_nations', 0)} alliance nations indexed")
+                    _log.info("✅ Indexing complete: %s alliance nations indexed", indexing_result.get('alliance_nations', 0))
                     
                     # Step 2: Start monitoring after indexing is complete
-                    print("📊 Step 2: Starting espionage monitoring...")
-                    loop.run_until_complete(self.espionage_monitor.start_espionage_monitoring())
+                    _log.info("📊 Step 2: Starting espionage monitoring...")
+                    self._run_async(self.espionage_monitor.start_espionage_monitoring(), timeout=None)
                 else:
-                    print(f"❌ Indexing failed: {indexing_result.get('error', 'Unknown error')}")
-                    print("🔄 Will retry indexing in 10 minutes...")
+                    _log.error("❌ Indexing failed: %s", indexing_result.get('error', 'Unknown error'))
+                    _log.info("🔄 Will retry indexing in 10 minutes...")
                     # Don't exit, just continue without monitoring for now
                     return
                 
             except Exception as e:
-                print(f"❌ Monitoring worker error: {e}")
+                _log.error("❌ Monitoring worker error: %s", e)
                 import traceback
                 traceback.print_exc()
                 
                 # Mark monitoring as stopped
                 try:
-                    with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                    with self.espionage_tracker.connection() as conn:
                         cursor = conn.cursor()
                         cursor.execute('''
                             UPDATE monitoring_status 
@@ -183,21 +347,41 @@ class WebDashboard:
                         ''')
                         conn.commit()
                 except Exception as db_error:
-                    print(f"❌ Error updating monitoring status: {db_error}")
+                    _log.error("❌ Error updating monitoring status: %s", db_error)
                 
                 # Restart monitoring after 5 minutes on error
-                print("🔄 Restarting monitoring in 5 minutes due to error...")
+                _log.info("🔄 Restarting monitoring in 5 minutes due to error...")
                 time.sleep(300)
                 self.start_background_monitoring()
         
         # Start monitoring in background thread
         self._monitoring_thread = Thread(target=monitoring_worker, daemon=True, name="MonitoringWorker")
         self._monitoring_thread.start()
-        print("✅ Background monitoring started")
+        _log.info("✅ Background monitoring started")
     
     def setup_routes(self):
         """Set up web routes"""
         
+        # The health payload never changes, so it is serialized once; the probe touches no API,
+        # database connection or lock, so it can't be held up by the monitoring routes' work
+        health_body = self.app.json.dumps({
+            "status": "healthy",
+            "service": "Politics & War Discord Bot",
+            "version": "2.0"
+        })
+        
+        @self.app.route('/health')
+        def health():
+            """Health check endpoint for Railway deployment"""
+            return self.app.response_class(health_body, status=200, mimetype='application/json')
+        
+        @self.app.after_request
+        def invalidate_cached_responses(response):
+            """Drop cached read responses after any POST (collection, checks, queue changes)"""
+            if request.method == 'POST':
+                self._responses.clear()
+            return response
+        
         @self.app.route('/')
         def dashboard():
             """Main dashboard page"""
@@ -233,16 +417,8 @@ class WebDashboard:
             """Status page - redirect to main dashboard"""
             return render_template('dashboard.html')
         
-        @self.app.route('/health')
-        def health():
-            """Health check endpoint for Railway deployment"""
-            return jsonify({
-                "status": "healthy",
-                "service": "Politics & War Discord Bot",
-                "version": "2.0"
-            }), 200
-        
         @self.app.route('/api/nation/<nation_name>')
+        @self._cached(ttl=60)
         def api_nation(nation_name):
             """API endpoint to get nation info"""
             if not self.pnw_api:
@@ -254,6 +430,7 @@ class WebDashboard:
                 return jsonify({"error": str(e)}), 500
         
         @self.app.route('/api/gameinfo')
+        @self._cached(ttl=300)
         def api_gameinfo():
             """API endpoint to get game info"""
             if not self.pnw_api:
@@ -271,21 +448,12 @@ class WebDashboard:
                 return jsonify({"error": "API not initialized - check PNW_API_KEY"}), 503
             try:
                 # First find the nation
-                search_result = self.pnw_api.search_nations(name=nation_name)
-                if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                nation_id = self._resolve_nation_id(nation_name)
+                if nation_id is None:
                     return jsonify({'error': f'Nation {nation_name} not found'})
                 
-                nation_data = search_result['data']['nations']['data'][0]
-                nation_id = nation_data['id']
-                
-                # Get spy activity
-                spy_result = self.pnw_api.get_spy_activity(nation_id)
-                espionage_result = self.pnw_api.check_espionage_status(nation_id)
-                
-                return jsonify({
-                    'spy_activity': spy_result,
-                    'espionage_status': espionage_result
-                })
+                # Get spy activity and espionage status in one request
+                return jsonify(self.pnw_api.get_nation_intel(nation_id))
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
         
@@ -293,17 +461,12 @@ class WebDashboard:
         def api_my_spy_info():
             """Get spy information for the API key owner"""
             try:
-                spy_result = self.pnw_api.get_spy_activity()
-                espionage_result = self.pnw_api.check_espionage_status()
-                
-                return jsonify({
-                    'spy_activity': spy_result,
-                    'espionage_status': espionage_result
-                })
+                return jsonify(self.pnw_api.get_nation_intel())
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
         
         @self.app.route('/api/wars')
+        @self._cached(ttl=15)
         def api_wars():
             """Get active wars"""
             if not self.pnw_api:
@@ -312,12 +475,9 @@ class WebDashboard:
                 nation_name = request.args.get('nation')
                 if nation_name:
                     # Search for specific nation
-                    search_result = self.pnw_api.search_nations(name=nation_name)
-                    if 'errors' in search_result or not search_result.get('data', {}).get('nations', {}).get('data', []):
+                    nation_id = self._resolve_nation_id(nation_name)
+                    if nation_id is None:
                         return jsonify({'error': f'Nation {nation_name} not found'})
-                    
-                    nation_data = search_result['data']['nations']['data'][0]
-                    nation_id = nation_data['id']
                     result = self.pnw_api.get_active_wars(nation_id)
                 else:
                     # Get wars for API key owner
@@ -328,6 +488,7 @@ class WebDashboard:
                 return jsonify({"error": str(e)}), 500
         
         @self.app.route('/api/monitor/status')
+        @self._cached(ttl=10)
         def api_monitor_status():
             """Get monitoring system status"""
             if not self.espionage_monitor:
@@ -344,18 +505,13 @@ class WebDashboard:
             if not self.espionage_monitor:
                 return jsonify({"error": "Monitoring system not initialized - check PNW_API_KEY"}), 503
             try:
-                # Start monitoring in background using a new event loop
-                import asyncio
-                import threading
-                
-                def start_monitoring():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(self.espionage_monitor.start_24_7_monitoring())
-                
-                # Start in a separate thread
-                monitoring_thread = threading.Thread(target=start_monitoring, daemon=True)
-                monitoring_thread.start()
+                # Waitress serves requests on several threads; the lock makes check-and-start atomic
+                with self._monitor_lock:
+                    if self._monitor_task is not None and not self._monitor_task.done():
+                        return jsonify({"success": True, "message": "Monitoring already running"})
+                    
+                    # Start monitoring in background on the dashboard's event loop
+                    self._monitor_task = self._spawn_background(self.espionage_monitor.start_24_7_monitoring())
                 
                 return jsonify({"success": True, "message": "Monitoring started in background"})
             except Exception as e:
@@ -373,30 +529,24 @@ class WebDashboard:
                 if not nations:
                     return jsonify({"message": "No nations need monitoring", "nations_checked": 0})
                 
-                # Test check a few nations
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                # Test check a few nations, all at once; a failed check is reported in its own entry
+                async def check_all():
+                    """Gather the checks on the dashboard's loop (gather needs a running loop)"""
+                    return await asyncio.gather(
+                        *(self.espionage_monitor.check_nation_espionage_status(nation['nation_id']) for nation in nations),
+                        return_exceptions=True
+                    )
                 
-                results = []
-                for nation in nations:
-                    try:
-                        result = loop.run_until_complete(
-                            self.espionage_monitor.check_nation_espionage_status(nation['id'])
-                        )
-                        results.append({
-                            'nation_id': nation['id'],
-                            'nation_name': nation['nation_name'],
-                            'result': result
-                        })
-                    except Exception as e:
-                        results.append({
-                            'nation_id': nation['id'],
-                            'nation_name': nation['nation_name'],
-                            'error': str(e)
-                        })
+                statuses = self._run_async(check_all())
                 
-                loop.close()
+                results = []
+                for nation, result in zip(nations, statuses):
+                    entry = {'nation_id': nation['nation_id'], 'nation_name': nation['nation_name']}
+                    if isinstance(result, Exception):
+                        entry['error'] = str(result)
+                    else:
+                        entry['result'] = result
+                    results.append(entry)
                 
                 return jsonify({
                     "success": True,
@@ -413,7 +563,7 @@ class WebDashboard:
                 return jsonify({"error": "Database not initialized"}), 503
             try:
                 # Get all active nations without reset times
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Find nations not in monitoring queue and without reset times
@@ -433,9 +583,11 @@ class WebDashboard:
                     added_count = 0
                     for nation_id, nation_name in nations_to_add:
                         cursor.execute('''
-                            INSERT OR REPLACE INTO monitoring_queue 
+                            INSERT INTO monitoring_queue 
                             (nation_id, reason, next_check, added_at, priority)
                             VALUES (?, ?, datetime('now'), CURRENT_TIMESTAMP, 5)
+                            ON CONFLICT(nation_id) DO UPDATE SET
+                                reason = excluded.reason, next_check = excluded.next_check, priority = excluded.priority
                         ''', (nation_id, "immediate_check"))
                         added_count += 1
                     
@@ -455,16 +607,16 @@ class WebDashboard:
             if not self.espionage_tracker:
                 return jsonify({"error": "Database not initialized"}), 503
             try:
-                print(f"📍 Database path: {self.espionage_tracker.db_path}")
-                print(f"📍 Database exists: {os.path.exists(self.espionage_tracker.db_path)}")
+                _log.info("📍 Database path: %s", self.espionage_tracker.db_path)
+                _log.info("📍 Database exists: %s", os.path.exists(self.espionage_tracker.db_path))
                 
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Check if tables exist
                     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
                     tables = [table[0] for table in cursor.fetchall()]
-                    print(f"📍 Tables found: {tables}")
+                    _log.info("📍 Tables found: %s", tables)
                     
                     # Count nations
                     if 'nations' in tables:
@@ -477,35 +629,35 @@ class WebDashboard:
                         cursor.execute('SELECT COUNT(*) FROM nations')
                         total_nations = cursor.fetchone()[0]
                         
-                        print(f"📍 Nations stats: total={total_nations}, active={active_nations}, alliance={alliance_nations}")
+                        _log.info("📍 Nations stats: total=%s, active=%s, alliance=%s", total_nations, active_nations, alliance_nations)
                     else:
                         active_nations = alliance_nations = total_nations = 0
-                        print("📍 Nations table not found!")
+                        _log.info("📍 Nations table not found!")
                     
                     # Count monitoring queue
                     if 'monitoring_queue' in tables:
                         cursor.execute('SELECT COUNT(*) FROM monitoring_queue')
                         queue_count = cursor.fetchone()[0]
-                        print(f"📍 Monitoring queue count: {queue_count}")
+                        _log.info("📍 Monitoring queue count: %s", queue_count)
                     else:
                         queue_count = 0
-                        print("📍 Monitoring queue table not found!")
+                        _log.info("📍 Monitoring queue table not found!")
                     
                     # Count reset times
                     if 'reset_times' in tables:
                         cursor.execute('SELECT COUNT(*) FROM reset_times')
                         reset_times = cursor.fetchone()[0]
-                        print(f"📍 Reset times count: {reset_times}")
+                        _log.info("📍 Reset times count: %s", reset_times)
                     else:
                         reset_times = 0
-                        print("📍 Reset times table not found!")
+                        _log.info("📍 Reset times table not found!")
                     
                     # Sample monitoring queue
                     queue_sample = []
                     if 'monitoring_queue' in tables and queue_count > 0:
                         cursor.execute('SELECT nation_id, reason, next_check FROM monitoring_queue LIMIT 5')
-                        queue_sample = cursor.fetchall()
-                        print(f"📍 Queue sample: {queue_sample}")
+                        queue_sample = [tuple(row) for row in cursor.fetchall()]
+                        _log.info("📍 Queue sample: %s", queue_sample)
                     
                     # Nations with immediate checks available
                     ready_to_check = 0
@@ -515,7 +667,7 @@ class WebDashboard:
                             WHERE next_check <= datetime('now')
                         ''')
                         ready_to_check = cursor.fetchone()[0]
-                        print(f"📍 Ready to check: {ready_to_check}")
+                        _log.info("📍 Ready to check: %s", ready_to_check)
                 
                 return jsonify({
                     "database_path": self.espionage_tracker.db_path,
@@ -530,7 +682,7 @@ class WebDashboard:
                     "queue_sample": queue_sample
                 })
             except Exception as e:
-                print(f"❌ Database debug error: {e}")
+                _log.error("❌ Database debug error: %s", e)
                 return jsonify({"error": str(e)}), 500
         
         @self.app.route('/api/monitoring/overview')
@@ -539,9 +691,9 @@ class WebDashboard:
             if not self.espionage_tracker or not self.espionage_monitor:
                 return jsonify({"error": "Monitoring system not initialized"}), 503
             try:
-                print("📍 Starting monitoring overview API call...")
+                _log.info("📍 Starting monitoring overview API call...")
                 # Get monitoring status from database
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Check if monitoring is running
@@ -562,9 +714,9 @@ class WebDashboard:
                             WHERE id = 1
                         ''')
                         status_row = cursor.fetchone()
-                        print(f"📍 Status row: {status_row}")
+                        _log.info("📍 Status row: %s", status_row)
                     except Exception as e:
-                        print(f"Error getting status row: {e}")
+                        _log.error("Error getting status row: %s", e)
                         status_row = None
                     
                     if status_row:
@@ -586,28 +738,28 @@ class WebDashboard:
                         cursor.execute('SELECT COUNT(*) FROM nations WHERE is_active = 1')
                         total_nations = cursor.fetchone()[0]
                     except Exception as e:
-                        print(f"Error counting nations: {e}")
+                        _log.error("Error counting nations: %s", e)
                         total_nations = 0
                     
                     try:
                         cursor.execute('SELECT COUNT(*) FROM monitoring_queue')
                         queue_count = cursor.fetchone()[0]
                     except Exception as e:
-                        print(f"Error counting monitoring queue: {e}")
+                        _log.error("Error counting monitoring queue: %s", e)
                         queue_count = 0
                     
                     try:
                         cursor.execute('SELECT COUNT(*) FROM reset_times')
                         reset_times_found = cursor.fetchone()[0]
                     except Exception as e:
-                        print(f"Error counting reset times: {e}")
+                        _log.error("Error counting reset times: %s", e)
                         reset_times_found = 0
                     
                     try:
                         cursor.execute('SELECT COUNT(*) FROM espionage_status WHERE checked_at > datetime("now", "-24 hours")')
                         checks_24h = cursor.fetchone()[0]
                     except Exception as e:
-                        print(f"Error counting recent checks: {e}")
+                        _log.error("Error counting recent checks: %s", e)
                         checks_24h = 0
                     
                     # Nations ready to check
@@ -615,10 +767,10 @@ class WebDashboard:
                         cursor.execute('SELECT COUNT(*) FROM monitoring_queue WHERE next_check <= datetime("now")')
                         ready_to_check = cursor.fetchone()[0]
                     except Exception as e:
-                        print(f"Error counting ready to check: {e}")
+                        _log.error("Error counting ready to check: %s", e)
                         ready_to_check = 0
                     
-                    print(f"📊 Database stats: nations={total_nations}, queue={queue_count}, resets={reset_times_found}")
+                    _log.info("📊 Database stats: nations=%s, queue=%s, resets=%s", total_nations, queue_count, reset_times_found)
                     
                     # Recent activity
                     try:
@@ -629,10 +781,9 @@ class WebDashboard:
                             ORDER BY es.checked_at DESC
                             LIMIT 10
                         ''')
-                        recent_activity = [dict(zip(['nation_id', 'nation_name', 'espionage_available', 'checked_at'], row))
-                                         for row in cursor.fetchall()]
+                        recent_activity = [dict(row) for row in cursor]
                     except Exception as e:
-                        print(f"Error getting recent activity: {e}")
+                        _log.error("Error getting recent activity: %s", e)
                         recent_activity = []
                     
                     # Recent reset times
@@ -644,10 +795,9 @@ class WebDashboard:
                             ORDER BY rt.reset_time DESC
                             LIMIT 5
                         ''')
-                        recent_resets = [dict(zip(['nation_id', 'nation_name', 'reset_time', 'detection_method'], row))
-                                       for row in cursor.fetchall()]
+                        recent_resets = [dict(row) for row in cursor]
                     except Exception as e:
-                        print(f"Error getting recent resets: {e}")
+                        _log.error("Error getting recent resets: %s", e)
                         recent_resets = []
                 
                 return jsonify({
@@ -673,7 +823,7 @@ class WebDashboard:
                     "reset_times_found": reset_times_found
                 })
             except Exception as e:
-                print(f"❌ Error in monitoring overview: {e}")
+                _log.error("❌ Error in monitoring overview: %s", e)
                 import traceback
                 traceback.print_exc()
                 # Return safe default values instead of failing
@@ -706,7 +856,7 @@ class WebDashboard:
             if not self.espionage_tracker:
                 return jsonify({"error": "Database not initialized"}), 503
             try:
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Recent activity with status
@@ -744,7 +894,7 @@ class WebDashboard:
             if not self.espionage_tracker:
                 return jsonify({"error": "Database not initialized"}), 503
             try:
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Update monitoring queue to spread checks over the next 2 hours
@@ -781,13 +931,15 @@ class WebDashboard:
             if not self.espionage_monitor:
                 return jsonify({"error": "Monitoring system not initialized - check PNW_API_KEY"}), 503
             try:
-                # Start collection in background
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                result = loop.run_until_complete(self.espionage_monitor.index_all_nations())
-                loop.close()
-                return jsonify(result)
+                # A full index takes 10-15 minutes, longer than a request thread should wait, so it
+                # runs in the background on the dashboard's event loop
+                with self._monitor_lock:
+                    if self._collect_task is not None and not self._collect_task.done():
+                        return jsonify({"success": True, "message": "Nation collection already running"})
+                    
+                    self._collect_task = self._spawn_background(self.espionage_monitor.index_all_nations())
+                
+                return jsonify({"success": True, "message": "Nation collection started in background"})
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
         
@@ -796,17 +948,15 @@ class WebDashboard:
             """Get reset time report"""
             if not self.espionage_monitor:
                 return jsonify({"error": "Monitoring system not initialized - check PNW_API_KEY"}), 503
+            # Reject a malformed alliance_id before it reaches the monitor
+            invalid = _invalid_int_arg('alliance_id')
+            if invalid:
+                return jsonify({"error": f"{invalid} must be an integer"}), 400
             try:
-                alliance_id = request.args.get('alliance_id')
-                if alliance_id:
-                    alliance_id = int(alliance_id)
+                alliance_id = request.args.get('alliance_id', type=int)
                 
                 # Get report synchronously
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                report = loop.run_until_complete(self.espionage_monitor.get_reset_time_report(alliance_id))
-                loop.close()
+                report = self._run_async(self.espionage_monitor.get_reset_time_report(alliance_id))
                 
                 return jsonify(report)
             except Exception as e:
@@ -818,11 +968,7 @@ class WebDashboard:
             if not self.espionage_monitor:
                 return jsonify({"error": "Monitoring system not initialized - check PNW_API_KEY"}), 503
             try:
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                result = loop.run_until_complete(self.espionage_monitor.manual_check_nation(nation_id))
-                loop.close()
+                result = self._run_async(self.espionage_monitor.manual_check_nation(nation_id))
                 
                 return jsonify(result)
             except Exception as e:
@@ -830,47 +976,59 @@ class WebDashboard:
         
         # Database viewing endpoints
         @self.app.route('/api/database/nations')
+        @self._cached(ttl=30)
         def api_get_nations():
             """Get all indexed nations"""
             if not self.espionage_tracker:
                 return jsonify({"error": "Database not initialized"}), 503
+            invalid = _invalid_int_arg('limit', 'offset', 'alliance_id', 'cursor')
+            if invalid:
+                return jsonify({"error": f"{invalid} must be an integer"}), 400
             try:
-                limit = request.args.get('limit', 50, type=int)
-                offset = request.args.get('offset', 0, type=int)
+                # Capped (SQLite treats a negative LIMIT as none), so one request can't make the worker
+                # build an arbitrarily large page
+                limit = max(1, min(request.args.get('limit', 50, type=int), NATIONS_PAGE_MAX))
+                offset = max(0, request.args.get('offset', 0, type=int))
                 alliance_id = request.args.get('alliance_id', type=int)
+                # Keyset pagination: ?cursor=<next_cursor of the previous page> seeks straight to the page
+                # along the id order (the primary key, or idx_nation_alliance within an alliance), where a
+                # large offset makes SQLite step over every skipped row. offset still serves page jumps
+                before_id = request.args.get('cursor', type=int)
+                if before_id is not None:
+                    offset = 0
+                keyset_params = () if before_id is None else (before_id,)
                 
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     if alliance_id:
                         # Get nations from specific alliance
-                        cursor.execute('''
+                        cursor.execute(f'''
                             SELECT id, nation_name, alliance_id, alliance_name, 
                                    last_updated, is_active
                             FROM nations 
-                            WHERE alliance_id = ?
+                            WHERE alliance_id = ? {'AND id < ?' if keyset_params else ''}
                             ORDER BY id DESC 
                             LIMIT ? OFFSET ?
-                        ''', (alliance_id, limit, offset))
+                        ''', (alliance_id, *keyset_params, limit, offset))
                         
-                        columns = [description[0] for description in cursor.description]
-                        nations = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                        nations = [dict(row) for row in cursor]
                         
                         # Get total count for this alliance
                         cursor.execute('SELECT COUNT(*) FROM nations WHERE alliance_id = ?', (alliance_id,))
                         total_count = cursor.fetchone()[0]
                     else:
                         # Get all nations with pagination
-                        cursor.execute('''
+                        cursor.execute(f'''
                             SELECT id, nation_name, alliance_id, alliance_name, 
                                    last_updated, is_active
                             FROM nations 
+                            {'WHERE id < ?' if keyset_params else ''}
                             ORDER BY id DESC 
                             LIMIT ? OFFSET ?
-                        ''', (limit, offset))
+                        ''', (*keyset_params, limit, offset))
                         
-                        columns = [description[0] for description in cursor.description]
-                        nations = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                        nations = [dict(row) for row in cursor]
                         
                         # Get total count of all nations
                         cursor.execute('SELECT COUNT(*) FROM nations')
@@ -881,27 +1039,34 @@ class WebDashboard:
                     "count": len(nations),
                     "total": total_count,
                     "limit": limit,
-                    "offset": offset
+                    "offset": offset,
+                    # Pass back as ?cursor= for the next page; None once the last page is reached
+                    "next_cursor": nations[-1]['id'] if len(nations) == limit else None
                 })
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
         
         @self.app.route('/api/database/stats')
+        @self._cached(ttl=60)
         def api_get_database_stats():
             """Get database statistics"""
             if not self.espionage_tracker:
                 return jsonify({"error": "Database not initialized"}), 503
             try:
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
-                    # Total nations
-                    cursor.execute('SELECT COUNT(*) FROM nations')
-                    total_nations = cursor.fetchone()[0]
-                    
-                    # Active nations
-                    cursor.execute('SELECT COUNT(*) FROM nations WHERE is_active = 1')
-                    active_nations = cursor.fetchone()[0]
+                    # All counts in one statement; the bound cutoff (in CURRENT_TIMESTAMP's format)
+                    # lets idx_espionage_checked answer the recent-checks count as an index range scan
+                    cutoff = (datetime.utcnow() - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M:%S')
+                    cursor.execute('''
+                        SELECT
+                            (SELECT COUNT(*) FROM nations),
+                            (SELECT COUNT(*) FROM nations WHERE is_active = 1),
+                            (SELECT COUNT(*) FROM espionage_status WHERE checked_at > ?),
+                            (SELECT COUNT(*) FROM reset_times)
+                    ''', (cutoff,))
+                    total_nations, active_nations, recent_checks, reset_times_found = cursor.fetchone()
                     
                     # Nations by alliance
                     cursor.execute('''
@@ -912,16 +1077,7 @@ class WebDashboard:
                         ORDER BY count DESC 
                         LIMIT 10
                     ''')
-                    top_alliances = [dict(zip(['alliance_id', 'alliance_name', 'count'], row)) 
-                                   for row in cursor.fetchall()]
-                    
-                    # Recent espionage checks
-                    cursor.execute('SELECT COUNT(*) FROM espionage_status WHERE checked_at > datetime("now", "-24 hours")')
-                    recent_checks = cursor.fetchone()[0]
-                    
-                    # Reset times found
-                    cursor.execute('SELECT COUNT(*) FROM reset_times')
-                    reset_times_found = cursor.fetchone()[0]
+                    top_alliances = [dict(row) for row in cursor]
                 
                 return jsonify({
                     "total_nations": total_nations,
@@ -934,14 +1090,18 @@ class WebDashboard:
                 return jsonify({"error": str(e)}), 500
         
         @self.app.route('/api/database/recent-activity')
+        @self._cached(ttl=30)
         def api_get_recent_activity():
             """Get recent database activity"""
             if not self.espionage_tracker:
                 return jsonify({"error": "Database not initialized"}), 503
+            invalid = _invalid_int_arg('limit')
+            if invalid:
+                return jsonify({"error": f"{invalid} must be an integer"}), 400
             try:
-                limit = request.args.get('limit', 20, type=int)
+                limit = max(1, min(request.args.get('limit', 20, type=int), RECENT_ACTIVITY_MAX))
                 
-                with sqlite3.connect(self.espionage_tracker.db_path) as conn:
+                with self.espionage_tracker.connection() as conn:
                     cursor = conn.cursor()
                     
                     # Recent espionage checks
@@ -954,8 +1114,8 @@ class WebDashboard:
                         LIMIT ?
                     ''', (limit,))
                     
-                    columns = [description[0] for description in cursor.description]
-                    recent_activity = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    # The tracker's connections return sqlite3.Row, whose mapping already carries the column names
+                    recent_activity = [dict(row) for row in cursor]
                 
                 return jsonify({
                     "recent_activity": recent_activity,
@@ -977,18 +1137,37 @@ class WebDashboard:
         port = int(os.getenv('PORT', os.getenv('WEB_PORT', 5000)))
         debug = os.getenv('DEBUG', 'True').lower() == 'true'
         
-        self.app.run(host=host, port=port, debug=debug, use_reloader=False)
+        # Prefer the waitress WSGI server (a real thread pool) when it is installed;
+        # DEBUG then only turns on Flask's debug mode, without the development server
+        try:
+            from waitress import serve
+        except ImportError:
+            self.app.run(host=host, port=port, debug=debug, use_reloader=False)
+        else:
+            self.app.debug = debug
+            serve(self.app, host=host, port=port, threads=WSGI_THREADS)
     
     async def start(self):
-        """Start the web dashboard"""
-        print("Starting web dashboard...")
+        """Start the web dashboard; returns (or raises) when the server thread stops"""
+        _log.info("Starting web dashboard...")
+        
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+        
+        def serve():
+            """Run Flask, then hand its outcome back to start() on the event loop"""
+            try:
+                self.run_flask_app()
+            except Exception as e:
+                loop.call_soon_threadsafe(lambda error=e: stopped.done() or stopped.set_exception(error))
+            else:
+                loop.call_soon_threadsafe(lambda: stopped.done() or stopped.set_result(None))
         
-        # Run Flask in a separate thread
-        flask_thread = Thread(target=self.run_flask_app, daemon=True)
+        # Run Flask in a separate (daemon) thread
+        flask_thread = Thread(target=serve, daemon=True)
         flask_thread.start()
         
-        print(f"Web dashboard started on http://{os.getenv('WEB_HOST', '0.0.0.0')}:{int(os.getenv('PORT', os.getenv('WEB_PORT', 5000)))}")
+        _log.info("Web dashboard started on http://%s:%s", os.getenv('WEB_HOST', '0.0.0.0'), int(os.getenv('PORT', os.getenv('WEB_PORT', 5000))))
         
-        # Keep the async function running
-        while True:
-            await asyncio.sleep(60)  # Check every minute
+        # Wait on the server itself rather than waking up every minute
+        await stopped